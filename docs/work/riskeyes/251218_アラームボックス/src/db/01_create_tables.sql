@@ -37,6 +37,9 @@ CREATE TABLE hansha_alarmbox_credit_checks (
     purchased_at DATETIME DEFAULT NULL COMMENT '購入日',
     expired_at DATETIME DEFAULT NULL COMMENT '有効期限',
     pdf_file_path VARCHAR(500) DEFAULT NULL COMMENT 'PDFファイルのGCSパス',
+    detail_fetched_at DATETIME DEFAULT NULL COMMENT '詳細取得日時（補完ジョブ）',
+    completion_attempts INT NOT NULL DEFAULT 0 COMMENT '補完の試行回数',
+    next_completion_at DATETIME DEFAULT NULL COMMENT '次回の補完実行日時',
     created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '作成日時',
     updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新日時',
 
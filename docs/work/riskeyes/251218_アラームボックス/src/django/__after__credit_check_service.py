@@ -1,14 +1,24 @@
+import asyncio
 import base64
 import logging
 import traceback
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from io import BytesIO
 
-from core.lib.lock import LockManager
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.lib.lock import StripedLockManager
 from core.models.riskeyes_v2.alarmbox import (
     HanshaAlarmboxCreditCheck,
     HanshaAlarmboxCreditCheckInfo,
 )
+from lib.alarmbox.async_client import AsyncAlarmboxClient
 from lib.alarmbox.client import AlarmboxClient
 from lib.alarmbox.exceptions import AlarmboxAPIError
 from lib.alarmbox.token_service import TokenService
@@ -18,6 +28,20 @@ from lib.gcs_client import GCSClient
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PurchaseOutcome:
+    """一括購入の1件ごとの結果"""
+
+    PURCHASED = "purchased"
+    DUPLICATE = "duplicate"
+    ERROR = "error"
+
+    corporation_number: str
+    status: str
+    credit_check: HanshaAlarmboxCreditCheck | None = None
+    error: str | None = None
+
+
 class CreditCheckService:
     """
     信用チェック 購入〜保存サービス
@@ -25,6 +49,16 @@ class CreditCheckService:
 
     GCS_FEATURE_NAME = "alarmbox"
     LOCK_NAME = "alarmbox_credit_check"
+    # (client_id, 法人番号) を割り当てるロックの数
+    LOCK_STRIPES = 256
+    # 一括購入で同時に AlarmBox API を呼ぶ数
+    BATCH_MAX_WORKERS = 8
+    # 補完ジョブが未完了レコードを拾い直す期間
+    COMPLETION_RETRY_PERIOD = timedelta(days=7)
+    # 補完の試行回数の上限と、次回までの待ち時間（10分, 20分, 40分... 最大1日）
+    COMPLETION_MAX_ATTEMPTS = 10
+    COMPLETION_BACKOFF_BASE = timedelta(minutes=10)
+    COMPLETION_BACKOFF_MAX = timedelta(days=1)
 
     @classmethod
     def purchase_and_save(
@@ -47,9 +81,115 @@ class CreditCheckService:
 
         Returns:
             保存した HanshaAlarmboxCreditCheck インスタンス
+            （詳細・PDFは補完ジョブで後から埋まる）
+        """
+        credit_check = cls._purchase(
+            client_id=client_id,
+            corporation_number=corporation_number,
+            deal=deal,
+            purchase_reasons=purchase_reasons,
+            purchase_reason_comment=purchase_reason_comment,
+        )
+
+        # ---- ここから先は購入成功後なので、絶対に例外を投げない ----
+
+        # 詳細取得〜PDF保存をバックグラウンドジョブに登録（失敗しても定期実行で拾う）
+        try:
+            cls._enqueue_completion(credit_check)
+        except Exception:
+            logger.error(
+                f"補完ジョブ登録失敗: id={credit_check.id}\n{traceback.format_exc()}"
+            )
+
+        logger.info(f"DB保存完了: id={credit_check.id}")
+
+        return credit_check
+
+    @classmethod
+    async def apurchase_and_save(
+        cls,
+        client_id: int,
+        corporation_number: str,
+        deal: int | None = None,
+        purchase_reasons: list[int] | None = None,
+        purchase_reason_comment: str | None = None,
+    ) -> HanshaAlarmboxCreditCheck:
+        """
+        信用チェックを購入し、詳細・PDFまで保存する（asyncio 版）
+
+        購入までは purchase_and_save と同じ（ロック内）。購入後は詳細（PDFなし）と
+        PDF付き詳細を同時に取得し、詳細は届いた時点でDBに保存、PDFは届いたらGCSに保存する。
+        購入後にかかる時間は「詳細取得＋DB保存」と「PDF取得＋GCS保存」の遅い方になる。
+        失敗した分は補完ジョブに任せ、購入後は例外を投げない。
+
+        Returns:
+            保存した HanshaAlarmboxCreditCheck インスタンス
+        """
+        credit_check = await sync_to_async(cls._purchase)(
+            client_id=client_id,
+            corporation_number=corporation_number,
+            deal=deal,
+            purchase_reasons=purchase_reasons,
+            purchase_reason_comment=purchase_reason_comment,
+        )
+
+        # ---- ここから先は購入成功後なので、絶対に例外を投げない ----
+
+        try:
+            access_token = await sync_to_async(TokenService.get_valid_access_token)()
+            # 接続はイベントループ共通のプールを使い回す
+            client = AsyncAlarmboxClient(access_token)
+            results = await asyncio.gather(
+                cls._afetch_and_save_detail(client, credit_check),
+                cls._afetch_and_save_pdf(client, credit_check),
+                return_exceptions=True,
+            )
+            errors = [result for result in results if isinstance(result, Exception)]
+        except Exception as e:
+            errors = [e]
+
+        if errors:
+            for error in errors:
+                logger.error(
+                    f"詳細・PDF取得失敗: credit_check_id={credit_check.credit_check_id}\n"
+                    f"{''.join(traceback.format_exception(error))}"
+                )
+            # 取れなかった分は補完ジョブで埋める
+            try:
+                await sync_to_async(cls._enqueue_completion)(credit_check)
+            except Exception:
+                logger.error(
+                    f"補完ジョブ登録失敗: id={credit_check.id}\n{traceback.format_exc()}"
+                )
+
+        logger.info(f"DB保存完了: id={credit_check.id}")
+
+        return credit_check
+
+    @classmethod
+    def _purchase(
+        cls,
+        client_id: int,
+        corporation_number: str,
+        deal: int | None = None,
+        purchase_reasons: list[int] | None = None,
+        purchase_reason_comment: str | None = None,
+    ) -> HanshaAlarmboxCreditCheck:
         """
-        # ユーザー単位でロック（重複購入防止）
-        lock_manager = LockManager(name=f"{cls.LOCK_NAME}_{client_id}", parallelism=1)
+        既存チェック〜購入（ロック内）
+
+        Returns:
+            status=success・credit_check_id 設定済みのレコード（詳細・PDFは未取得）
+        """
+        # (client_id, 法人番号) 単位でロック（重複購入防止）
+        # 重複が起きうるのは同じ法人番号だけなので、別の法人番号は並列に購入できる。
+        # ロック中に行うのは「既存チェック〜購入」だけ。詳細取得・PDF保存は
+        # 呼び出し元（補完ジョブ / apurchase_and_save）で行う
+        lock_manager = StripedLockManager(
+            name=cls.LOCK_NAME,
+            key=(client_id, corporation_number),
+            stripes=cls.LOCK_STRIPES,
+        )
 
         with lock_manager.lock(timeout=60):
             # 1. 既存チェック（同じ法人番号で pending/success がある場合はエラー）
@@ -94,51 +234,501 @@ class CreditCheckService:
                 logger.error(f"信用チェック購入失敗: {traceback.format_exc()}")
                 raise
 
-            # ---- ここから先は購入成功後なので、絶対に例外を投げない ----
+            # 5. 購入済みとして記録（課金はここで確定している）
+            # 詳細・PDF は未取得なので purchased_at / pdf_file_path は空のまま
+            credit_check.credit_check_id = credit_check_id
+            credit_check.status = HanshaAlarmboxCreditCheck.Status.SUCCESS
+            credit_check.save(update_fields=["credit_check_id", "status", "updated_at"])
+
+        return credit_check
+
+    @classmethod
+    def purchase_many(
+        cls,
+        client_id: int,
+        corporation_numbers: list[str],
+        deal: int | None = None,
+        purchase_reasons: list[int] | None = None,
+        purchase_reason_comment: str | None = None,
+        max_workers: int | None = None,
+    ) -> list[PurchaseOutcome]:
+        """
+        複数の法人番号の信用チェックをまとめて購入する
+
+        既存チェックは1クエリ、pending レコードは bulk_create で作成し、
+        購入 API は max_workers 件ずつ並列に呼ぶ。1件の失敗で他は止めない。
 
-            # 5. 信用チェック詳細取得（失敗しても続行）
-            detail = None
+        Args:
+            client_id: RiskEyes のクライアントID
+            corporation_numbers: 13桁の法人番号の配列
+            deal: 取引関係 (1=有, 2=無, 9=その他)
+            purchase_reasons: 購入理由IDの配列
+            purchase_reason_comment: 購入理由コメント
+            max_workers: 同時に購入 API を呼ぶ数（省略時は BATCH_MAX_WORKERS）
+
+        Returns:
+            corporation_numbers と同じ順番の PurchaseOutcome の配列
+
+        Raises:
+            トークン取得など全件に関わる処理の例外（作成した pending は error に戻す）
+        """
+        outcomes: dict[int, PurchaseOutcome] = {}
+        first_index: dict[str, int] = {}
+        for index, corporation_number in enumerate(corporation_numbers):
+            if corporation_number in first_index:
+                # リスト内の重複は最初の1件だけ購入する
+                outcomes[index] = PurchaseOutcome(
+                    corporation_number, PurchaseOutcome.DUPLICATE
+                )
+            else:
+                first_index[corporation_number] = index
+
+        # 1. 既存チェック〜pending 作成
+        # 単体購入と同じストライプのロックを取り、チェックと作成の間に割り込ませない。
+        # デッドロックしないようストライプ番号順に取る
+        stripe_keys = {}
+        for corporation_number in first_index:
+            key = (client_id, corporation_number)
+            stripe_keys.setdefault(
+                StripedLockManager.stripe_of(key, cls.LOCK_STRIPES), key
+            )
+        with ExitStack() as stack:
+            for stripe in sorted(stripe_keys):
+                lock_manager = StripedLockManager(
+                    name=cls.LOCK_NAME,
+                    key=stripe_keys[stripe],
+                    stripes=cls.LOCK_STRIPES,
+                )
+                stack.enter_context(lock_manager.lock(timeout=60))
+
+            existing = set(
+                HanshaAlarmboxCreditCheck.objects.filter(
+                    client_id=client_id,
+                    corporation_number__in=list(first_index),
+                    status__in=[
+                        HanshaAlarmboxCreditCheck.Status.PENDING,
+                        HanshaAlarmboxCreditCheck.Status.SUCCESS,
+                    ],
+                ).values_list("corporation_number", flat=True)
+            )
+
+            credit_checks = HanshaAlarmboxCreditCheck.objects.bulk_create(
+                [
+                    HanshaAlarmboxCreditCheck(
+                        client_id=client_id,
+                        corporation_number=corporation_number,
+                        status=HanshaAlarmboxCreditCheck.Status.PENDING,
+                    )
+                    for corporation_number in first_index
+                    if corporation_number not in existing
+                ]
+            )
+        # ここから先は pending レコードが他リクエストの既存チェックに引っかかるのでロック不要
+
+        for corporation_number in existing:
+            outcomes[first_index[corporation_number]] = PurchaseOutcome(
+                corporation_number, PurchaseOutcome.DUPLICATE
+            )
+
+        if credit_checks:
+            # 2. 購入
             try:
-                logger.info(
-                    f"信用チェック詳細取得開始: credit_check_id={credit_check_id}"
+                cls._purchase_created(
+                    credit_checks,
+                    first_index,
+                    outcomes,
+                    deal=deal,
+                    purchase_reasons=purchase_reasons,
+                    purchase_reason_comment=purchase_reason_comment,
+                    max_workers=max_workers,
                 )
-                detail = client.get_credit_check(credit_check_id, with_pdf=True)
-                logger.info("信用チェック詳細取得完了")
-            except Exception:
-                logger.error(
-                    f"信用チェック詳細取得失敗: credit_check_id={credit_check_id}\n{traceback.format_exc()}"
+            finally:
+                # 途中で例外になっても pending のまま残さない
+                # （pending は「処理中」扱いなので、残ると二度と購入できなくなる）
+                recorded = cls._settle_pending(credit_checks)
+
+            for credit_check in recorded:
+                outcomes[first_index[credit_check.corporation_number]] = PurchaseOutcome(
+                    credit_check.corporation_number,
+                    PurchaseOutcome.PURCHASED,
+                    credit_check=credit_check,
                 )
 
-            # 6. PDFをGCSに保存（失敗しても続行）
-            pdf_file_path = None
-            if detail and detail.get("pdf_file_data"):
+            # 3. 詳細取得〜PDF保存は補完ジョブ1回でまとめて行う
+            try:
+                cls._enqueue_completion()
+            except Exception:
+                logger.error(f"補完ジョブ登録失敗: {traceback.format_exc()}")
+
+        purchased = sum(
+            outcome.status == PurchaseOutcome.PURCHASED for outcome in outcomes.values()
+        )
+        logger.info(
+            f"信用チェック一括購入完了: client_id={client_id}, "
+            f"件数={len(corporation_numbers)}, 購入={purchased}"
+        )
+
+        return [outcomes[index] for index in range(len(corporation_numbers))]
+
+    @classmethod
+    def _purchase_created(
+        cls,
+        credit_checks: list[HanshaAlarmboxCreditCheck],
+        first_index: dict[str, int],
+        outcomes: dict[int, PurchaseOutcome],
+        deal: int | None,
+        purchase_reasons: list[int] | None,
+        purchase_reason_comment: str | None,
+        max_workers: int | None,
+    ) -> None:
+        """purchase_many で作成した pending レコードを購入し、結果を outcomes に入れる"""
+        # トークンとクライアントは全件で共有
+        access_token = TokenService.get_valid_access_token()
+        client = AlarmboxClient(access_token)
+
+        def purchase(credit_check):
+            result = client.purchase_credit_check(
+                corporation_number=credit_check.corporation_number,
+                deal=deal,
+                purchase_reasons=purchase_reasons,
+                purchase_reason_comment=purchase_reason_comment,
+            )
+            return result["credit_check"]["credit_check_id"]
+
+        # スレッドでは API だけを呼び、DB 更新はこのスレッドで1件ずつ行う
+        # （購入済みの credit_check_id をすぐ記録して、途中で落ちても失わないため）
+        with ThreadPoolExecutor(
+            max_workers=max_workers or cls.BATCH_MAX_WORKERS
+        ) as executor:
+            futures = {
+                executor.submit(purchase, credit_check): credit_check
+                for credit_check in credit_checks
+            }
+            for future in as_completed(futures):
+                credit_check = futures[future]
+                index = first_index[credit_check.corporation_number]
                 try:
-                    pdf_file_path = cls._save_pdf_to_gcs(
-                        client_id=client_id,
-                        credit_check_id=credit_check_id,
-                        pdf_base64=detail["pdf_file_data"],
+                    credit_check.credit_check_id = future.result()
+                except Exception as e:
+                    # status は _settle_pending でまとめて error にする
+                    logger.error(
+                        f"信用チェック購入失敗: {credit_check.corporation_number}\n"
+                        f"{traceback.format_exc()}"
+                    )
+                    outcomes[index] = PurchaseOutcome(
+                        credit_check.corporation_number,
+                        PurchaseOutcome.ERROR,
+                        credit_check=credit_check,
+                        error=str(e),
+                    )
+                    continue
+
+                # 1件の保存失敗で残りの購入結果の記録を止めない
+                try:
+                    credit_check.status = HanshaAlarmboxCreditCheck.Status.SUCCESS
+                    credit_check.save(
+                        update_fields=["credit_check_id", "status", "updated_at"]
                     )
-                    logger.info(f"PDF保存完了: {pdf_file_path}")
-                except Exception:
+                except Exception as e:
+                    # 課金は確定しているので、_settle_pending でもう一度記録を試みる
+                    credit_check.status = HanshaAlarmboxCreditCheck.Status.PENDING
                     logger.error(
-                        f"PDF保存失敗: credit_check_id={credit_check_id}\n{traceback.format_exc()}"
+                        f"購入済み信用チェックの保存失敗: {credit_check.corporation_number}, "
+                        f"credit_check_id={credit_check.credit_check_id}\n"
+                        f"{traceback.format_exc()}"
+                    )
+                    outcomes[index] = PurchaseOutcome(
+                        credit_check.corporation_number,
+                        PurchaseOutcome.ERROR,
+                        credit_check=credit_check,
+                        error=str(e),
                     )
+                    continue
 
-            # 7. レコード更新（取得できた情報だけで success）
-            credit_check.credit_check_id = credit_check_id
-            credit_check.status = HanshaAlarmboxCreditCheck.Status.SUCCESS
-            credit_check.pdf_file_path = pdf_file_path
+                outcomes[index] = PurchaseOutcome(
+                    credit_check.corporation_number,
+                    PurchaseOutcome.PURCHASED,
+                    credit_check=credit_check,
+                )
 
-            if detail:
-                cls._update_credit_check(credit_check, detail)
+    @classmethod
+    def _settle_pending(
+        cls, credit_checks: list[HanshaAlarmboxCreditCheck]
+    ) -> list[HanshaAlarmboxCreditCheck]:
+        """
+        一括購入の後始末: pending のまま残ったレコードを確定させる
 
-            # 8. リスク情報テーブルに保存
-            if detail:
-                cls._save_infos(credit_check, detail)
+        - 購入済み（credit_check_id あり）で保存できなかったもの -> success で記録し直す
+        - それ以外 -> error（再購入可能）
 
-            logger.info(f"DB保存完了: id={credit_check.id}")
+        Returns:
+            success で記録し直せたレコード
+        """
+        now = timezone.now()
+        recorded = []
+        for credit_check in credit_checks:
+            if (
+                credit_check.credit_check_id is None
+                or credit_check.status != HanshaAlarmboxCreditCheck.Status.PENDING
+            ):
+                continue
+            try:
+                updated = HanshaAlarmboxCreditCheck.objects.filter(
+                    pk=credit_check.pk,
+                    status=HanshaAlarmboxCreditCheck.Status.PENDING,
+                ).update(
+                    credit_check_id=credit_check.credit_check_id,
+                    status=HanshaAlarmboxCreditCheck.Status.SUCCESS,
+                    updated_at=now,
+                )
+            except Exception:
+                logger.error(
+                    f"購入済み信用チェックの記録失敗: id={credit_check.pk}, "
+                    f"credit_check_id={credit_check.credit_check_id}\n"
+                    f"{traceback.format_exc()}"
+                )
+                continue
+            if updated:
+                credit_check.status = HanshaAlarmboxCreditCheck.Status.SUCCESS
+                recorded.append(credit_check)
 
-            return credit_check
+        unpurchased = [
+            credit_check
+            for credit_check in credit_checks
+            if credit_check.credit_check_id is None
+        ]
+        try:
+            HanshaAlarmboxCreditCheck.objects.filter(
+                pk__in=[credit_check.pk for credit_check in unpurchased],
+                status=HanshaAlarmboxCreditCheck.Status.PENDING,
+            ).update(status=HanshaAlarmboxCreditCheck.Status.ERROR, updated_at=now)
+        except Exception:
+            logger.error(f"pending レコードの error 更新失敗: {traceback.format_exc()}")
+        else:
+            for credit_check in unpurchased:
+                credit_check.status = HanshaAlarmboxCreditCheck.Status.ERROR
+
+        return recorded
+
+    @classmethod
+    def complete(
+        cls, credit_check: HanshaAlarmboxCreditCheck
+    ) -> HanshaAlarmboxCreditCheck:
+        """
+        購入済みレコードの不足情報（詳細・リスク情報・PDF）を補完する
+
+        バックグラウンドジョブから呼ばれる。レコードの状態を見て未完了の
+        処理だけを行うので、何度実行しても結果は同じになる。
+        購入直後の delay() と定期実行が同じレコードを同時に処理しないよう、
+        行ロック（skip_locked）で取れたジョブだけが処理する。
+        補完しきれなかった場合は試行回数を増やし、次回の実行時刻を後ろにずらす。
+
+        Args:
+            credit_check: status=success かつ credit_check_id 設定済みのレコード
+
+        Returns:
+            更新した HanshaAlarmboxCreditCheck インスタンス
+            （他のジョブが処理中なら引数のまま）
+        """
+        error = None
+        with transaction.atomic():
+            claimed = (
+                HanshaAlarmboxCreditCheck.objects.select_for_update(skip_locked=True)
+                .filter(pk=credit_check.pk)
+                .first()
+            )
+            if claimed is None:
+                logger.info(f"他のジョブが補完中のためスキップ: id={credit_check.pk}")
+                return credit_check
+
+            if cls._is_complete(claimed):
+                return claimed
+
+            try:
+                # 失敗しても試行回数の記録は残すため、DB に書く処理は手順ごとにセーブポイントで囲む
+                # （全体を1つで囲むと、PDF の保存に失敗したときに取得済みの詳細まで巻き戻る）
+                cls._complete_claimed(claimed)
+            except Exception as e:
+                error = e
+                # 巻き戻した保存の値（detail_fetched_at など）がインスタンスに残らないよう、DB の値に戻す
+                claimed.refresh_from_db()
+
+            if not cls._is_complete(claimed):
+                cls._record_completion_attempt(claimed)
+
+        if error is not None:
+            raise error
+        return claimed
+
+    @classmethod
+    def _complete_claimed(cls, credit_check: HanshaAlarmboxCreditCheck) -> None:
+        """complete() の本体（行ロック取得済みのレコードに対して行う）"""
+        credit_check_id = credit_check.credit_check_id
+        needs_detail = credit_check.detail_fetched_at is None
+        needs_pdf = not credit_check.pdf_file_path
+
+        # トークンの更新で DB に書くことがあるため、これもセーブポイントで囲む
+        with transaction.atomic():
+            access_token = TokenService.get_valid_access_token()
+        client = AlarmboxClient(access_token)
+
+        # 1. 信用チェック詳細取得（PDF が必要な場合だけ with_pdf=True）
+        logger.info(f"信用チェック詳細取得開始: credit_check_id={credit_check_id}")
+        detail = client.get_credit_check(credit_check_id, with_pdf=needs_pdf)
+        logger.info("信用チェック詳細取得完了")
+
+        # 2. 詳細とリスク情報を保存（_save_detail のセーブポイントで確定させ、
+        #    以降の PDF の保存に失敗しても残す）
+        if needs_detail:
+            cls._save_detail(credit_check, detail)
+
+        # 3. PDFをGCSに保存
+        if needs_pdf and detail.get("pdf_file_data"):
+            pdf_file_path = cls._save_pdf_to_gcs(
+                client_id=credit_check.client_id,
+                credit_check_id=credit_check_id,
+                pdf_base64=detail["pdf_file_data"],
+            )
+            with transaction.atomic():
+                cls._save_pdf_file_path(credit_check, pdf_file_path)
+
+    @staticmethod
+    def _is_complete(credit_check: HanshaAlarmboxCreditCheck) -> bool:
+        """
+        補完済みかどうか
+
+        詳細は取得した時点で完了とする（purchase_date などが欠けていても取り直さない）。
+        """
+        return credit_check.detail_fetched_at is not None and bool(
+            credit_check.pdf_file_path
+        )
+
+    @classmethod
+    def _record_completion_attempt(cls, credit_check: HanshaAlarmboxCreditCheck) -> None:
+        """補完の試行回数を増やし、次回の実行時刻を指数的に遅らせる"""
+        credit_check.completion_attempts += 1
+        backoff = min(
+            cls.COMPLETION_BACKOFF_BASE * 2 ** (credit_check.completion_attempts - 1),
+            cls.COMPLETION_BACKOFF_MAX,
+        )
+        credit_check.next_completion_at = timezone.now() + backoff
+        credit_check.save(
+            update_fields=["completion_attempts", "next_completion_at", "updated_at"]
+        )
+        logger.info(
+            f"補完未完了: id={credit_check.pk}, "
+            f"試行={credit_check.completion_attempts}, "
+            f"次回={credit_check.next_completion_at}"
+        )
+
+    @classmethod
+    async def _afetch_and_save_detail(
+        cls, client: AsyncAlarmboxClient, credit_check: HanshaAlarmboxCreditCheck
+    ) -> None:
+        """詳細（PDFなし）を取得してすぐDBに保存"""
+        detail = await client.get_credit_check(credit_check.credit_check_id)
+        await sync_to_async(cls._save_detail_once)(credit_check, detail)
+
+    @classmethod
+    async def _afetch_and_save_pdf(
+        cls, client: AsyncAlarmboxClient, credit_check: HanshaAlarmboxCreditCheck
+    ) -> None:
+        """PDF付き詳細を取得してGCSに保存"""
+        detail = await client.get_credit_check(
+            credit_check.credit_check_id, with_pdf=True
+        )
+        if not detail.get("pdf_file_data"):
+            return
+
+        # GCS 保存はDBを触らないので、DB 用のスレッドを塞がないよう別スレッドで行う
+        pdf_file_path = await sync_to_async(cls._save_pdf_to_gcs, thread_sensitive=False)(
+            client_id=credit_check.client_id,
+            credit_check_id=credit_check.credit_check_id,
+            pdf_base64=detail["pdf_file_data"],
+        )
+        await sync_to_async(cls._save_pdf_file_path)(credit_check, pdf_file_path)
+
+    @classmethod
+    def _save_detail(
+        cls, credit_check: HanshaAlarmboxCreditCheck, detail: CreditCheckResponse
+    ) -> None:
+        """詳細とリスク情報を保存（途中で落ちても再実行できるよう同一トランザクション）"""
+        with transaction.atomic():
+            cls._update_credit_check(credit_check, detail)
+            credit_check.infos.all().delete()
+            cls._save_infos(credit_check, detail)
+
+    @classmethod
+    def _save_detail_once(
+        cls, credit_check: HanshaAlarmboxCreditCheck, detail: CreditCheckResponse
+    ) -> bool:
+        """
+        詳細が未保存なら保存する（apurchase_and_save 用）
+
+        補完ジョブ（complete）と同時に走ってもリスク情報が二重にならないよう、
+        行ロックを取れて、かつ詳細が未保存のときだけ保存する。
+        補完ジョブがロックしている場合は、そちらに任せる。
+
+        Returns:
+            保存したら True
+        """
+        with transaction.atomic():
+            claimed = (
+                HanshaAlarmboxCreditCheck.objects.select_for_update(skip_locked=True)
+                .filter(pk=credit_check.pk, detail_fetched_at__isnull=True)
+                .first()
+            )
+            if claimed is None:
+                logger.info(f"詳細は保存済みまたは補完中のためスキップ: id={credit_check.pk}")
+                return False
+            cls._save_detail(credit_check, detail)
+        return True
+
+    @classmethod
+    def _save_pdf_file_path(
+        cls, credit_check: HanshaAlarmboxCreditCheck, pdf_file_path: str
+    ) -> None:
+        credit_check.pdf_file_path = pdf_file_path
+        credit_check.save(update_fields=["pdf_file_path", "updated_at"])
+        logger.info(f"PDF保存完了: {pdf_file_path}")
+
+    @classmethod
+    def get_incomplete(cls):
+        """
+        詳細またはPDFが未取得の購入済みレコード
+
+        補完ジョブの定期実行で、登録に失敗した・途中で落ちたレコードを拾うために使う。
+        前回の試行から next_completion_at まで待っているもの、
+        COMPLETION_MAX_ATTEMPTS 回試しても埋まらなかったものは除く。
+        """
+        now = timezone.now()
+        return HanshaAlarmboxCreditCheck.objects.filter(
+            Q(detail_fetched_at__isnull=True) | Q(pdf_file_path__isnull=True),
+            Q(next_completion_at__isnull=True) | Q(next_completion_at__lte=now),
+            status=HanshaAlarmboxCreditCheck.Status.SUCCESS,
+            credit_check_id__isnull=False,
+            completion_attempts__lt=cls.COMPLETION_MAX_ATTEMPTS,
+            created_at__gte=now - cls.COMPLETION_RETRY_PERIOD,
+        ).order_by("created_at")
+
+    @classmethod
+    def _enqueue_completion(
+        cls, credit_check: HanshaAlarmboxCreditCheck | None = None
+    ) -> None:
+        """
+        補完ジョブ（Cloud Run Jobs）を即時実行する
+
+        credit_check を省略すると未完了レコードをすべて処理する。
+        """
+        # 循環 import を避けるためここで import
+        from core.management.commands.complete_alarmbox_credit_check import (
+            Command as CompleteCreditCheckCommand,
+        )
+
+        if credit_check is None:
+            CompleteCreditCheckCommand().delay()
+        else:
+            CompleteCreditCheckCommand().delay(credit_check_pk=str(credit_check.pk))
 
     @classmethod
     def _update_credit_check(
@@ -147,6 +737,7 @@ class CreditCheckService:
         """詳細情報でレコードを更新"""
         credit_check.company_name = detail.get("corporation_name")
         credit_check.result = detail.get("result")
+        credit_check.detail_fetched_at = timezone.now()
 
         if detail.get("purchase_date"):
             credit_check.purchased_at = datetime.strptime(
@@ -157,7 +748,17 @@ class CreditCheckService:
                 detail["expiration_date"], "%Y-%m-%d"
             )
 
-        credit_check.save()
+        # pdf_file_path は並行して保存されることがあるので上書きしない
+        credit_check.save(
+            update_fields=[
+                "company_name",
+                "result",
+                "purchased_at",
+                "expired_at",
+                "detail_fetched_at",
+                "updated_at",
+            ]
+        )
 
     @classmethod
     def _save_infos(
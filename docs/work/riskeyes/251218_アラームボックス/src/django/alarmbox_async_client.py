@@ -0,0 +1,174 @@
+# lib/alarmbox/async_client.py
+
+import asyncio
+import json
+import random
+import weakref
+
+import httpx
+
+from .client import AlarmboxClient, get_http_settings
+from .exceptions import AlarmboxAPIError
+from .types import CreditCheckGetParams, CreditCheckResponse
+
+# リトライ対象のステータス（同期版の AlarmboxClient と同じ）
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class AsyncAlarmboxClient:
+    """
+    AlarmBox API を呼び出すクライアント（asyncio 版）
+
+    信用チェックの詳細取得だけを持つ。購入はロック・DB 更新と一緒に同期版で行い、
+    トークン取得も同期版の AlarmboxClient を使う。
+    HTTP 接続はイベントループごとに1つの httpx.AsyncClient（接続プール）を共有するので、
+    インスタンスを毎回作っても TCP/TLS の接続は使い回される。
+    プロセス終了時（ASGI の lifespan shutdown など）に aclose_clients() で閉じる。
+
+    使用例:
+        client = AsyncAlarmboxClient(access_token)
+        detail, pdf = await asyncio.gather(
+            client.get_credit_check(credit_check_id),
+            client.get_credit_check(credit_check_id, with_pdf=True),
+        )
+    """
+
+    # httpx.AsyncClient は作成したイベントループでしか使えないのでループごとに持つ。
+    # 終了したループのクライアントはループと一緒に破棄される
+    _clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, access_token: str):
+        self.access_token = access_token
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+        }
+        self._http_settings = get_http_settings()
+
+    # ========== 接続プール ==========
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """実行中のイベントループ共通のクライアントを取得（初回だけ作成）"""
+        loop = asyncio.get_running_loop()
+        client = cls._clients.get(loop)
+        if client is None or client.is_closed:
+            client = cls._build_client()
+            cls._clients[loop] = client
+        return client
+
+    @classmethod
+    def _build_client(cls) -> httpx.AsyncClient:
+        http_settings = get_http_settings()
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=http_settings["POOL_SIZE"],
+                max_keepalive_connections=http_settings["POOL_SIZE"],
+            ),
+            # 上限まで使われているときに空きを待つ時間（超えたら PoolTimeout）
+            timeout=httpx.Timeout(
+                http_settings["READ_TIMEOUT"],
+                connect=http_settings["CONNECT_TIMEOUT"],
+                pool=http_settings["POOL_TIMEOUT"],
+            ),
+            # 接続エラー（リクエスト送信前の失敗）だけリトライ。POST でも安全
+            transport=httpx.AsyncHTTPTransport(retries=http_settings["MAX_RETRIES"]),
+        )
+
+    @classmethod
+    async def aclose_clients(cls) -> None:
+        """実行中のイベントループのクライアントを閉じる（シャットダウン時・テスト用）"""
+        client = cls._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    # ========== 内部メソッド ==========
+
+    @property
+    def base_url(self) -> str:
+        """接続先は同期版と共通"""
+        return AlarmboxClient.BASE_URL
+
+    def _timeout(self, read_timeout_key: str = "READ_TIMEOUT") -> httpx.Timeout:
+        return httpx.Timeout(
+            self._http_settings[read_timeout_key],
+            connect=self._http_settings["CONNECT_TIMEOUT"],
+            pool=self._http_settings["POOL_TIMEOUT"],
+        )
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        HTTP リクエスト実行（例外処理付き）
+
+        GET はステータス 429/5xx・タイムアウトのときジッター付き指数バックオフでリトライする。
+        購入（POST）を再送すると二重課金になるのでリトライしない。
+        """
+        client = self.get_client()
+        kwargs.setdefault("headers", self.headers)
+        retries = self._http_settings["MAX_RETRIES"] if method == "GET" else 0
+        for attempt in range(retries + 1):
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TimeoutException:
+                if attempt < retries:
+                    await self._backoff(attempt)
+                    continue
+                raise AlarmboxAPIError("タイムアウト: AlarmBox API に接続できません")
+            except httpx.TransportError:
+                raise AlarmboxAPIError("接続エラー: AlarmBox API に接続できません")
+            except httpx.HTTPError as e:
+                raise AlarmboxAPIError(f"リクエストエラー: {e}")
+
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                await self._backoff(attempt, response.headers.get("Retry-After"))
+                continue
+            return response
+
+    async def _backoff(self, attempt: int, retry_after: str | None = None) -> None:
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = self._http_settings["BACKOFF_FACTOR"] * (2**attempt)
+            delay += random.uniform(0, self._http_settings["BACKOFF_JITTER"])
+        await asyncio.sleep(delay)
+
+    @classmethod
+    def _handle_response(
+        cls, response: httpx.Response, expected_status: int = 200
+    ) -> dict:
+        """レスポンス処理（ステータスチェック + JSONパース）"""
+        if response.status_code != expected_status:
+            raise AlarmboxAPIError(
+                message=f"APIエラー: {response.status_code}",
+                status_code=response.status_code,
+                response_body=response.text,
+            )
+        try:
+            return response.json()
+        except json.JSONDecodeError:
+            raise AlarmboxAPIError(f"JSONパースエラー: {response.text[:200]}")
+
+    # ========== 公開メソッド ==========
+
+    async def get_credit_check(
+        self, credit_check_id: int, with_pdf: bool = False
+    ) -> CreditCheckResponse:
+        """
+        信用チェックの詳細を取得する
+        GET /ps/v1/credit_checks/{id}
+        """
+        url = f"{self.base_url}/ps/v1/credit_checks/{credit_check_id}"
+
+        params: CreditCheckGetParams = {}
+        if with_pdf:
+            params["with_pdf"] = True
+
+        response = await self._request(
+            "GET",
+            url,
+            params=params or None,
+            timeout=self._timeout("PDF_READ_TIMEOUT" if with_pdf else "READ_TIMEOUT"),
+        )
+        result = self._handle_response(response)
+        return result["credit_check"]
@@ -0,0 +1,364 @@
+# lib/alarmbox/client.py
+
+import json
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, RequestException, Timeout
+from urllib3.util.retry import Retry
+
+from .exceptions import AlarmboxAPIError
+from .types import (
+    AuthorizationCodeRequest,
+    CreditCheckGetParams,
+    CreditCheckPurchaseRequest,
+    CreditCheckPurchaseResponse,
+    CreditCheckResponse,
+    RefreshTokenRequest,
+    TokenResponse,
+)
+
+# デフォルトのリダイレクトURI（OOB: Out-of-Band）
+DEFAULT_REDIRECT_URI = "urn:ietf:wg:oauth:2.0:oob"
+
+# HTTP 接続の設定（settings.ALARMBOX_HTTP で上書き可能）
+DEFAULT_HTTP_SETTINGS = {
+    # プロセス内で保持する keep-alive 接続の数（= 同時リクエスト数の上限）
+    "POOL_SIZE": 10,
+    # 同時リクエストが POOL_SIZE を超えたときに空きを待つ秒数（超えたらエラー）
+    "POOL_TIMEOUT": 10,
+    "CONNECT_TIMEOUT": 5,
+    "READ_TIMEOUT": 30,
+    # PDF 込みの詳細取得は遅いので別枠
+    "PDF_READ_TIMEOUT": 60,
+    # GET のリトライ回数と待機時間（backoff_factor * 2^n + 0〜jitter 秒）
+    "MAX_RETRIES": 3,
+    "BACKOFF_FACTOR": 0.5,
+    "BACKOFF_JITTER": 0.5,
+}
+
+
+def get_http_settings() -> dict:
+    return {**DEFAULT_HTTP_SETTINGS, **getattr(settings, "ALARMBOX_HTTP", {})}
+
+
+class _Stats:
+    """接続プール・リトライの統計（プロセス単位）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.retries = 0
+            self.errors = 0
+
+    def incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+_stats = _Stats()
+
+
+class _CountingRetry(Retry):
+    """リトライ回数を統計に数える Retry"""
+
+    def increment(self, *args, **kwargs):
+        _stats.incr("retries")
+        return super().increment(*args, **kwargs)
+
+
+class AlarmboxClient:
+    """
+    AlarmBox API を呼び出すクライアント
+
+    HTTP 接続はプロセス全体で1つのセッション（接続プール）を共有するので、
+    インスタンスを毎回作っても TCP/TLS の接続は使い回される。
+    """
+
+    BASE_URL = "https://api.alarmbox.jp"
+
+    _session: requests.Session | None = None
+    # 同時リクエスト数を POOL_SIZE に抑える枠（空き待ちに POOL_TIMEOUT を設けるため）
+    _slots: threading.BoundedSemaphore | None = None
+    _session_lock = threading.Lock()
+
+    def __init__(self, access_token: str):
+        self.access_token = access_token
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+            # Content-Type は requests が自動設定（json= で application/json）
+        }
+
+    # ========== 接続プール ==========
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """プロセス共通のセッションを取得（初回だけ作成）"""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    cls._session = cls._build_session()
+        return cls._session
+
+    @classmethod
+    def _get_slots(cls) -> threading.BoundedSemaphore:
+        if cls._slots is None:
+            with cls._session_lock:
+                if cls._slots is None:
+                    cls._slots = threading.BoundedSemaphore(get_http_settings()["POOL_SIZE"])
+        return cls._slots
+
+    @classmethod
+    def _build_session(cls) -> requests.Session:
+        http_settings = get_http_settings()
+
+        # リトライするのは GET だけ。購入（POST）を再送すると二重課金になる。
+        # 接続エラー（リクエスト送信前の失敗）はメソッドに関係なくリトライされる
+        retry = _CountingRetry(
+            total=http_settings["MAX_RETRIES"],
+            allowed_methods=frozenset(["GET"]),
+            status_forcelist=(429, 500, 502, 503, 504),
+            backoff_factor=http_settings["BACKOFF_FACTOR"],
+            backoff_jitter=http_settings["BACKOFF_JITTER"],
+            respect_retry_after_header=True,
+            # リトライし切ったら最後のレスポンスを返し、_handle_response でエラーにする
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=http_settings["POOL_SIZE"],
+            # 上限を超えたら接続を増やさず空きを待つ
+            # （requests からは待ち時間を指定できないので、_request の枠で POOL_TIMEOUT を設ける）
+            pool_block=True,
+            max_retries=retry,
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @classmethod
+    def close_session(cls) -> None:
+        """
+        セッションを破棄する（設定変更時・テスト用）
+
+        接続数（get_stats の connections）はセッションと一緒に消えるので、
+        他の統計もここでリセットして数字の対応を保つ。
+        """
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+            cls._slots = None
+            _stats.reset()
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        接続プールとリトライの統計
+
+        Returns:
+            requests: 送信したリクエスト数（リトライは含まない）
+            retries: リトライ回数
+            errors: AlarmboxAPIError になった接続・タイムアウトエラー数
+                （接続プールの空き待ちタイムアウトを含む）
+            connections: 新しく張った接続の数（requests との差が再利用された数）
+            pool_size: 接続プールの上限
+        """
+        connections = 0
+        if cls._session is not None:
+            # http / https に同じアダプタを登録しているので、重複を除いて数える
+            for adapter in set(cls._session.adapters.values()):
+                for key in adapter.poolmanager.pools.keys():
+                    connections += adapter.poolmanager.pools[key].num_connections
+        return {
+            "requests": _stats.requests,
+            "retries": _stats.retries,
+            "errors": _stats.errors,
+            "connections": connections,
+            "pool_size": get_http_settings()["POOL_SIZE"],
+        }
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        _stats.reset()
+
+    # ========== 内部メソッド ==========
+
+    @classmethod
+    def _timeout(cls, read_timeout_key: str = "READ_TIMEOUT") -> tuple[float, float]:
+        http_settings = get_http_settings()
+        return (http_settings["CONNECT_TIMEOUT"], http_settings[read_timeout_key])
+
+    @classmethod
+    def _request(cls, method: str, url: str, **kwargs) -> requests.Response:
+        """HTTP リクエスト実行（例外処理付き）"""
+        kwargs.setdefault("timeout", cls._timeout())
+        slots = cls._get_slots()
+        if not slots.acquire(timeout=get_http_settings()["POOL_TIMEOUT"]):
+            _stats.incr("errors")
+            raise AlarmboxAPIError("接続プールの空き待ちタイムアウト: AlarmBox API に接続できません")
+        _stats.incr("requests")
+        try:
+            return cls.get_session().request(method, url, **kwargs)
+        except Timeout:
+            _stats.incr("errors")
+            raise AlarmboxAPIError("タイムアウト: AlarmBox API に接続できません")
+        except ConnectionError:
+            _stats.incr("errors")
+            raise AlarmboxAPIError("接続エラー: AlarmBox API に接続できません")
+        except RequestException as e:
+            _stats.incr("errors")
+            raise AlarmboxAPIError(f"リクエストエラー: {e}")
+        finally:
+            slots.release()
+
+    @classmethod
+    def _handle_response(
+        cls, response: requests.Response, expected_status: int = 200
+    ) -> dict:
+        """レスポンス処理（ステータスチェック + JSONパース）"""
+        if response.status_code != expected_status:
+            raise AlarmboxAPIError(
+                message=f"APIエラー: {response.status_code}",
+                status_code=response.status_code,
+                response_body=response.text,
+            )
+        try:
+            return response.json()
+        except json.JSONDecodeError:
+            raise AlarmboxAPIError(f"JSONパースエラー: {response.text[:200]}")
+
+    @classmethod
+    def _post_form(cls, url: str, payload: dict, expected_status: int = 200) -> dict:
+        """
+        フォーム形式の POST リクエスト（OAuth 用）
+
+        Content-Type: application/x-www-form-urlencoded
+        """
+        response = cls._request("POST", url, data=payload)
+        return cls._handle_response(response, expected_status)
+
+    @classmethod
+    def _post_json(
+        cls, url: str, payload: dict, headers: dict, expected_status: int = 200
+    ) -> dict:
+        """
+        JSON 形式の POST リクエスト（REST API 用）
+
+        Content-Type: application/json
+        """
+        response = cls._request("POST", url, json=payload, headers=headers)
+        return cls._handle_response(response, expected_status)
+
+    # ========== 公開メソッド ==========
+
+    @classmethod
+    def get_token_by_code(
+        cls, code: str, redirect_uri: str = DEFAULT_REDIRECT_URI
+    ) -> TokenResponse:
+        """
+        認可コードからトークンを取得する（初回認証用）
+        POST /oauth/token
+        """
+        url = f"{cls.BASE_URL}/oauth/token"
+        payload: AuthorizationCodeRequest = {
+            "grant_type": "authorization_code",
+            "client_id": settings.ALARMBOX_INFO["client_id"],
+            "client_secret": settings.ALARMBOX_INFO["client_secret"],
+            "code": code,
+            "redirect_uri": redirect_uri,
+        }
+        return cls._post_form(url, payload)
+
+    @classmethod
+    def refresh_token(
+        cls, refresh_token: str, redirect_uri: str = DEFAULT_REDIRECT_URI
+    ) -> TokenResponse:
+        """
+        リフレッシュトークンを使って新しいトークンを取得する
+        POST /oauth/token
+        """
+        url = f"{cls.BASE_URL}/oauth/token"
+        payload: RefreshTokenRequest = {
+            "grant_type": "refresh_token",
+            "client_id": settings.ALARMBOX_INFO["client_id"],
+            "client_secret": settings.ALARMBOX_INFO["client_secret"],
+            "refresh_token": refresh_token,
+            "redirect_uri": redirect_uri,
+        }
+        return cls._post_form(url, payload)
+
+    def purchase_credit_check(
+        self,
+        corporation_number: str,
+        deal: int | None = None,
+        purchase_reasons: list[int] | None = None,
+        purchase_reason_comment: str | None = None,
+    ) -> CreditCheckPurchaseResponse:
+        """
+        信用チェックを購入する
+        POST /ps/v1/credit_checks
+
+        Args:
+            corporation_number: 13桁の法人番号
+            deal: 取引関係 (1=有, 2=無, 9=その他)
+            purchase_reasons: 購入理由IDの配列
+            purchase_reason_comment: 購入理由コメント
+
+        Returns:
+            購入結果（credit_check_id を含む）
+        """
+        url = f"{self.BASE_URL}/ps/v1/credit_checks"
+        payload: CreditCheckPurchaseRequest = {
+            "corporation_number": corporation_number,
+        }
+        if deal is not None:
+            payload["deal"] = deal
+        if purchase_reasons is not None:
+            payload["purchase_reasons"] = purchase_reasons
+        if purchase_reason_comment is not None:
+            payload["purchase_reason_comment"] = purchase_reason_comment
+
+        return self._post_json(
+            url=url,
+            payload=payload,
+            headers=self.headers,
+        )
+
+    def get_credit_check(
+        self, credit_check_id: int, with_pdf: bool = False
+    ) -> CreditCheckResponse:
+        """
+        信用チェックの詳細を取得する
+        GET /ps/v1/credit_checks/{id}
+
+        Args:
+            credit_check_id: 信用チェックID
+            with_pdf: PDFデータを含めるか
+
+        Returns:
+            信用チェックの詳細
+        """
+        url = f"{self.BASE_URL}/ps/v1/credit_checks/{credit_check_id}"
+
+        params: CreditCheckGetParams = {}
+        if with_pdf:
+            params["with_pdf"] = True
+
+        response = self._request(
+            "GET",
+            url,
+            headers=self.headers,
+            params=params or None,
+            timeout=self._timeout("PDF_READ_TIMEOUT" if with_pdf else "READ_TIMEOUT"),
+        )
+        result = self._handle_response(response)
+        return result["credit_check"]
@@ -0,0 +1,74 @@
+# core/management/commands/bench_alarmbox_client.py
+
+import statistics
+import time
+from unittest import mock
+
+import requests
+from django.core.management.base import BaseCommand
+
+from lib.alarmbox.client import AlarmboxClient
+from lib.alarmbox.testing import FakeAlarmboxServer
+
+
+class Command(BaseCommand):
+    """AlarmboxClient の接続プールの効果を測るコマンド"""
+
+    help = "ローカルの偽 AlarmBox サーバーに対して、接続の使い回しあり/なしの1回あたりのレイテンシを比較します"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="計測するリクエスト数")
+        parser.add_argument(
+            "--base_url",
+            default=None,
+            help="計測先（省略時はローカルの偽サーバーを起動。TLS込みで測るなら https の stub を指定）",
+        )
+
+    def handle(self, *args, **options):
+        if options["base_url"]:
+            self.bench(options["base_url"], options["requests"])
+        else:
+            with FakeAlarmboxServer() as server:
+                self.bench(server.base_url, options["requests"])
+
+    def bench(self, base_url, count):
+        with mock.patch.object(AlarmboxClient, "BASE_URL", base_url):
+            # 使い回しなし: 従来の requests.request と同じく毎回新しい接続
+            def new_connection():
+                session = requests.Session()
+                with mock.patch.object(
+                    AlarmboxClient, "get_session", return_value=session
+                ):
+                    AlarmboxClient("bench").get_credit_check(1)
+                session.close()
+
+            # 使い回しあり: プロセス共通のプール
+            def pooled():
+                AlarmboxClient("bench").get_credit_check(1)
+
+            results = {"new_connection": self.measure(new_connection, count)}
+
+            AlarmboxClient.close_session()
+            AlarmboxClient.reset_stats()
+            results["pooled"] = self.measure(pooled, count)
+            stats = AlarmboxClient.get_stats()
+
+        for name, timings in results.items():
+            self.stdout.write(
+                f"{name:>15}: mean={statistics.mean(timings):.2f}ms "
+                f"p50={statistics.median(timings):.2f}ms "
+                f"p95={timings[int(len(timings) * 0.95) - 1]:.2f}ms"
+            )
+        saving = statistics.mean(results["new_connection"]) - statistics.mean(
+            results["pooled"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"1回あたりの短縮: {saving:.2f}ms"))
+        self.stdout.write(f"stats: {stats}")
+
+    def measure(self, func, count):
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)
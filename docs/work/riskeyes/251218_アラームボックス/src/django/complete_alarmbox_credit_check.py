@@ -0,0 +1,54 @@
+# core/management/commands/complete_alarmbox_credit_check.py
+
+import traceback
+
+from core.contrib.management.cloud_run_jobs.command import CloudRunJobs
+from core.models.riskeyes_v2.alarmbox import HanshaAlarmboxCreditCheck
+from lib.alarmbox.credit_check_service import CreditCheckService
+
+
+class Command(CloudRunJobs):
+    """購入済み信用チェックの詳細・PDFを補完するバッチ"""
+
+    help = "購入済み信用チェックの詳細・リスク情報・PDFを取得して保存します"
+
+    # 購入直後は CreditCheckService から delay() で即時実行される。
+    # 登録失敗・途中終了したレコードは定期実行で拾い直す
+    schedule = "*/10 * * * *"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--credit_check_pk",
+            default=None,
+            help="補完するレコードのID（未指定なら未完了レコードをすべて処理）",
+        )
+
+    def run(self, *args, **options):
+        credit_check_pk = options.get("credit_check_pk")
+
+        if credit_check_pk:
+            credit_checks = HanshaAlarmboxCreditCheck.objects.filter(
+                pk=credit_check_pk,
+                status=HanshaAlarmboxCreditCheck.Status.SUCCESS,
+            )
+        else:
+            credit_checks = CreditCheckService.get_incomplete()
+
+        completed = failed = 0
+        for credit_check in credit_checks:
+            try:
+                CreditCheckService.complete(credit_check)
+                completed += 1
+            except Exception:
+                # 1件の失敗で他を止めない（次回の定期実行で再試行）
+                failed += 1
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"補完失敗: id={credit_check.pk}\n{traceback.format_exc()}"
+                    )
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"補完完了: 成功={completed}件, 失敗={failed}件")
+        )
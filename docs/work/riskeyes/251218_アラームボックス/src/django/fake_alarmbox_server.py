@@ -0,0 +1,145 @@
+# lib/alarmbox/testing.py
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeAlarmboxServer:
+    """
+    テスト用のローカル AlarmBox API サーバー
+
+    信用チェックの購入（POST /ps/v1/credit_checks）と
+    詳細取得（GET /ps/v1/credit_checks/{id}）だけを実装する。
+
+    使用例:
+        with FakeAlarmboxServer(fail_numbers={"9999999999999"}) as server:
+            with mock.patch.object(AlarmboxClient, "BASE_URL", server.base_url):
+                ...
+            server.purchased  # 購入された法人番号
+    """
+
+    PDF_BYTES = b"%PDF-1.4 fake"
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        fail_numbers: set[str] | None = None,
+        transient_errors: int = 0,
+    ):
+        self.delay = delay
+        self.fail_numbers = fail_numbers or set()
+        # 最初の N リクエストは 503 を返す（リトライの確認用）
+        self.transient_errors = transient_errors
+        self.purchased: list[str] = []
+        self.requests: list[tuple[str, str]] = []
+        # リクエストを受けた接続（クライアントのアドレス）。接続の使い回しの確認用
+        self.connections: set[tuple[str, int]] = set()
+        self.active = 0
+        self.max_active = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def purchase(self, corporation_number: str) -> tuple[int, dict]:
+        if corporation_number in self.fail_numbers:
+            return 422, {"errors": [{"message": "購入できない法人番号です"}]}
+        with self._lock:
+            credit_check_id = self._next_id
+            self._next_id += 1
+            self.purchased.append(corporation_number)
+        return 200, {
+            "credit_check": {
+                "credit_check_id": credit_check_id,
+                "corporation_number": corporation_number,
+            }
+        }
+
+    def detail(self, credit_check_id: int, with_pdf: bool) -> tuple[int, dict]:
+        credit_check = {
+            "credit_check_id": credit_check_id,
+            "corporation_name": f"テスト株式会社{credit_check_id}",
+            "result": "ok",
+            "purchase_date": "2025-12-26",
+            "expiration_date": "2026-12-26",
+            "infos": [
+                {
+                    "received_date": "2025-12-01",
+                    "tags": [{"name": "業績", "description": "増収", "source": "財務"}],
+                }
+            ],
+        }
+        if with_pdf:
+            credit_check["pdf_file_data"] = base64.b64encode(self.PDF_BYTES).decode()
+        return 200, {"credit_check": credit_check}
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive を有効にする（接続の再利用を確認できるように）
+            protocol_version = "HTTP/1.1"
+            # ヘッダーと本文を別々に送るので、Nagle と遅延 ACK が重なると
+            # keep-alive 接続の2回目以降のレスポンスが約 40ms 遅れる。ベンチの邪魔なので切る
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                payload = json.loads(body or b"{}")
+                self._respond("POST", fake.purchase, payload.get("corporation_number"))
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                credit_check_id = int(url.path.rstrip("/").rsplit("/", 1)[-1])
+                with_pdf = parse_qs(url.query).get("with_pdf", [""])[0].lower() == "true"
+                self._respond("GET", fake.detail, credit_check_id, with_pdf)
+
+            def _respond(self, method, action, *args):
+                with fake._lock:
+                    fake.requests.append((method, self.path))
+                    fake.connections.add(self.client_address)
+                    fake.active += 1
+                    fake.max_active = max(fake.max_active, fake.active)
+                    transient = fake.transient_errors > 0
+                    if transient:
+                        fake.transient_errors -= 1
+                try:
+                    if fake.delay:
+                        time.sleep(fake.delay)
+                    if transient:
+                        status, body = 503, {"errors": [{"message": "一時的なエラー"}]}
+                    else:
+                        status, body = action(*args)
+                finally:
+                    with fake._lock:
+                        fake.active -= 1
+
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
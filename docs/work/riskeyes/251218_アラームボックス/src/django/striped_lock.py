@@ -0,0 +1,49 @@
+# core/lib/lock.py（LockManager の下に追加）
+
+import zlib
+
+from django.conf import settings
+
+
+class StripedLockManager(LockManager):
+    """
+    キー単位のロックを固定数のストライプに割り当てる LockManager
+
+    同じキーは必ず同じストライプ（= 同じロック）になるので、キー単位の排他は
+    LockManager と同じく保証される。違うキーは別ストライプに散らばるので並列に動く。
+    ストライプ数で上限を決めるため、キーが増えてもロック用のキャッシュキーは増えない。
+
+    使用例:
+        lock_manager = StripedLockManager(
+            name="alarmbox_credit_check",
+            key=(client_id, corporation_number),
+        )
+        with lock_manager.lock(timeout=60):
+            ...
+    """
+
+    DEFAULT_STRIPES = 256
+
+    def __init__(self, name: str, key, stripes: int | None = None):
+        if stripes is None:
+            stripes = getattr(settings, "LOCK_DEFAULT_STRIPES", self.DEFAULT_STRIPES)
+        if stripes < 1:
+            raise ValueError("stripes は1以上を指定してください")
+
+        self.key = key
+        self.stripes = stripes
+        self.stripe = self.stripe_of(key, stripes)
+        # ストライプ内は1つずつ（parallelism > 1 だと同じキーが同時に通ってしまう）
+        super().__init__(name=f"{name}_stripe_{self.stripe}", parallelism=1)
+
+    @staticmethod
+    def stripe_of(key, stripes: int) -> int:
+        """
+        キーからストライプ番号を求める
+
+        hash() はプロセスごとに値が変わる（PYTHONHASHSEED）ため、
+        複数プロセス・複数コンテナで同じ結果になる crc32 を使う。
+        """
+        if isinstance(key, tuple):
+            key = ":".join(str(part) for part in key)
+        return zlib.crc32(str(key).encode()) % stripes
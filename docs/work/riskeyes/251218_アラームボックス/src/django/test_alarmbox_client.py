@@ -0,0 +1,108 @@
+# lib/alarmbox/tests/test_client.py
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from lib.alarmbox.async_client import AsyncAlarmboxClient
+from lib.alarmbox.client import AlarmboxClient
+from lib.alarmbox.exceptions import AlarmboxAPIError
+from lib.alarmbox.testing import FakeAlarmboxServer
+
+# テストではリトライを待たない
+FAST_HTTP_SETTINGS = {"BACKOFF_FACTOR": 0, "BACKOFF_JITTER": 0}
+
+
+@override_settings(ALARMBOX_HTTP=FAST_HTTP_SETTINGS)
+class AlarmboxClientPoolTest(SimpleTestCase):
+    """接続プール・リトライ"""
+
+    def setUp(self):
+        AlarmboxClient.close_session()
+        AlarmboxClient.reset_stats()
+        self.addCleanup(AlarmboxClient.close_session)
+
+    def call(self, server, func):
+        with mock.patch.object(AlarmboxClient, "BASE_URL", server.base_url):
+            return func(AlarmboxClient("test-token"))
+
+    def test_connections_are_reused_across_clients(self):
+        """クライアントを毎回作っても接続は使い回される"""
+        with FakeAlarmboxServer() as server:
+            for _ in range(5):
+                self.call(server, lambda c: c.get_credit_check(1))
+            self.call(server, lambda c: c.purchase_credit_check("1234567890123"))
+
+        stats = AlarmboxClient.get_stats()
+        self.assertEqual(stats["requests"], 6)
+        self.assertEqual(stats["connections"], 1)
+
+    def test_get_is_retried(self):
+        with FakeAlarmboxServer(transient_errors=2) as server:
+            detail = self.call(server, lambda c: c.get_credit_check(1))
+
+        self.assertEqual(detail["credit_check_id"], 1)
+        self.assertEqual(AlarmboxClient.get_stats()["retries"], 2)
+
+    def test_get_gives_up_after_max_retries(self):
+        with FakeAlarmboxServer(transient_errors=10) as server:
+            with self.assertRaises(AlarmboxAPIError) as cm:
+                self.call(server, lambda c: c.get_credit_check(1))
+
+        self.assertEqual(cm.exception.status_code, 503)
+        self.assertEqual(len(server.requests), 4)
+
+    def test_purchase_is_not_retried(self):
+        """購入（POST）は再送しない（二重課金防止）"""
+        with FakeAlarmboxServer(transient_errors=1) as server:
+            with self.assertRaises(AlarmboxAPIError):
+                self.call(server, lambda c: c.purchase_credit_check("1234567890123"))
+
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(server.purchased, [])
+
+    @override_settings(
+        ALARMBOX_HTTP={**FAST_HTTP_SETTINGS, "POOL_SIZE": 1, "POOL_TIMEOUT": 0.1}
+    )
+    def test_waiting_for_pool_times_out(self):
+        """POOL_SIZE を超えた呼び出しは POOL_TIMEOUT で諦める（無限に待たない）"""
+        AlarmboxClient.close_session()
+
+        with FakeAlarmboxServer(delay=0.5) as server:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    executor.submit(self.call, server, lambda c: c.get_credit_check(1))
+                    for _ in range(2)
+                ]
+                errors = [future.exception() for future in futures]
+
+        self.assertEqual(sum(isinstance(e, AlarmboxAPIError) for e in errors), 1)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_close_session_resets_stats(self):
+        """接続数と他の統計は一緒にリセットされる"""
+        with FakeAlarmboxServer() as server:
+            self.call(server, lambda c: c.get_credit_check(1))
+
+        AlarmboxClient.close_session()
+
+        stats = AlarmboxClient.get_stats()
+        self.assertEqual(stats["connections"], 0)
+        self.assertEqual(stats["requests"], 0)
+
+
+@override_settings(ALARMBOX_HTTP=FAST_HTTP_SETTINGS)
+class AsyncAlarmboxClientPoolTest(SimpleTestCase):
+    """asyncio 版の接続プール"""
+
+    async def test_connections_are_reused_across_clients(self):
+        """クライアントを毎回作っても、同じイベントループでは接続が使い回される"""
+        with FakeAlarmboxServer() as server:
+            with mock.patch.object(AlarmboxClient, "BASE_URL", server.base_url):
+                for token in ("token-a", "token-b", "token-c"):
+                    await AsyncAlarmboxClient(token).get_credit_check(1)
+            await AsyncAlarmboxClient.aclose_clients()
+
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(len(server.connections), 1)
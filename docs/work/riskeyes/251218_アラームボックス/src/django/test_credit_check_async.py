@@ -0,0 +1,98 @@
+# customer/tests/test_alarmbox_credit_check_async.py
+
+import time
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from core.models.riskeyes_v2.alarmbox import HanshaAlarmboxCreditCheck
+from lib.alarmbox.client import AlarmboxClient
+from lib.alarmbox.credit_check_service import CreditCheckService
+from lib.alarmbox.testing import FakeAlarmboxServer
+from lib.alarmbox.token_service import TokenService
+
+LOCAL_LOCK_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "lock": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-lock",
+    },
+}
+
+CLIENT_ID = 100
+CORPORATION_NUMBER = "1234567890123"
+
+
+@override_settings(CACHES=LOCAL_LOCK_CACHES, LOCK_CACHE_ALIASES="lock")
+class CreditCheckAsyncPurchaseTest(TestCase):
+    """信用チェック購入（asyncio 版）"""
+
+    async def purchase(self, server, upload_delay=0.0):
+        def save_pdf_to_gcs(client_id, credit_check_id, pdf_base64):
+            time.sleep(upload_delay)
+            return f"gs://test/{client_id}/credit_check_{credit_check_id}.pdf"
+
+        with (
+            mock.patch.object(AlarmboxClient, "BASE_URL", server.base_url),
+            mock.patch.object(
+                TokenService, "get_valid_access_token", return_value="test-token"
+            ),
+            mock.patch.object(
+                CreditCheckService, "_save_pdf_to_gcs", side_effect=save_pdf_to_gcs
+            ),
+            mock.patch.object(CreditCheckService, "_enqueue_completion") as enqueue,
+        ):
+            credit_check = await CreditCheckService.apurchase_and_save(
+                CLIENT_ID, CORPORATION_NUMBER
+            )
+        self.enqueue = enqueue
+        return credit_check
+
+    async def test_saves_detail_infos_and_pdf(self):
+        with FakeAlarmboxServer() as server:
+            credit_check = await self.purchase(server)
+
+        saved = await HanshaAlarmboxCreditCheck.objects.aget(pk=credit_check.pk)
+        self.assertEqual(saved.status, HanshaAlarmboxCreditCheck.Status.SUCCESS)
+        self.assertEqual(saved.company_name, "テスト株式会社1")
+        self.assertIsNotNone(saved.purchased_at)
+        self.assertEqual(saved.pdf_file_path, f"gs://test/{CLIENT_ID}/credit_check_1.pdf")
+        self.assertEqual(await saved.infos.acount(), 1)
+        # 詳細（PDFなし）と PDF付き詳細を両方取得している
+        self.assertCountEqual(
+            [path for method, path in server.requests if method == "GET"],
+            ["/ps/v1/credit_checks/1", "/ps/v1/credit_checks/1?with_pdf=true"],
+        )
+        self.enqueue.assert_not_called()
+
+    async def test_detail_and_pdf_run_concurrently(self):
+        """購入後の時間は遅い方（PDF取得＋GCS保存）で決まり、合計にはならない"""
+        delay = 0.5
+        with FakeAlarmboxServer(delay=delay) as server:
+            start = time.perf_counter()
+            await self.purchase(server, upload_delay=delay)
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual(server.max_active, 2)
+        # 逐次なら 購入 + 詳細 + PDF取得 + GCS保存 = 4 * delay
+        self.assertLess(elapsed, 3.5 * delay)
+
+    async def test_failure_after_purchase_is_left_to_completion_job(self):
+        """詳細・PDF取得に失敗しても例外にせず、補完ジョブに任せる"""
+        with FakeAlarmboxServer() as server:
+            with override_settings(ALARMBOX_HTTP={"MAX_RETRIES": 0}):
+                # 購入の後の GET を2件とも 503 にする
+                original_purchase = server.purchase
+
+                def purchase(corporation_number):
+                    result = original_purchase(corporation_number)
+                    server.transient_errors = 2
+                    return result
+
+                server.purchase = purchase
+                credit_check = await self.purchase(server)
+
+        saved = await HanshaAlarmboxCreditCheck.objects.aget(pk=credit_check.pk)
+        self.assertEqual(saved.status, HanshaAlarmboxCreditCheck.Status.SUCCESS)
+        self.assertIsNone(saved.purchased_at)
+        self.enqueue.assert_called_once()
@@ -0,0 +1,241 @@
+# customer/tests/test_alarmbox_credit_check_batch.py
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from core.models.riskeyes_v2.alarmbox import HanshaAlarmboxCreditCheck
+from lib.alarmbox.client import AlarmboxClient
+from lib.alarmbox.credit_check_service import CreditCheckService, PurchaseOutcome
+from lib.alarmbox.testing import FakeAlarmboxServer
+from lib.alarmbox.token_service import TokenService
+
+LOCAL_LOCK_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "lock": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-lock",
+    },
+}
+
+CLIENT_ID = 100
+
+
+@override_settings(CACHES=LOCAL_LOCK_CACHES, LOCK_CACHE_ALIASES="lock")
+class CreditCheckPurchaseManyTest(TestCase):
+    """信用チェックの一括購入（ローカルの AlarmBox サーバー相手）"""
+
+    def purchase_many(self, corporation_numbers, server, **kwargs):
+        with (
+            mock.patch.object(AlarmboxClient, "BASE_URL", server.base_url),
+            mock.patch.object(
+                TokenService, "get_valid_access_token", return_value="test-token"
+            ),
+            mock.patch.object(CreditCheckService, "_enqueue_completion") as enqueue,
+        ):
+            outcomes = CreditCheckService.purchase_many(
+                CLIENT_ID, corporation_numbers, **kwargs
+            )
+        self.enqueue = enqueue
+        return outcomes
+
+    def test_purchases_all_and_records_success(self):
+        numbers = [f"{1000000000000 + n}" for n in range(20)]
+
+        with FakeAlarmboxServer() as server:
+            outcomes = self.purchase_many(numbers, server)
+
+        self.assertEqual([o.corporation_number for o in outcomes], numbers)
+        self.assertTrue(all(o.status == PurchaseOutcome.PURCHASED for o in outcomes))
+        self.assertEqual(sorted(server.purchased), numbers)
+        self.assertEqual(
+            HanshaAlarmboxCreditCheck.objects.filter(
+                client_id=CLIENT_ID,
+                status=HanshaAlarmboxCreditCheck.Status.SUCCESS,
+                credit_check_id__isnull=False,
+            ).count(),
+            20,
+        )
+        # 補完ジョブは1回だけ登録する
+        self.enqueue.assert_called_once_with()
+
+    def test_skips_existing_and_repeated_numbers(self):
+        HanshaAlarmboxCreditCheck.objects.create(
+            client_id=CLIENT_ID,
+            corporation_number="1000000000001",
+            status=HanshaAlarmboxCreditCheck.Status.SUCCESS,
+            credit_check_id=1,
+        )
+        HanshaAlarmboxCreditCheck.objects.create(
+            client_id=CLIENT_ID,
+            corporation_number="1000000000002",
+            status=HanshaAlarmboxCreditCheck.Status.ERROR,
+        )
+        numbers = ["1000000000001", "1000000000002", "1000000000003", "1000000000003"]
+
+        with FakeAlarmboxServer() as server:
+            outcomes = self.purchase_many(numbers, server)
+
+        self.assertEqual(
+            [o.status for o in outcomes],
+            [
+                PurchaseOutcome.DUPLICATE,
+                # error のレコードは再購入できる
+                PurchaseOutcome.PURCHASED,
+                PurchaseOutcome.PURCHASED,
+                PurchaseOutcome.DUPLICATE,
+            ],
+        )
+        self.assertEqual(sorted(server.purchased), ["1000000000002", "1000000000003"])
+
+    def test_failure_does_not_stop_others(self):
+        numbers = ["1000000000001", "9999999999999", "1000000000002"]
+
+        with FakeAlarmboxServer(fail_numbers={"9999999999999"}) as server:
+            outcomes = self.purchase_many(numbers, server)
+
+        self.assertEqual(
+            [o.status for o in outcomes],
+            [PurchaseOutcome.PURCHASED, PurchaseOutcome.ERROR, PurchaseOutcome.PURCHASED],
+        )
+        self.assertIsNotNone(outcomes[1].error)
+        self.assertEqual(
+            HanshaAlarmboxCreditCheck.objects.get(
+                corporation_number="9999999999999"
+            ).status,
+            HanshaAlarmboxCreditCheck.Status.ERROR,
+        )
+
+    def test_concurrency_is_bounded(self):
+        numbers = [f"{1000000000000 + n}" for n in range(12)]
+
+        with FakeAlarmboxServer(delay=0.05) as server:
+            self.purchase_many(numbers, server, max_workers=3)
+
+        self.assertEqual(len(server.purchased), 12)
+        self.assertLessEqual(server.max_active, 3)
+        self.assertGreater(server.max_active, 1)
+
+    def test_no_api_call_when_everything_is_duplicate(self):
+        HanshaAlarmboxCreditCheck.objects.create(
+            client_id=CLIENT_ID,
+            corporation_number="1000000000001",
+            status=HanshaAlarmboxCreditCheck.Status.PENDING,
+        )
+
+        with FakeAlarmboxServer() as server:
+            outcomes = self.purchase_many(["1000000000001"], server)
+
+        self.assertEqual(outcomes[0].status, PurchaseOutcome.DUPLICATE)
+        self.assertEqual(server.requests, [])
+        self.enqueue.assert_not_called()
+
+    def test_setup_failure_does_not_leave_pending(self):
+        """トークン取得で落ちても pending を残さず、後から買い直せる"""
+        numbers = ["1000000000001", "1000000000002"]
+
+        with FakeAlarmboxServer() as server:
+            with mock.patch.object(
+                TokenService,
+                "get_valid_access_token",
+                side_effect=RuntimeError("token error"),
+            ):
+                with self.assertRaises(RuntimeError):
+                    CreditCheckService.purchase_many(CLIENT_ID, numbers)
+
+            self.assertEqual(server.purchased, [])
+            self.assertFalse(
+                HanshaAlarmboxCreditCheck.objects.filter(
+                    status=HanshaAlarmboxCreditCheck.Status.PENDING
+                ).exists()
+            )
+
+            outcomes = self.purchase_many(numbers, server)
+
+        self.assertEqual(
+            [o.status for o in outcomes],
+            [PurchaseOutcome.PURCHASED, PurchaseOutcome.PURCHASED],
+        )
+
+    def test_save_failure_does_not_abandon_others(self):
+        """1件の保存失敗で残りの記録を止めず、購入済みの credit_check_id も残す"""
+        numbers = [f"{1000000000000 + n}" for n in range(3)]
+        original_save = HanshaAlarmboxCreditCheck.save
+        failed = []
+
+        def save(credit_check, *args, **kwargs):
+            if not failed and credit_check.credit_check_id is not None:
+                failed.append(credit_check.corporation_number)
+                raise RuntimeError("db error")
+            return original_save(credit_check, *args, **kwargs)
+
+        with FakeAlarmboxServer() as server:
+            with mock.patch.object(HanshaAlarmboxCreditCheck, "save", save):
+                outcomes = self.purchase_many(numbers, server)
+
+        # 保存に失敗した1件も後始末で success として記録し直している
+        self.assertTrue(all(o.status == PurchaseOutcome.PURCHASED for o in outcomes))
+        self.assertEqual(
+            HanshaAlarmboxCreditCheck.objects.filter(
+                status=HanshaAlarmboxCreditCheck.Status.SUCCESS,
+                credit_check_id__isnull=False,
+            ).count(),
+            3,
+        )
+
+
+@override_settings(CACHES=LOCAL_LOCK_CACHES, LOCK_CACHE_ALIASES="lock")
+class CreditCheckCompleteTest(TestCase):
+    """購入済みレコードの補完（ローカルの AlarmBox サーバー相手）"""
+
+    def create_credit_check(self, **kwargs):
+        return HanshaAlarmboxCreditCheck.objects.create(
+            client_id=CLIENT_ID,
+            corporation_number="1000000000001",
+            status=HanshaAlarmboxCreditCheck.Status.SUCCESS,
+            credit_check_id=1,
+            **kwargs,
+        )
+
+    def complete(self, credit_check, server):
+        with (
+            mock.patch.object(AlarmboxClient, "BASE_URL", server.base_url),
+            mock.patch.object(
+                TokenService, "get_valid_access_token", return_value="test-token"
+            ),
+        ):
+            return CreditCheckService.complete(credit_check)
+
+    def test_pdf_failure_keeps_fetched_detail(self):
+        """PDF の保存に失敗しても、取得済みの詳細は巻き戻さずに試行回数を記録する"""
+        credit_check = self.create_credit_check()
+
+        with FakeAlarmboxServer() as server:
+            with mock.patch.object(
+                CreditCheckService, "_save_pdf_to_gcs", side_effect=RuntimeError("gcs error")
+            ):
+                with self.assertRaises(RuntimeError):
+                    self.complete(credit_check, server)
+
+        credit_check.refresh_from_db()
+        self.assertIsNotNone(credit_check.detail_fetched_at)
+        self.assertEqual(credit_check.company_name, "テスト株式会社1")
+        self.assertTrue(credit_check.infos.exists())
+        self.assertFalse(credit_check.pdf_file_path)
+        self.assertEqual(credit_check.completion_attempts, 1)
+
+    def test_detail_failure_is_counted_as_incomplete(self):
+        """詳細の保存が巻き戻ったら、インスタンスに残った値で完了扱いにしない"""
+        credit_check = self.create_credit_check(pdf_file_path="alarmbox/1.pdf")
+
+        with FakeAlarmboxServer() as server:
+            with mock.patch.object(
+                CreditCheckService, "_save_infos", side_effect=RuntimeError("db error")
+            ):
+                with self.assertRaises(RuntimeError):
+                    self.complete(credit_check, server)
+
+        credit_check.refresh_from_db()
+        self.assertIsNone(credit_check.detail_fetched_at)
+        self.assertFalse(credit_check.infos.exists())
+        self.assertEqual(credit_check.completion_attempts, 1)
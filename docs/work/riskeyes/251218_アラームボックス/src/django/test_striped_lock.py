@@ -0,0 +1,136 @@
+# core/tests/test_lock.py
+
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from core.lib.lock import StripedLockManager
+
+# 本番の Valkey の代わりにプロセス内の LocMemCache を使う
+# （cache.add がアトミックなので、スレッド間の排他はそのまま検証できる）
+LOCAL_LOCK_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "lock": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-lock",
+    },
+}
+
+LOCK_NAME = "test_credit_check"
+LOCK_OPTIONS = {"timeout": 10, "initial_delay": 0.01, "max_delay": 0.05}
+
+
+def find_keys(stripes, same_stripe):
+    """同じ（または違う）ストライプに入る (client_id, 法人番号) を2つ探す"""
+    base = (1, "1000000000001")
+    base_stripe = StripedLockManager.stripe_of(base, stripes)
+    for n in range(2, 10000):
+        key = (1, f"{1000000000000 + n}")
+        if (StripedLockManager.stripe_of(key, stripes) == base_stripe) == same_stripe:
+            return base, key
+    raise AssertionError("条件に合うキーが見つかりません")
+
+
+def run_threads(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+
+@override_settings(CACHES=LOCAL_LOCK_CACHES, LOCK_CACHE_ALIASES="lock")
+class StripedLockManagerTest(SimpleTestCase):
+    """ストライプ方式のロック"""
+
+    def test_same_key_maps_to_same_stripe(self):
+        """同じキーは常に同じストライプになる"""
+        key = (100, "1234567890123")
+        stripes = {StripedLockManager.stripe_of(key, 64) for _ in range(10)}
+
+        self.assertEqual(len(stripes), 1)
+        self.assertEqual(
+            StripedLockManager(LOCK_NAME, key, stripes=64).stripe, stripes.pop()
+        )
+
+    def test_keys_spread_over_bounded_stripes(self):
+        """多数のキーがストライプ数の範囲に散らばる"""
+        stripes = {
+            StripedLockManager.stripe_of((100, f"{1000000000000 + n}"), 16)
+            for n in range(1000)
+        }
+
+        self.assertEqual(stripes, set(range(16)))
+
+    def test_invalid_stripes(self):
+        with self.assertRaises(ValueError):
+            StripedLockManager(LOCK_NAME, (1, "1"), stripes=0)
+
+    def test_same_key_purchases_once(self):
+        """同じ (client_id, 法人番号) の同時リクエストは1件だけ購入される"""
+        key = (100, "1234567890123")
+        purchased = []
+        active = []
+        max_active = []
+
+        def purchase():
+            with StripedLockManager(LOCK_NAME, key, stripes=8).lock(**LOCK_OPTIONS):
+                active.append(1)
+                max_active.append(len(active))
+                # 既存チェック -> 購入（間に他リクエストが割り込めないこと）
+                if key not in purchased:
+                    time.sleep(0.02)
+                    purchased.append(key)
+                active.pop()
+
+        run_threads([purchase] * 10)
+
+        self.assertEqual(purchased, [key])
+        self.assertEqual(max(max_active), 1)
+
+    def test_distinct_stripes_run_in_parallel(self):
+        """別ストライプのキーは同時にロックを持てる"""
+        key_a, key_b = find_keys(stripes=8, same_stripe=False)
+        # 両方がロック内に同時に入らないと Barrier がタイムアウトする
+        barrier = threading.Barrier(2, timeout=5)
+        errors = []
+
+        def hold(key):
+            with StripedLockManager(LOCK_NAME, key, stripes=8).lock(**LOCK_OPTIONS):
+                try:
+                    barrier.wait()
+                except threading.BrokenBarrierError as e:
+                    errors.append(e)
+
+        run_threads([lambda: hold(key_a), lambda: hold(key_b)])
+
+        self.assertEqual(errors, [])
+
+    def test_colliding_keys_are_serialized(self):
+        """同じストライプに入った別キーは順番に実行される"""
+        key_a, key_b = find_keys(stripes=8, same_stripe=True)
+        active = []
+        max_active = []
+
+        def hold(key):
+            with StripedLockManager(LOCK_NAME, key, stripes=8).lock(**LOCK_OPTIONS):
+                active.append(key)
+                max_active.append(len(active))
+                time.sleep(0.05)
+                active.remove(key)
+
+        run_threads([lambda: hold(key_a), lambda: hold(key_b)])
+
+        self.assertEqual(max(max_active), 1)
+
+    def test_lock_released_after_exception(self):
+        """処理中に例外が出てもストライプは解放される"""
+        key = (100, "1234567890123")
+
+        with self.assertRaises(RuntimeError):
+            with StripedLockManager(LOCK_NAME, key, stripes=8).lock(**LOCK_OPTIONS):
+                raise RuntimeError("購入失敗")
+
+        with StripedLockManager(LOCK_NAME, key, stripes=8).lock(timeout=1):
+            pass
@@ -0,0 +1,152 @@
+import zlib
+from typing import AsyncIterator, Awaitable, Callable, Iterator, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_string
+
+try:
+    import brotli  # type: ignore[import-untyped]
+except ImportError:  # brotli は任意の依存
+    brotli = None
+
+DEFAULT_COMPRESSION_SETTINGS = {
+    # これより小さいレスポンスは圧縮しない（バイト）
+    "MIN_SIZE": 1024,
+    # 圧縮対象のパス（前方一致）
+    "PATH_PREFIXES": ["/api/"],
+    "BROTLI_QUALITY": 4,
+}
+
+_accept_encoding_re = _lazy_re_compile(r"\b(br|gzip)\b")
+
+
+class CompressionMiddleware:
+    """
+    レスポンス圧縮（Accept-Encoding で brotli / gzip を選択）
+
+    brotli パッケージがあれば br を優先し、なければ gzip を使う。
+    MIN_SIZE 未満のレスポンスは圧縮のコストに見合わないため、そのまま返す。
+    ストリーミングレスポンス（同期・非同期とも）はチャンクごとに逐次圧縮する。
+    設定は settings.RESPONSE_COMPRESSION（DEFAULT_COMPRESSION_SETTINGS を上書き）。
+
+    ASGI では非同期のまま処理する（同期専用だとミドルウェアチェーン全体が
+    同期に切り替わり、非同期ビューの効果がなくなる）。
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse | Awaitable[HttpResponse]],
+    ):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.config = {
+            **DEFAULT_COMPRESSION_SETTINGS,
+            **getattr(settings, "RESPONSE_COMPRESSION", {}),
+        }
+
+    def _choose_encoding(self, request: HttpRequest) -> str | None:
+        accepted = set(_accept_encoding_re.findall(request.headers.get("Accept-Encoding", "")))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.async_mode:
+            return self.__acall__(request)
+        response = cast(HttpResponse, self.get_response(request))
+        return self._compress(request, response)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response = await cast(Awaitable[HttpResponse], self.get_response(request))
+        return self._compress(request, response)
+
+    def _compress(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        if not request.path.startswith(tuple(self.config["PATH_PREFIXES"])):
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = self._choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            # ストリーミングは長さが分からないため、チャンクごとに圧縮して流す
+            if response.is_async:
+                response.streaming_content = self._compress_async_stream(
+                    response.streaming_content, encoding
+                )
+            else:
+                response.streaming_content = self._compress_stream(
+                    response.streaming_content, encoding
+                )
+            del response.headers["Content-Length"]
+        else:
+            if len(response.content) < self.config["MIN_SIZE"]:
+                return response
+            if encoding == "br":
+                compressed = brotli.compress(
+                    response.content, quality=self.config["BROTLI_QUALITY"]
+                )
+            else:
+                compressed = compress_string(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(response.content))
+
+        # 圧縮後はバイト列が変わるため、強い ETag を弱い ETag にする
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _stream_compressor(
+        self, encoding: str
+    ) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+        """
+        (チャンクを圧縮してここまでの出力を返す関数, 末尾を返す関数) を作る
+
+        チャンクごとにフラッシュし、クライアントが受け取った分から展開できるようにする
+        （django.utils.text.compress_sequence と同じ）。
+        """
+        if encoding == "br":
+            br = brotli.Compressor(quality=self.config["BROTLI_QUALITY"])
+            return (lambda chunk: br.process(chunk) + br.flush()), br.finish
+
+        # wbits に 16 を足すと gzip 形式（ヘッダー・トレーラー付き）で出力する
+        gz = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        return (lambda chunk: gz.compress(chunk) + gz.flush(zlib.Z_SYNC_FLUSH)), gz.flush
+
+    def _compress_stream(self, content: Iterator[bytes], encoding: str) -> Iterator[bytes]:
+        compress, finish = self._stream_compressor(encoding)
+        for chunk in content:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+
+    async def _compress_async_stream(
+        self, content: AsyncIterator[bytes], encoding: str
+    ) -> AsyncIterator[bytes]:
+        compress, finish = self._stream_compressor(encoding)
+        async for chunk in content:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
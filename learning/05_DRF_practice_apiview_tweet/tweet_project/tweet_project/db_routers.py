@@ -0,0 +1,214 @@
+import hashlib
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+PRIMARY = "default"
+
+# True の間は読み取りもプライマリへ送る
+_pin_primary: ContextVar[bool] = ContextVar("pin_primary", default=False)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """このブロック内の読み取りをプライマリに固定する"""
+    token = _pin_primary.set(True)
+    try:
+        yield
+    finally:
+        _pin_primary.reset(token)
+
+
+class ReplicaSelector:
+    """
+    レプリカの選択（settings.DATABASE_REPLICA_SELECTION）
+
+    - "round_robin": 順番に選ぶ
+    - "least_latency": SELECT 1 の応答時間（指数移動平均）が最も小さいものを選ぶ
+      応答時間は PROBE_INTERVAL 秒ごとに測り直す
+    """
+
+    PROBE_INTERVAL = 10.0
+    EWMA_ALPHA = 0.3
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cycles: dict[tuple[str, ...], Iterator[str]] = {}
+        self._latency: dict[str, float] = {}
+        self._probed_at = 0.0
+
+    def choose(self, replicas: list[str]) -> str:
+        if getattr(settings, "DATABASE_REPLICA_SELECTION", "round_robin") == "least_latency":
+            return self._least_latency(replicas)
+        return self._round_robin(replicas)
+
+    def _round_robin(self, replicas: list[str]) -> str:
+        key = tuple(replicas)
+        with self._lock:
+            if key not in self._cycles:
+                self._cycles[key] = itertools.cycle(replicas)
+            return next(self._cycles[key])
+
+    def _least_latency(self, replicas: list[str]) -> str:
+        now = time.monotonic()
+        with self._lock:
+            should_probe = now - self._probed_at >= self.PROBE_INTERVAL
+            if should_probe:
+                self._probed_at = now
+        if should_probe:
+            for alias in replicas:
+                self.record(alias, self._probe(alias))
+        with self._lock:
+            return min(replicas, key=lambda alias: self._latency.get(alias, 0.0))
+
+    @staticmethod
+    def _probe(alias: str) -> float:
+        started = time.perf_counter()
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            return float("inf")
+        return time.perf_counter() - started
+
+    def record(self, alias: str, latency: float) -> None:
+        with self._lock:
+            previous = self._latency.get(alias)
+            if previous is None or previous == float("inf") or latency == float("inf"):
+                self._latency[alias] = latency
+            else:
+                self._latency[alias] = (
+                    self.EWMA_ALPHA * latency + (1 - self.EWMA_ALPHA) * previous
+                )
+
+
+class PrimaryReplicaRouter:
+    """
+    書き込みはプライマリ、読み取りはレプリカへ振り分けるルーター
+
+    - 対象は settings.REPLICA_READ_APPS のアプリのモデル
+    - settings.DATABASE_REPLICAS が空なら常にプライマリ
+    - 書き込み直後のユーザー（ReplicaStickinessMiddleware が判定）はプライマリに固定する
+    """
+
+    selector = ReplicaSelector()
+
+    def db_for_read(self, model, **hints) -> str | None:
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        if not replicas or _pin_primary.get():
+            return PRIMARY
+        if model._meta.app_label not in getattr(settings, "REPLICA_READ_APPS", []):
+            return PRIMARY
+        return self.selector.choose(replicas)
+
+    def db_for_write(self, model, **hints) -> str:
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # プライマリとレプリカは同じデータなので、DB をまたぐ関連も許可する
+        return True
+
+    def allow_migrate(self, db: str, app_label, model_name=None, **hints) -> bool:
+        # レプリカはプライマリの複製なので、マイグレーションはプライマリだけに適用する
+        return db == PRIMARY
+
+
+class ReplicaStickinessMiddleware:
+    """
+    read-your-writes のためのミドルウェア
+
+    書き込みリクエスト（GET/HEAD/OPTIONS 以外）はリクエスト全体をプライマリに固定し、
+    成功したら同じクライアントの以降のリクエストも REPLICA_STICKY_SECONDS 秒間固定する。
+    クライアントは Authorization ヘッダー・セッション Cookie で識別し、どちらもない匿名の
+    リクエストは固定しない（IP アドレスで識別すると、同じ NAT・プロキシの裏の全員が固定される）。
+
+    固定状態は settings.REPLICA_STICKY_CACHE_ALIAS のキャッシュに保存する。
+    別のワーカーにも見えるよう、プロセス間で共有されるキャッシュを指定すること。
+    キャッシュへの問い合わせはリクエストの最初の1回だけで、リクエスト中の読み取りは
+    ルーターが ContextVar（use_primary）で判定する。
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse | Awaitable[HttpResponse]],
+    ):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _get_cache() -> BaseCache:
+        return caches[getattr(settings, "REPLICA_STICKY_CACHE_ALIAS", "default")]
+
+    @staticmethod
+    def _client_key(request: HttpRequest) -> str | None:
+        """固定状態のキャッシュキー（匿名のリクエストは None）"""
+        identity = request.headers.get("Authorization") or request.COOKIES.get(
+            settings.SESSION_COOKIE_NAME
+        )
+        if not identity:
+            return None
+        digest = hashlib.sha256(identity.encode()).hexdigest()
+        return f"db:pin_primary:{digest}"
+
+    @staticmethod
+    def _sticky_seconds() -> int:
+        return getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.async_mode:
+            return self.__acall__(request)
+        get_response = cast(Callable[[HttpRequest], HttpResponse], self.get_response)
+        if not getattr(settings, "DATABASE_REPLICAS", []):
+            return get_response(request)
+
+        cache = self._get_cache()
+        key = self._client_key(request)
+        is_write = request.method not in self.SAFE_METHODS
+
+        if is_write or (key is not None and cache.get(key)):
+            with use_primary():
+                response = get_response(request)
+        else:
+            response = get_response(request)
+
+        if is_write and key is not None and response.status_code < 400:
+            cache.set(key, True, timeout=self._sticky_seconds())
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        get_response = cast(
+            Callable[[HttpRequest], Awaitable[HttpResponse]], self.get_response
+        )
+        if not getattr(settings, "DATABASE_REPLICAS", []):
+            return await get_response(request)
+
+        cache = self._get_cache()
+        key = self._client_key(request)
+        is_write = request.method not in self.SAFE_METHODS
+
+        # ContextVar は sync_to_async のスレッドにも引き継がれるため、同期の ORM も固定される
+        if is_write or (key is not None and await cache.aget(key)):
+            with use_primary():
+                response = await get_response(request)
+        else:
+            response = await get_response(request)
+
+        if is_write and key is not None and response.status_code < 400:
+            await cache.aset(key, True, timeout=self._sticky_seconds())
+        return response
@@ -0,0 +1,146 @@
+import atexit
+import contextlib
+import copy
+import json
+import logging
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+# LogRecord の標準属性（これ以外は extra として JSON に含める）
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+
+class JSONFormatter(logging.Formatter):
+    """1レコード1行の JSON を出力する Formatter"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        elif record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    ロガーごとにログを間引く Filter
+
+    rates はロガー名（前方一致）→ 残す割合（0.0〜1.0）。
+    level 以上（デフォルト WARNING）のログは間引かない。
+    """
+
+    def __init__(self, rates: dict[str, float] | None = None, level: str = "WARNING"):
+        super().__init__()
+        # 長い名前から順に照合する
+        self.rates = sorted((rates or {}).items(), key=lambda item: -len(item[0]))
+        self.level = logging.getLevelName(level)
+
+    def _rate(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.level:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class _QueueListener(QueueListener):
+    """キューが満杯でも stop() で止められる QueueListener"""
+
+    # 停止の目印を入れる空きを待つ上限（秒）
+    stop_timeout = 1.0
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler) -> None:
+        super().__init__(log_queue, *handlers)
+        self.log_queue = log_queue
+
+    def enqueue_sentinel(self) -> None:
+        # 標準の put_nowait だとキューが満杯のとき停止できないため、空きを待って入れる。
+        # リスナースレッドが止まっていると空きができないので、待つのは stop_timeout 秒までとし、
+        # 超えたら最も古いレコードを捨てて目印（None）を入れる
+        while True:
+            try:
+                self.log_queue.put(None, timeout=self.stop_timeout)
+                return
+            except queue.Full:
+                with contextlib.suppress(queue.Empty):
+                    self.log_queue.get_nowait()
+
+
+class QueuedStreamHandler(QueueHandler):
+    """
+    キュー経由で別スレッドから出力する StreamHandler
+
+    リクエストスレッドではメッセージの組み立てとキュー投入だけを行い、
+    JSON 整形と書き込みは QueueListener のスレッドで行う。
+    SamplingFilter はこのハンドラーに付ける（Handler.handle() がフィルターを通してから
+    emit() → prepare() を呼ぶため、間引かれるログはメッセージを組み立てない）。
+    キューが満杯の場合は待たずに破棄し、dropped に件数を数える。
+    """
+
+    def __init__(self, stream=None, queue_size: int = 10000):
+        log_queue: queue.Queue = queue.Queue(queue_size)
+        super().__init__(log_queue)
+        self.target = logging.StreamHandler(stream)
+        self.listener = _QueueListener(log_queue, self.target)
+        self.listener.start()
+        self._stopped = False
+        atexit.register(self._stop_listener)
+
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def setFormatter(self, fmt: logging.Formatter | None) -> None:
+        # 整形はリスナー側で行う
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # args はリクエスト側のオブジェクトを参照しているため、メッセージへの埋め込みだけは
+        # この場で行う（整形・JSON 化はリスナースレッドに任せる）
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def _stop_listener(self) -> None:
+        # atexit と close() の両方から呼ばれるため、停止は1回だけ行う
+        if not self._stopped:
+            self._stopped = True
+            self.listener.stop()
+
+    def close(self) -> None:
+        self._stop_listener()
+        super().close()
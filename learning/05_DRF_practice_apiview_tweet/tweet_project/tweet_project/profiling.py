@@ -0,0 +1,211 @@
+import cProfile
+import heapq
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+DEFAULT_PROFILING_SETTINGS = {
+    "ENABLED": False,
+    # cProfile を取るリクエストの割合（0.0〜1.0）
+    "SAMPLE_RATE": 0.1,
+    # 遅い順に何件のダンプを残すか
+    "SLOWEST_N": 10,
+    "DUMP_DIR": "profiles",
+}
+
+
+class RequestProfile:
+    """1リクエスト分の計測値"""
+
+    def __init__(self) -> None:
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.sections: dict[str, float] = {}
+
+    def add_section(self, name: str, seconds: float) -> None:
+        self.sections[name] = self.sections.get(name, 0.0) + seconds
+
+
+_current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "request_profile", default=None
+)
+
+
+@contextmanager
+def profile_section(name: str) -> Iterator[None]:
+    """
+    区間の処理時間を Server-Timing に載せる（シリアライズ時間など）
+
+    ミドルウェアが無効な場合は何もしない。
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_section(name, time.perf_counter() - started)
+
+
+def _profile_sql(execute, sql, params, many, context):
+    """実行中のリクエストの RequestProfile に SQL の件数と時間を加算する実行ラッパー"""
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.sql_count += 1
+        profile.sql_time += time.perf_counter() - started
+
+
+def install_sql_profiling() -> None:
+    """現在のスレッドのすべての DB 接続に _profile_sql を1度だけ付ける（外さない）"""
+    for connection in connections.all():
+        if _profile_sql not in connection.execute_wrappers:
+            connection.execute_wrappers.append(_profile_sql)
+
+
+class RequestProfilingMiddleware:
+    """
+    リクエストのプロファイリング（settings.REQUEST_PROFILING で有効化）
+
+    - 処理時間・SQL 件数と時間・各区間の時間・レスポンスサイズを Server-Timing ヘッダーで返す
+    - サンプリングしたリクエストを cProfile で計測し、遅い上位 N 件のダンプを保存する
+
+    無効時は MiddlewareNotUsed を送出し、ミドルウェアチェーンから外れる。
+    ASGI では非同期のまま処理する（cProfile はイベントループ上の他のリクエストの処理が
+    混ざるため取らず、Server-Timing だけを返す）。
+
+    SQL の計測は接続ごとに1つだけ付けた実行ラッパー（_profile_sql）が行い、
+    計測先はリクエストごとの ContextVar から決める。非同期ビューの ORM は
+    sync_to_async の共有スレッド・共有接続で動くため、並行するリクエストの
+    ラッパーを接続に積み重ねると、付け外しの順序が入れ替わって計測先を取り違える。
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse | Awaitable[HttpResponse]],
+    ):
+        config = {
+            **DEFAULT_PROFILING_SETTINGS,
+            **getattr(settings, "REQUEST_PROFILING", {}),
+        }
+        if not config["ENABLED"]:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.sample_rate = config["SAMPLE_RATE"]
+        self.slowest_n = config["SLOWEST_N"]
+        self.dump_dir = Path(config["DUMP_DIR"])
+
+        # (経過時間, ダンプファイル) の最小ヒープ
+        self._slowest: list[tuple[float, str]] = []
+        self._slowest_lock = threading.Lock()
+        # cProfile はプロセス内で同時に1つしか有効にできないため
+        self._cprofile_lock = threading.Lock()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.async_mode:
+            return self.__acall__(request)
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        profiler = None
+        if random.random() < self.sample_rate and self._cprofile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+
+        started = time.perf_counter()
+        try:
+            install_sql_profiling()
+            if profiler is not None:
+                profiler.enable()
+            try:
+                response = cast(HttpResponse, self.get_response(request))
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        finally:
+            _current_profile.reset(token)
+            if profiler is not None:
+                self._cprofile_lock.release()
+        elapsed = time.perf_counter() - started
+
+        response["Server-Timing"] = self._server_timing(profile, elapsed, response)
+        if profiler is not None:
+            self._keep_if_slow(profiler, request, elapsed)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        started = time.perf_counter()
+        try:
+            # 非同期ビューの ORM も同期ビューも sync_to_async（thread_sensitive）のスレッドで
+            # 動くため、そのスレッドの接続に計測用のラッパーを付ける（付け済みなら何もしない）
+            await sync_to_async(install_sql_profiling)()
+            response = await cast(
+                Awaitable[HttpResponse], self.get_response(request)
+            )
+        finally:
+            _current_profile.reset(token)
+        elapsed = time.perf_counter() - started
+
+        response["Server-Timing"] = self._server_timing(profile, elapsed, response)
+        return response
+
+    @staticmethod
+    def _server_timing(
+        profile: RequestProfile, elapsed: float, response: HttpResponse
+    ) -> str:
+        metrics = [
+            f"total;dur={elapsed * 1000:.2f}",
+            f'db;dur={profile.sql_time * 1000:.2f};desc="{profile.sql_count} queries"',
+        ]
+        metrics += [
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in profile.sections.items()
+        ]
+        if not response.streaming:
+            metrics.append(f'size;desc="{len(response.content)} bytes"')
+        return ", ".join(metrics)
+
+    def _keep_if_slow(
+        self, profiler: cProfile.Profile, request: HttpRequest, elapsed: float
+    ) -> None:
+        with self._slowest_lock:
+            if len(self._slowest) >= self.slowest_n and elapsed <= self._slowest[0][0]:
+                return
+
+            self.dump_dir.mkdir(parents=True, exist_ok=True)
+            path_slug = re.sub(r"[^A-Za-z0-9]+", "_", request.path).strip("_") or "root"
+            dump_path = self.dump_dir / (
+                f"{elapsed * 1000:010.2f}ms_{request.method}_{path_slug}_{time.time_ns()}.prof"
+            )
+            profiler.dump_stats(dump_path)
+
+            heapq.heappush(self._slowest, (elapsed, str(dump_path)))
+            if len(self._slowest) > self.slowest_n:
+                _, evicted = heapq.heappop(self._slowest)
+                Path(evicted).unlink(missing_ok=True)
@@ -0,0 +1,35 @@
+from types import ModuleType
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+orjson: ModuleType | None
+try:
+    import orjson
+except ImportError:  # orjson は任意の依存
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    コンパクトな JSON レンダラー
+
+    非ASCII 文字（日本語）を \\uXXXX にエスケープせず、空白なしで出力する。
+    orjson がインストールされていれば orjson で高速にシリアライズし、
+    なければ DRF の JSONRenderer（UNICODE_JSON / COMPACT_JSON）にフォールバックする。
+    ブラウザブル API からの indent 指定がある場合も標準の JSONRenderer を使う。
+    """
+
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson が扱えない型（遅延翻訳文字列・Decimal など）は DRF のエンコーダに任せる。
+        # 標準の json と同じく、str 以外の dict キー（ListSerializer のエラーの index など）は
+        # 文字列にする
+        return orjson.dumps(
+            data, default=self._encoder.default, option=orjson.OPT_NON_STR_KEYS
+        )
@@ -45,8 +45,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tweet_project.profiling.RequestProfilingMiddleware",
+    "tweet_project.db_routers.ReplicaStickinessMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    # レスポンス本文を書き換えるため、本文を読み書きするミドルウェアより前に置く
+    # （Django のドキュメントにある GZipMiddleware と同じく SessionMiddleware の後）
+    "tweet_project.compression.CompressionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -76,15 +81,77 @@ WSGI_APPLICATION = "tweet_project.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
+# 新しい環境では migrate のあとに python manage.py createcachetable を実行する
+# （CACHES["shared"] の DatabaseCache がこの DB のテーブルを使う。テストでは自動で作られる）
 
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # リクエストごとに接続し直さず、接続を使い回す（使い回す前に死活確認する）
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # ロック待ちの上限（秒）。すぐに "database is locked" にしない
+            "timeout": 20,
+            # 書き込みトランザクションは最初から書き込みロックを取り、
+            # 読み取り → 書き込みへの昇格時のロック競合を避ける
+            "transaction_mode": "IMMEDIATE",
+            # WAL: 読み取りと書き込みが互いをブロックしない
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA mmap_size=134217728;"
+                "PRAGMA cache_size=-20000;"
+                "PRAGMA temp_store=MEMORY;"
+            ),
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tweet_project",
+    },
+    # Redis を使う場合
+    # "default": {
+    #     "BACKEND": "django.core.cache.backends.redis.RedisCache",
+    #     "LOCATION": "redis://127.0.0.1:6379",
+    # },
+    # ワーカープロセス間で共有するキャッシュ（LocMemCache はプロセスごとに別物）
+    # プライマリ DB のテーブルに保存する。事前に python manage.py createcachetable を実行する。
+    # Redis がある場合はそちらに置き換える。
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+    },
+}
+
+# 読み取りレプリカ（tweet_project.db_routers）
+# DATABASE_REPLICAS が空の間はすべてプライマリ（default）で処理する。
+# ローカルで試す場合は db.sqlite3 をコピーしたファイルをレプリカとして登録する
+# （テスト中はレプリカを別 DB として作らず、TEST.MIRROR でプライマリを参照させる）:
+#   DATABASES["replica1"] = {
+#       "ENGINE": "django.db.backends.sqlite3",
+#       "NAME": BASE_DIR / "replica1.sqlite3",
+#       "TEST": {"MIRROR": "default"},
+#   }
+#   DATABASE_REPLICAS = ["replica1"]
+DATABASE_ROUTERS = ["tweet_project.db_routers.PrimaryReplicaRouter"]
+DATABASE_REPLICAS: list[str] = []
+DATABASE_REPLICA_SELECTION = "round_robin"  # または "least_latency"
+REPLICA_READ_APPS = ["tweets", "user"]
+# 書き込み後、同じクライアントの読み取りをプライマリに固定する秒数
+REPLICA_STICKY_SECONDS = 5
+# 固定状態を保存するキャッシュ。どのワーカーにも見えるよう共有キャッシュを指定する
+REPLICA_STICKY_CACHE_ALIAS = "shared"
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -104,6 +171,25 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# パスワードハッシュは上限付きワーカープールで計算する（user.hashers）
+# 検証に使うハッシャーはアルゴリズム名で引かれ、同名が複数あると後の方が使われるため、
+# 同じ pbkdf2_sha256 の PBKDF2PasswordHasher は並べない（ログイン時の検証がプールを通らなくなる）
+PASSWORD_HASHERS = [
+    "user.hashers.PooledPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+PASSWORD_HASH_EXECUTOR = {
+    "KIND": "thread",
+    "MAX_WORKERS": 4,
+    "MAX_QUEUE": 16,
+    "RETRY_AFTER": 1,
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -125,22 +211,93 @@ STATIC_URL = "static/"
 
 AUTH_USER_MODEL = "user.CustomUser"
 
+# aauthenticate() のパスワード計算を HashingExecutor で待つ（同期の authenticate() は ModelBackend と同じ）
+AUTHENTICATION_BACKENDS = ["user.backends.PooledModelBackend"]
+
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "tweet_project.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "user.authentication.CachedTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
     "DEFAULT_PERMISSION_CLASESS": [
         "rest_framework.permissions.IsAuthenticationOrReadOnly",
-    ]
+    ],
+}
+
+# Token 認証キャッシュ（user.authentication.CachedTokenAuthentication）
+# 1段目はプロセス内の LRU、2段目は TOKEN_AUTH_CACHE_ALIAS の共有キャッシュ。
+# トークンの失効は別プロセスの1段目には届かないため、LOCAL_TTL 秒以内に反映される。
+# None にすると共有キャッシュを使わない（失効が他プロセスに届くのは LOCAL_TTL 後）。
+TOKEN_AUTH_CACHE_TTL = 60
+TOKEN_AUTH_CACHE_LOCAL_TTL = 5
+TOKEN_AUTH_CACHE_MAX_SIZE = 10000
+TOKEN_AUTH_CACHE_ALIAS = "shared"
+
+# ツイート一覧・詳細キャッシュ（tweets.cache.TweetCache）
+TWEET_CACHE_ALIAS = "default"
+TWEET_CACHE_TIMEOUT = 300
+
+# ツイート一括作成（tweets.views.TweetBulkCreateView）
+TWEET_BULK_CREATE_BATCH_SIZE = 500
+TWEET_BULK_CREATE_MAX_ITEMS = 1000
+
+# ツイート全文検索バックエンド（tweets.search）
+# SQLite 以外の DB では "tweets.search.ORMSearchBackend" などに切り替える
+TWEET_SEARCH_BACKEND = "tweets.search.SQLiteFTS5SearchBackend"
+
+# レスポンス圧縮（tweet_project.compression.CompressionMiddleware）
+# brotli パッケージがあれば br、なければ gzip で圧縮する
+# （JSON の orjson と同じく任意の依存。requirements.txt を参照）
+RESPONSE_COMPRESSION = {
+    "MIN_SIZE": 1024,
+    "PATH_PREFIXES": ["/api/v1/tweets/"],
+    "BROTLI_QUALITY": 4,
 }
 
+# リクエストプロファイリング（tweet_project.profiling.RequestProfilingMiddleware）
+# ENABLED=False の間はミドルウェア自体が読み込まれない
+REQUEST_PROFILING = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 0.1,
+    "SLOWEST_N": 10,
+    "DUMP_DIR": BASE_DIR / "profiles",
+}
+
+# ログはキュー経由で別スレッドから JSON で出力する（tweet_project.log）
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": "tweet_project.log.JSONFormatter",
+        },
+    },
+    "filters": {
+        "sampling": {
+            "()": "tweet_project.log.SamplingFilter",
+            # ロガー名（前方一致）→ 残す割合。WARNING 以上は常に残す
+            # ツイートの INFO/DEBUG はリクエストごとに出るため 1 割だけ残す。
+            # 登録・ログイン（user.*）は監査に使うので間引かない（未指定は 1.0）
+            "rates": {
+                "tweets": 0.1,
+            },
+        },
+    },
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
+            "class": "tweet_project.log.QueuedStreamHandler",
+            "formatter": "json",
+            # ロガーではなくハンドラーに付け、prepare()（メッセージの組み立て）より前に間引く
+            "filters": ["sampling"],
         },
     },
     "root": {
         "handlers": ["console"],
-        "level": "DEBUG",
+        "level": "INFO",
     },
 }
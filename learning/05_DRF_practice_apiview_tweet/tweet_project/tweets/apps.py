@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class TweetsConfig(AppConfig):
     name = 'tweets'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,363 @@
+"""
+ツイート API のベンチマーク（manage.py seed_bench_data / bench_api から使う）
+
+- seed: ユーザー・ツイートを bulk_create でまとめて投入する
+- run_scenario: 複数スレッドからエンドポイントを叩き、スループット・レイテンシ・クエリ数を計測する
+  （mixed は読み取りと書き込みを同時に流し、DB 設定の違いを比較するのに使う）
+  （*_async は非同期ビューに同じリクエストを送り、WSGI / ASGI の比較に使う）
+- compare: 前回結果（JSON）と比較し、しきい値を超えて悪化した項目を返す
+"""
+
+import itertools
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from rest_framework.authtoken.models import Token
+
+from .cache import TweetCache
+from .models import Tweet
+from .search import get_search_backend
+
+User = get_user_model()
+
+BENCH_USER_PREFIX = "bench_"
+BENCH_PASSWORD = "bench-password-123"
+# *_async は同じリクエストを非同期ビュー（/async/ 配下、ASGI ネイティブ）に送る
+ASYNC_SCENARIOS = {
+    "list_async": "list",
+    "detail_async": "detail",
+    "login_async": "login",
+    "register_async": "register",
+}
+SCENARIOS = ("list", "detail", "login", "register", "mixed", *ASYNC_SCENARIOS)
+
+
+# ---- データ投入 ----
+
+
+def seed(users: int, tweets: int, batch_size: int = 1000) -> None:
+    """ベンチマーク用のユーザーとツイートを投入する（既存の bench_ ユーザーは削除）"""
+    # パスワードハッシュは1回だけ計算して使い回す
+    password = make_password(BENCH_PASSWORD)
+
+    with transaction.atomic():
+        User.objects.filter(username__startswith=BENCH_USER_PREFIX).delete()
+        created_users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{BENCH_USER_PREFIX}{i}",
+                    email=f"{BENCH_USER_PREFIX}{i}@example.com",
+                    password=password,
+                )
+                for i in range(users)
+            ],
+            batch_size=batch_size,
+        )
+
+        author_ids = [user.pk for user in created_users]
+        search_backend = get_search_backend()
+        for start in range(0, tweets, batch_size):
+            batch = Tweet.objects.bulk_create(
+                [
+                    Tweet(author_id=random.choice(author_ids), content=f"benchmark tweet {i}")
+                    for i in range(start, min(start + batch_size, tweets))
+                ]
+            )
+            search_backend.index_many(batch)
+
+        # bulk_create はシグナルを送らないため、ツイート数を直接設定する
+        counts = (
+            Tweet.objects.filter(author_id__in=author_ids)
+            .values("author")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in counts:
+            User.objects.filter(pk=row["author"]).update(tweet_count=row["count"])
+
+        transaction.on_commit(TweetCache.bump_list_version)
+
+
+# ---- 負荷生成 ----
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: float | None
+
+
+class _Transport:
+    """インプロセス（django.test.Client）または HTTP でリクエストを送る"""
+
+    def __init__(self, base_url: str | None):
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self._local = threading.local()
+
+    def _client(self) -> Client:
+        if not hasattr(self._local, "client"):
+            self._local.client = Client(SERVER_NAME="localhost")
+        return self._local.client
+
+    def request(
+        self, method: str, path: str, body: Any = None, token: str | None = None
+    ) -> tuple[int, int | None]:
+        """(ステータスコード, SQL 件数) を返す（HTTP の場合は Server-Timing から取得）"""
+        headers = {"Authorization": f"Token {token}"} if token else {}
+        if self.base_url is None:
+            return self._request_in_process(method, path, body, headers)
+        return self._request_http(self.base_url, method, path, body, headers)
+
+    def _request_in_process(
+        self, method: str, path: str, body: Any, headers: dict[str, str]
+    ) -> tuple[int, int | None]:
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        client = self._client()
+        with connection.execute_wrapper(count):
+            if method == "GET":
+                response = client.get(path, headers=headers)
+            else:
+                response = client.post(
+                    path, body, content_type="application/json", headers=headers
+                )
+        return response.status_code, queries
+
+    def _request_http(
+        self, base_url: str, method: str, path: str, body: Any, headers: dict[str, str]
+    ) -> tuple[int, int | None]:
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json", **headers},
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status, response_headers = response.status, response.headers
+        except urllib.error.HTTPError as e:
+            status, response_headers = e.code, e.headers
+        return status, _queries_from_server_timing(
+            response_headers.get("Server-Timing", "")
+        )
+
+
+def _queries_from_server_timing(header: str) -> int | None:
+    # RequestProfilingMiddleware の db;dur=..;desc="N queries"
+    for metric in header.split(","):
+        if metric.strip().startswith("db;") and 'desc="' in metric:
+            return int(metric.split('desc="', 1)[1].split(" ", 1)[0])
+    return None
+
+
+def _build_request(
+    scenario: str,
+    tweet_ids: list[int],
+    users: int,
+    tokens: list[str],
+    counter: Iterator[int],
+) -> tuple[str, str, Any, str | None]:
+    """(メソッド, パス, ボディ, トークン) を返す"""
+    if scenario in ASYNC_SCENARIOS:
+        method, path, body, token = _build_request(
+            ASYNC_SCENARIOS[scenario], tweet_ids, users, tokens, counter
+        )
+        return method, _async_path(path), body, token
+    if scenario == "list":
+        return "GET", "/api/v1/tweets/", None, None
+    if scenario == "detail":
+        return "GET", f"/api/v1/tweets/{random.choice(tweet_ids)}/", None, None
+    if scenario == "login":
+        username = f"{BENCH_USER_PREFIX}{random.randrange(users)}"
+        return (
+            "POST",
+            "/api/v1/user/login/",
+            {"username": username, "password": BENCH_PASSWORD},
+            None,
+        )
+    if scenario == "register":
+        n = next(counter)
+        username = f"{BENCH_USER_PREFIX}r{time.time_ns()}_{n}"
+        return (
+            "POST",
+            "/api/v1/user/register/",
+            {
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": BENCH_PASSWORD,
+            },
+            None,
+        )
+    if scenario == "mixed":
+        # 読み取りと書き込みを半々で同時に流す（DB のロック競合を見る）
+        if next(counter) % 2:
+            return "GET", f"/api/v1/tweets/{random.choice(tweet_ids)}/", None, None
+        return (
+            "POST",
+            "/api/v1/tweets/bulk/",
+            [{"content": "benchmark write"}],
+            random.choice(tokens),
+        )
+    raise ValueError(f"unknown scenario: {scenario}")
+
+
+def _async_path(path: str) -> str:
+    """/api/v1/<app>/... を非同期ビューの /api/v1/<app>/async/... に置き換える"""
+    parts = path.split("/")
+    parts.insert(4, "async")
+    return "/".join(parts)
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percent) - 1]
+
+
+def run_scenario(
+    scenario: str,
+    requests: int,
+    concurrency: int,
+    base_url: str | None = None,
+) -> ScenarioResult:
+    transport = _Transport(base_url)
+    tweet_ids = list(
+        Tweet.objects.filter(author__username__startswith=BENCH_USER_PREFIX)
+        .values_list("id", flat=True)[:10000]
+    )
+    users = User.objects.filter(username__regex=rf"^{BENCH_USER_PREFIX}\d+$").count()
+    base_scenario = ASYNC_SCENARIOS.get(scenario, scenario)
+    if (base_scenario in ("detail", "mixed") and not tweet_ids) or (
+        base_scenario == "login" and not users
+    ):
+        raise ValueError("先に seed_bench_data でデータを投入してください")
+
+    tokens: list[str] = []
+    if scenario == "mixed":
+        writers = User.objects.filter(username__regex=rf"^{BENCH_USER_PREFIX}\d+$")[:10]
+        tokens = [Token.objects.get_or_create(user=user)[0].key for user in writers]
+
+    counter = itertools.count()
+    latencies: list[float] = []
+    query_counts: list[int] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(_: int) -> None:
+        nonlocal errors
+        method, path, body, token = _build_request(
+            scenario, tweet_ids, users, tokens, counter
+        )
+        started = time.perf_counter()
+        status, queries = transport.request(method, path, body, token)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if queries is not None:
+                query_counts.append(queries)
+            if status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(requests)))
+    duration = time.perf_counter() - started
+
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        throughput_rps=requests / duration if duration else 0.0,
+        p50_ms=_percentile(latencies, 50),
+        p95_ms=_percentile(latencies, 95),
+        p99_ms=_percentile(latencies, 99),
+        queries_per_request=statistics.mean(query_counts) if query_counts else None,
+    )
+
+
+def run(
+    scenarios: list[str],
+    requests: int,
+    concurrency: int,
+    base_url: str | None = None,
+) -> dict[str, Any]:
+    return {
+        "meta": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "base_url": base_url,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "scenarios": {
+            scenario: asdict(run_scenario(scenario, requests, concurrency, base_url))
+            for scenario in scenarios
+        },
+    }
+
+
+# ---- 回帰判定 ----
+
+# 指標ごとの「悪化」の向き（1: 大きいほど悪い / -1: 小さいほど悪い）
+_METRIC_DIRECTIONS: dict[str, int] = {
+    "throughput_rps": -1,
+    "p50_ms": 1,
+    "p95_ms": 1,
+    "p99_ms": 1,
+    "queries_per_request": 1,
+}
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[str]:
+    """baseline から threshold（割合）を超えて悪化した指標の説明を返す"""
+    regressions = []
+    for scenario, result in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(scenario)
+        if not base:
+            continue
+        for metric, direction in _METRIC_DIRECTIONS.items():
+            before, after = base.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * direction
+            if change > threshold:
+                regressions.append(
+                    f"{scenario}.{metric}: {before:.2f} -> {after:.2f} ({change:+.0%})"
+                )
+    return regressions
+
+
+def format_result(scenario: str, result: dict[str, Any]) -> str:
+    queries = result["queries_per_request"]
+    return (
+        f"{scenario:<9} {result['throughput_rps']:8.1f} req/s  "
+        f"p50 {result['p50_ms']:7.2f}ms  p95 {result['p95_ms']:7.2f}ms  "
+        f"p99 {result['p99_ms']:7.2f}ms  "
+        f"queries {queries if queries is None else f'{queries:.1f}'}  "
+        f"errors {result['errors']}"
+    )
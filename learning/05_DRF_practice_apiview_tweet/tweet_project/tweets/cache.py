@@ -0,0 +1,124 @@
+import hashlib
+import threading
+import time
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from tweet_project.db_routers import use_primary
+
+
+class TweetCache:
+    """
+    ツイート一覧・詳細の読み取りキャッシュ
+
+    - 一覧: 名前空間バージョンをキーに含め、書き込み時はバージョンを1つ上げるだけで
+      過去のキーをすべて無効化する（O(1)）
+    - 詳細: ツイートごとのキーを書き込み時に削除する
+
+    キャッシュに載せる値（検証子を含む）はプライマリから読む。レプリカの遅延した
+    データを新しいバージョンのキーに保存すると、TTL が切れるまで古いままになるため。
+
+    キャッシュバックエンドは settings.TWEET_CACHE_ALIAS（デフォルト "default"）で選択する。
+    LocMemCache / RedisCache どちらでも動作する。
+    """
+
+    KEY_PREFIX = "tweets"
+    VERSION_KEY = f"{KEY_PREFIX}:list:version"
+
+    _stats_lock = threading.Lock()
+    _stats = {"hit": 0, "miss": 0}
+
+    @classmethod
+    def get_cache(cls) -> BaseCache:
+        return caches[getattr(settings, "TWEET_CACHE_ALIAS", "default")]
+
+    @classmethod
+    def get_timeout(cls) -> int:
+        return getattr(settings, "TWEET_CACHE_TIMEOUT", 300)
+
+    # ---- 名前空間バージョン ----
+
+    @classmethod
+    def get_list_version(cls) -> int:
+        cache = cls.get_cache()
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            # キーが追い出された後に古い番号へ戻らないよう、初期値は時刻から作る
+            cache.add(cls.VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(cls.VERSION_KEY)
+        return int(version)
+
+    @classmethod
+    def bump_list_version(cls) -> None:
+        cache = cls.get_cache()
+        try:
+            cache.incr(cls.VERSION_KEY)
+        except ValueError:
+            # バージョンキーが存在しない場合
+            cache.set(cls.VERSION_KEY, time.time_ns(), timeout=None)
+
+    # ---- キー ----
+
+    @classmethod
+    def list_key(cls, request_uri: str) -> str:
+        digest = hashlib.md5(request_uri.encode()).hexdigest()
+        return f"{cls.KEY_PREFIX}:list:{cls.get_list_version()}:{digest}"
+
+    @classmethod
+    def list_validator_key(cls) -> str:
+        return f"{cls.KEY_PREFIX}:list:{cls.get_list_version()}:validator"
+
+    @classmethod
+    def detail_key(cls, pk: int) -> str:
+        return f"{cls.KEY_PREFIX}:detail:{pk}"
+
+    @classmethod
+    def detail_validator_key(cls, pk: int) -> str:
+        return f"{cls.KEY_PREFIX}:detail:{pk}:validator"
+
+    # ---- 読み書き ----
+
+    @classmethod
+    def get_or_set(cls, key: str, build: Callable[[], Any]) -> Any:
+        """キャッシュがあれば返し、なければ build() の結果を保存して返す"""
+        cache = cls.get_cache()
+        data = cache.get(key)
+        if data is not None:
+            cls._record("hit")
+            return data
+
+        cls._record("miss")
+        with use_primary():
+            data = build()
+        cache.set(key, data, timeout=cls.get_timeout())
+        return data
+
+    @classmethod
+    def invalidate_tweet(cls, pk: int) -> None:
+        cls.get_cache().delete_many([cls.detail_key(pk), cls.detail_validator_key(pk)])
+        cls.bump_list_version()
+
+    # ---- ヒット / ミス統計 ----
+
+    @classmethod
+    def _record(cls, kind: str) -> None:
+        with cls._stats_lock:
+            cls._stats[kind] += 1
+
+    @classmethod
+    def stats(cls) -> dict[str, float]:
+        with cls._stats_lock:
+            hit = cls._stats["hit"]
+            miss = cls._stats["miss"]
+        total = hit + miss
+        return {
+            "hit": hit,
+            "miss": miss,
+            "hit_rate": hit / total if total else 0.0,
+        }
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        with cls._stats_lock:
+            cls._stats = {"hit": 0, "miss": 0}
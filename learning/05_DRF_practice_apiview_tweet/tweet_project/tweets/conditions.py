@@ -0,0 +1,51 @@
+import hashlib
+from datetime import datetime
+from urllib.parse import urlencode
+
+from django.db.models import Count, Max
+from django.http import HttpRequest
+
+from .cache import TweetCache
+from .models import Tweet
+
+# django.views.decorators.http.condition に渡す検証子（ETag / Last-Modified）
+# シリアライズ前に評価され、変更がなければ 304 Not Modified を返す。
+# 検証子そのものも TweetCache に載せ、書き込み時の無効化に追従させる。
+
+
+def _list_validator() -> str:
+    """一覧の検証子: 件数 + 最終更新日時（削除も件数の変化で検知する）"""
+    aggregate = Tweet.objects.aggregate(count=Count("id"), latest=Max("updated_at"))
+    latest = aggregate["latest"].timestamp() if aggregate["latest"] else 0
+    return f"{aggregate['count']}-{latest}"
+
+
+def _detail_updated_at(pk: int) -> datetime | None:
+    updated_at: datetime | None = TweetCache.get_or_set(
+        TweetCache.detail_validator_key(pk),
+        lambda: Tweet.objects.filter(pk=pk).values_list("updated_at", flat=True).first(),
+    )
+    return updated_at
+
+
+def _query_digest(request: HttpRequest) -> str:
+    """クエリ文字列（cursor / page_size など）を並び順によらない形にしたハッシュ"""
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    return hashlib.md5(query.encode()).hexdigest()[:16]
+
+
+def tweet_list_etag(request: HttpRequest) -> str:
+    """一覧の ETag: 検証子 + クエリ文字列（ページごとに内容が違うため）"""
+    validator: str = TweetCache.get_or_set(
+        TweetCache.list_validator_key(), _list_validator
+    )
+    return f"{validator}-{_query_digest(request)}"
+
+
+def tweet_detail_etag(request: HttpRequest, pk: int) -> str | None:
+    updated_at = _detail_updated_at(pk)
+    return f"{pk}-{updated_at.timestamp()}" if updated_at else None
+
+
+def tweet_detail_last_modified(request: HttpRequest, pk: int) -> datetime | None:
+    return _detail_updated_at(pk)
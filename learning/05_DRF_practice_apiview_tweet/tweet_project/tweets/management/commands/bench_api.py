@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tweets import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "ツイート API のベンチマークを実行し、スループット・レイテンシ・クエリ数を計測する "
+        "（事前に seed_bench_data を実行すること）"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=benchmark.SCENARIOS,
+            help="実行するシナリオ（複数指定可、省略時はすべて）",
+        )
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--base-url",
+            help="起動中のサーバーに HTTP で送る場合の URL（省略時はインプロセス）",
+        )
+        parser.add_argument("--output", type=Path, help="結果を保存する JSON ファイル")
+        parser.add_argument("--baseline", type=Path, help="比較対象の結果 JSON ファイル")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="回帰とみなす悪化の割合（デフォルト 0.2 = 20%%）",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            result = benchmark.run(
+                scenarios=options["scenario"] or list(benchmark.SCENARIOS),
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                base_url=options["base_url"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for scenario, scenario_result in result["scenarios"].items():
+            self.stdout.write(benchmark.format_result(scenario, scenario_result))
+
+        if options["output"]:
+            options["output"].write_text(json.dumps(result, indent=2, ensure_ascii=False))
+            self.stdout.write(f"結果を保存しました: {options['output']}")
+
+        if options["baseline"]:
+            baseline = json.loads(options["baseline"].read_text())
+            regressions = benchmark.compare(baseline, result, options["threshold"])
+            if regressions:
+                raise CommandError("性能が悪化しています:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("ベースラインからの悪化はありません"))
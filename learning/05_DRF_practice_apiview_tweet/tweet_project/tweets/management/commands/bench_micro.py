@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from tweets import microbench
+
+
+class Command(BaseCommand):
+    help = (
+        "実装ごとのマイクロベンチマークを実行し、結果を Markdown の表で出力する "
+        "（足りないベンチ用ツイートは自動で追加する）"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("case", choices=sorted(microbench.CASES))
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10000],
+            help="データ件数（ケースにより行数・コーパスサイズ・バッチ件数として使う）",
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="1条件あたりの計測回数")
+
+    def handle(self, *args, **options):
+        rows = microbench.CASES[options["case"]](
+            sizes=sorted(options["sizes"]), repeat=options["repeat"]
+        )
+        self.stdout.write(microbench.format_rows(rows))
@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from tweet_project.db_routers import use_primary
+from tweets.models import Tweet
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "CustomUser.tweet_count を実際のツイート数と照合し、ずれていれば補正する"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="補正せず、ずれている件数だけ表示する",
+        )
+
+    def handle(self, *args, **options):
+        # レプリカの遅れた件数でプライマリを上書きしないよう、読み取りもプライマリで行う
+        with use_primary():
+            self._reconcile(options)
+
+    def _reconcile(self, options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+
+        fixed = 0
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                # 照合中にシグナルによる増減と競合しないよう、バッチ単位で行ロックする
+                users = list(
+                    User.objects.select_for_update()
+                    .filter(pk__gt=last_pk)
+                    .order_by("pk")
+                    .only("pk", "tweet_count")[:batch_size]
+                )
+                if not users:
+                    break
+                last_pk = users[-1].pk
+
+                actual = dict(
+                    Tweet.objects.filter(author__in=users)
+                    .values("author")
+                    .annotate(count=Count("id"))
+                    .order_by()
+                    .values_list("author", "count")
+                )
+                drifted = []
+                for user in users:
+                    count = actual.get(user.pk, 0)
+                    if user.tweet_count != count:
+                        user.tweet_count = count
+                        drifted.append(user)
+
+                if drifted and not dry_run:
+                    User.objects.bulk_update(drifted, ["tweet_count"])
+                fixed += len(drifted)
+
+        verb = "件がずれています" if dry_run else "件を補正しました"
+        self.stdout.write(self.style.SUCCESS(f"{fixed} {verb}"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from tweets import benchmark
+
+
+class Command(BaseCommand):
+    help = "ベンチマーク用のユーザーとツイートを bulk_create で投入する"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--tweets", type=int, default=10000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        benchmark.seed(
+            users=options["users"],
+            tweets=options["tweets"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"ユーザー {options['users']} 件、ツイート {options['tweets']} 件を投入しました"
+            )
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from tweets.models import TimelineEntry
+from tweets.timeline import TimelineService
+
+
+class Command(BaseCommand):
+    help = "ホームタイムラインを TIMELINE['MAX_LENGTH'] 件に切り詰める"
+
+    def handle(self, *args, **options):
+        owner_ids = (
+            TimelineEntry.objects.values_list("owner_id", flat=True)
+            .order_by("owner_id")
+            .distinct()
+        )
+        total = 0
+        for owner_id in owner_ids.iterator():
+            total += TimelineService.trim(owner_id)
+
+        self.stdout.write(self.style.SUCCESS(f"{total} 件のタイムラインエントリを削除しました"))
@@ -0,0 +1,705 @@
+"""
+ツイート API のマイクロベンチマーク（manage.py bench_micro から使う）
+
+bench_api がエンドポイント全体の負荷を測るのに対し、こちらは実装の差し替え前後を
+同じデータで直接比較する（OFFSET とキーセット、ModelSerializer と高速シリアライザ など）。
+
+- ensure_tweets: ベンチ用ツイートを指定件数まで追加する（足りない分だけ bulk_create）
+- CASES: ケース名 -> 計測関数。計測関数は表の行（dict）のリストを返す
+"""
+
+import random
+import statistics
+import time
+from typing import Any, Callable
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .benchmark import BENCH_PASSWORD, BENCH_USER_PREFIX
+from .cache import TweetCache
+from .models import Tweet
+from .search import get_search_backend
+
+User = get_user_model()
+
+Row = dict[str, Any]
+
+# 検索のベンチで適度にヒット件数がばらつくよう、本文は語彙からランダムに組み立てる
+WORDS = (
+    "今日 明日 天気 晴れ 雨 曇り 東京 大阪 ランチ カレー ラーメン 寿司 コーヒー 仕事 会議 "
+    "電車 週末 映画 音楽 読書 散歩 旅行 写真 ゲーム 野球 サッカー 勉強 Python Django "
+    "release deploy cache index query server client network database search"
+).split()
+
+CASES: dict[str, Callable[..., list[Row]]] = {}
+
+
+def case(name: str) -> Callable:
+    def register(func: Callable[..., list[Row]]) -> Callable[..., list[Row]]:
+        CASES[name] = func
+        return func
+
+    return register
+
+
+# ---- データ ----
+
+
+def random_content(rng: random.Random) -> str:
+    return " ".join(rng.sample(WORDS, 6))
+
+
+def bench_tweets():
+    return Tweet.objects.filter(author__username__startswith=BENCH_USER_PREFIX)
+
+
+def ensure_tweets(count: int, users: int = 100, batch_size: int = 5000) -> None:
+    """ベンチ用ツイートが count 件になるまで追加する（検索インデックスも更新）"""
+    authors = list(
+        User.objects.filter(username__startswith=BENCH_USER_PREFIX).values_list(
+            "id", flat=True
+        )
+    )
+    if not authors:
+        password = make_password(BENCH_PASSWORD)
+        authors = [
+            user.pk
+            for user in User.objects.bulk_create(
+                [
+                    User(
+                        username=f"{BENCH_USER_PREFIX}{i}",
+                        email=f"{BENCH_USER_PREFIX}{i}@example.com",
+                        password=password,
+                    )
+                    for i in range(users)
+                ]
+            )
+        ]
+
+    existing = bench_tweets().count()
+    rng = random.Random(existing)
+    search_backend = get_search_backend()
+    for start in range(existing, count, batch_size):
+        with transaction.atomic():
+            batch = Tweet.objects.bulk_create(
+                [
+                    Tweet(author_id=rng.choice(authors), content=random_content(rng))
+                    for _ in range(start, min(start + batch_size, count))
+                ]
+            )
+            search_backend.index_many(batch)
+    if existing < count:
+        TweetCache.bump_list_version()
+
+
+# ---- 計測 ----
+
+
+def measure(func: Callable[[], Any], repeat: int, warmup: int = 1) -> Row:
+    """func を repeat 回実行し、1回あたりの時間（ms）の統計を返す"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[max(int(len(timings) * 0.95) - 1, 0)],
+    }
+
+
+def format_rows(rows: list[Row]) -> str:
+    """計測結果を Markdown の表にする"""
+    if not rows:
+        return ""
+    columns = list(rows[0])
+
+    def cell(value: Any) -> str:
+        if isinstance(value, float):
+            return f"{value:.3f}" if value < 10 else f"{value:.1f}"
+        return str(value)
+
+    lines = [
+        "| " + " | ".join(columns) + " |",
+        "|" + "|".join("---" for _ in columns) + "|",
+    ]
+    lines += ["| " + " | ".join(cell(row[c]) for c in columns) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+# ---- ケース ----
+
+
+@case("pagination")
+def bench_pagination(sizes: list[int], repeat: int, **options) -> list[Row]:
+    """
+    一覧の深いページの取得時間: OFFSET とキーセット（TweetCursorPagination と同じ条件）
+
+    sizes の最大件数までツイートを用意し、先頭からの位置（depth）ごとに1ページ（20件）を取得する。
+    """
+    from .pagination import TweetCursorPagination, keyset_filter
+    from .serializers import TweetReadSerializer
+
+    total = max(sizes)
+    ensure_tweets(total)
+    page_size = TweetCursorPagination.page_size
+    ordered = TweetReadSerializer.get_queryset(Tweet.objects.all()).order_by(
+        *TweetCursorPagination.ordering
+    )
+    depths = sorted({0, *(size - page_size for size in sizes if size > page_size)})
+
+    rows = []
+    for depth in depths:
+        # キーセットは「直前のページの最後の行」を起点にする（計測外で取得）
+        created_at, pk = Tweet.objects.order_by(*TweetCursorPagination.ordering).values_list(
+            "created_at", "id"
+        )[max(depth - 1, 0)]
+
+        def offset_page():
+            list(ordered[depth : depth + page_size])
+
+        def keyset_page():
+            queryset = ordered
+            if depth:
+                queryset = ordered.filter(keyset_filter(created_at, pk))
+            list(queryset[:page_size])
+
+        for method, func in (("offset", offset_page), ("keyset", keyset_page)):
+            rows.append(
+                {"rows": total, "depth": depth, "method": method, **measure(func, repeat)}
+            )
+    return rows
+
+
+@case("serializer")
+def bench_serializer(sizes: list[int], repeat: int, **options) -> list[Row]:
+    """
+    一覧のシリアライズ時間: TweetSerializer（ModelSerializer）と TweetReadSerializer
+
+    クエリの時間を含めないよう、行は計測前に取得しておく。
+    両者の JSON 出力がバイト単位で一致するかも確認する（identical 列）。
+    """
+    from rest_framework.renderers import JSONRenderer
+
+    from .serializers import TweetReadSerializer, TweetSerializer
+
+    ensure_tweets(max(sizes))
+    renderer = JSONRenderer()
+    rows = []
+    for size in sizes:
+        ordered = Tweet.objects.order_by("-created_at", "-id")
+        instances = list(TweetSerializer.setup_eager_loading(ordered)[:size])
+        values = list(TweetReadSerializer.get_queryset(ordered)[:size])
+        identical = renderer.render(
+            TweetSerializer(instances, many=True).data
+        ) == renderer.render(TweetReadSerializer.serialize_many(values))
+
+        results = {
+            "model_serializer": measure(
+                lambda: TweetSerializer(instances, many=True).data, repeat
+            ),
+            "read_serializer": measure(
+                lambda: TweetReadSerializer.serialize_many(values), repeat
+            ),
+        }
+        for method, result in results.items():
+            rows.append(
+                {
+                    "rows": size,
+                    "method": method,
+                    **result,
+                    "us_per_row": result["mean_ms"] * 1000 / size,
+                    "identical": identical,
+                }
+            )
+    return rows
+
+
+@case("cache")
+def bench_cache(sizes: list[int], repeat: int, **options) -> list[Row]:
+    """
+    一覧・詳細キャッシュのヒット率とレイテンシ（書き込み割合ごと）
+
+    読み取りは一覧の先頭ページと、よく読まれる 100 件の詳細を半々で投げる。
+    書き込みは post_save / post_delete と同じ TweetCache.invalidate_tweet を呼び、
+    一覧の名前空間バージョンが上がることでヒット率が下がる様子を見る。
+    repeat はリクエスト数。キャッシュバックエンドは LocMemCache と DatabaseCache に加え、
+    比較用にキャッシュなし（DummyCache）でも測る。
+    """
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.test import Client, override_settings
+
+    ensure_tweets(max(sizes))
+    hot_ids = list(
+        Tweet.objects.order_by("-created_at", "-id").values_list("id", flat=True)[:100]
+    )
+    client = Client(SERVER_NAME="localhost")
+    rng = random.Random(0)
+
+    bench_caches = {
+        **settings.CACHES,
+        "bench_none": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+    backends = (("none", "bench_none"), ("locmem", "default"), ("database", "shared"))
+
+    rows = []
+    for backend, alias in backends:
+        for write_ratio in (0.0, 0.01, 0.05, 0.2, 0.5):
+            with override_settings(CACHES=bench_caches, TWEET_CACHE_ALIAS=alias):
+                caches[alias].clear()
+                TweetCache.reset_stats()
+                timings = []
+                errors = 0
+                for _ in range(repeat):
+                    if rng.random() < write_ratio:
+                        TweetCache.invalidate_tweet(rng.choice(hot_ids))
+                        continue
+                    if rng.random() < 0.5:
+                        path = "/api/v1/tweets/"
+                    else:
+                        path = f"/api/v1/tweets/{rng.choice(hot_ids)}/"
+                    started = time.perf_counter()
+                    response = client.get(path)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    errors += response.status_code != 200
+                stats = TweetCache.stats()
+
+            timings.sort()
+            rows.append(
+                {
+                    "backend": backend,
+                    "write_ratio": write_ratio,
+                    "reads": len(timings),
+                    "errors": errors,
+                    "hit_rate": stats["hit_rate"],
+                    "mean_ms": statistics.mean(timings),
+                    "p50_ms": statistics.median(timings),
+                    "p95_ms": timings[max(int(len(timings) * 0.95) - 1, 0)],
+                }
+            )
+    return rows
+
+
+@case("bulk_create")
+def bench_bulk_create(sizes: list[int], repeat: int, **options) -> list[Row]:
+    """
+    ツイート作成のスループット: 1件ずつ作成と POST /tweets/bulk/ でまとめて作成
+
+    一覧 API には単体作成の POST がないため、1件ずつの方は bulk/ に1件の配列を送る
+    （1リクエスト・1トランザクション・シグナル経由の後処理が1件ごとに走る）。
+    sizes は1回に作成する件数。専用ユーザー（ベンチ用ツイートの集計には含めない）で作成し、
+    計測後に削除する。
+    """
+    from django.test import Client
+    from rest_framework.authtoken.models import Token
+
+    writer, _ = User.objects.get_or_create(username="microbench_writer")
+    token = Token.objects.get_or_create(user=writer)[0].key
+    client = Client(SERVER_NAME="localhost", HTTP_AUTHORIZATION=f"Token {token}")
+
+    def post(path: str, body: Any) -> None:
+        response = client.post(path, body, content_type="application/json")
+        if response.status_code != 201:
+            raise RuntimeError(f"POST {path} failed: {response.status_code}")
+
+    rows = []
+    try:
+        for size in sizes:
+            items = [{"content": f"microbench {i}"} for i in range(size)]
+
+            def sequential():
+                for item in items:
+                    post("/api/v1/tweets/bulk/", [item])
+
+            def bulk():
+                post("/api/v1/tweets/bulk/", items)
+
+            results = {
+                "sequential": measure(sequential, repeat, warmup=0),
+                "bulk": measure(bulk, repeat, warmup=0),
+            }
+            for method, result in results.items():
+                rows.append(
+                    {
+                        "tweets": size,
+                        "method": method,
+                        **result,
+                        "tweets_per_s": size / result["mean_ms"] * 1000,
+                    }
+                )
+    finally:
+        writer.delete()
+    return rows
+
+
+@case("hashing")
+def bench_hashing(sizes: list[int], repeat: int, **options) -> list[Row]:
+    """
+    ログインと一覧の読み取りを同時に流したときのハッシュ計算時間・待ち時間と読み取りレイテンシ
+
+    sizes はログインし続けるクライアント数。読み取り側は 4 クライアントで合計 repeat 回 GET し、
+    その間ログイン側はループし続ける。パスワードの検証をリクエストスレッドで直接行う場合
+    （direct: PBKDF2PasswordHasher）と HashingExecutor のプールで行う場合（pooled）を比べる。
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from django.db import connection
+    from django.test import Client, override_settings
+    from user.hashers import HashingExecutor
+
+    ensure_tweets(10000)
+    hashers = {
+        "direct": ["django.contrib.auth.hashers.PBKDF2PasswordHasher"],
+        "pooled": ["user.hashers.PooledPBKDF2PasswordHasher"],
+    }
+    readers = 4
+
+    rows = []
+    for size in sizes:
+        for mode, password_hashers in hashers.items():
+            HashingExecutor.shutdown()
+            HashingExecutor.reset_stats()
+            done = threading.Event()
+            lock = threading.Lock()
+            read_timings: list[float] = []
+            login_status: dict[int, int] = {}
+
+            def login(i: int) -> None:
+                client = Client(SERVER_NAME="localhost")
+                body = {
+                    "username": f"{BENCH_USER_PREFIX}{i % 100}",
+                    "password": BENCH_PASSWORD,
+                }
+                try:
+                    while not done.is_set():
+                        response = client.post(
+                            "/api/v1/user/login/", body, content_type="application/json"
+                        )
+                        with lock:
+                            code = response.status_code
+                            login_status[code] = login_status.get(code, 0) + 1
+                        if code == 503:
+                            time.sleep(0.05)
+                finally:
+                    connection.close()
+
+            def read(_: int) -> None:
+                client = Client(SERVER_NAME="localhost")
+                try:
+                    for _ in range(repeat // readers):
+                        started = time.perf_counter()
+                        client.get("/api/v1/tweets/")
+                        with lock:
+                            read_timings.append((time.perf_counter() - started) * 1000)
+                finally:
+                    connection.close()
+
+            started = time.perf_counter()
+            with override_settings(PASSWORD_HASHERS=password_hashers):
+                with ThreadPoolExecutor(max_workers=size + readers) as executor:
+                    logins = [executor.submit(login, i) for i in range(size)]
+                    reads = [executor.submit(read, i) for i in range(readers)]
+                    for future in reads:
+                        future.result()
+                    done.set()
+                    for future in logins:
+                        future.result()
+
+            elapsed = time.perf_counter() - started
+            stats = HashingExecutor.stats()
+            read_timings.sort()
+            rows.append(
+                {
+                    "login_clients": size,
+                    "hasher": mode,
+                    "logins_ok": login_status.get(200, 0),
+                    "logins_503": login_status.get(503, 0),
+                    "logins_per_s": login_status.get(200, 0) / elapsed,
+                    "hash_avg_ms": stats["hash_time_avg"] * 1000,
+                    "queue_wait_avg_ms": stats["queue_wait_avg"] * 1000,
+                    "queue_wait_max_ms": stats["queue_wait_max"] * 1000,
+                    "read_p50_ms": statistics.median(read_timings),
+                    "read_p99_ms": read_timings[max(int(len(read_timings) * 0.99) - 1, 0)],
+                }
+            )
+    HashingExecutor.shutdown()
+    return rows
+
+
+@case("register")
+def bench_register(sizes: list[int], repeat: int, **options) -> list[Row]:
+    """
+    ユーザー登録の DB 側のコスト（1件あたりの時間とクエリ数）
+
+    パスワードハッシュの時間を除くため MD5PasswordHasher に差し替えて POST /user/register/ を送る。
+    new は新規登録、duplicate は登録済みの username / email での登録（IntegrityError の経路）。
+    sizes は登録件数。作成したユーザーは計測後に削除する。
+    """
+    from django.db import connection
+    from django.test import Client, override_settings
+
+    prefix = f"microbench_reg_{time.time_ns()}_"
+    client = Client(SERVER_NAME="localhost")
+    queries = 0
+
+    def count(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    def register(username: str, expected: int) -> None:
+        response = client.post(
+            "/api/v1/user/register/",
+            {
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": BENCH_PASSWORD,
+            },
+            content_type="application/json",
+        )
+        if response.status_code != expected:
+            raise RuntimeError(f"register {username}: {response.status_code}")
+
+    rows = []
+    try:
+        with override_settings(
+            PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+        ), connection.execute_wrapper(count):
+            for size in sizes:
+                for path, expected in (("new", 201), ("duplicate", 400)):
+                    names = [f"{prefix}{size}_{i}" for i in range(size)]
+                    queries = 0
+                    started = time.perf_counter()
+                    for name in names:
+                        register(name, expected)
+                    elapsed = time.perf_counter() - started
+                    rows.append(
+                        {
+                            "registrations": size,
+                            "path": path,
+                            "mean_ms": elapsed * 1000 / size,
+                            "queries_per_request": queries / size,
+                            "per_s": size / elapsed,
+                        }
+                    )
+    finally:
+        User.objects.filter(username__startswith=prefix).delete()
+    return rows
+
+
+@case("search")
+def bench_search(sizes: list[int], repeat: int, **options) -> list[Row]:
+    """
+    検索のレイテンシ: FTS5（SQLiteFTS5SearchBackend）と content__icontains（ORMSearchBackend）
+
+    検索 API と同じく件数（count）と先頭 20 件（search）を取得する時間を測る。
+    DB のツイート数より小さいコーパスは作れないため、サイズごとに別の DB で実行する。
+    """
+    from django.test import override_settings
+
+    from .search import SearchResults
+
+    # ベンチ用の本文は 43 語の語彙から作るため、1語はコーパスの約 15% に当たる。
+    # 絞り込みの効く検索（3語・該当なし）と効かない検索を分けて見る
+    queries = {
+        # 3文字以上の語は MATCH、3文字未満（日本語の2文字語など）は LIKE で絞り込む
+        "match_1term": "database",
+        "match_3terms": "database deploy cache",
+        "match_none": "kubernetes",
+        "short_term": "天気",
+    }
+    backends = {
+        "fts5": "tweets.search.SQLiteFTS5SearchBackend",
+        "icontains": "tweets.search.ORMSearchBackend",
+    }
+
+    rows = []
+    for size in sizes:
+        ensure_tweets(size)
+        corpus = Tweet.objects.count()
+        for query_name, query in queries.items():
+            for backend, backend_path in backends.items():
+                with override_settings(TWEET_SEARCH_BACKEND=backend_path):
+                    results = SearchResults(query)
+                    hits = results.count()
+
+                    def run():
+                        results.count()
+                        results[0:20]
+
+                    rows.append(
+                        {
+                            "corpus": corpus,
+                            "query": query_name,
+                            "backend": backend,
+                            "hits": hits,
+                            **measure(run, repeat),
+                        }
+                    )
+    return rows
+
+
+@case("logging")
+def bench_logging(sizes: list[int], repeat: int, **options) -> list[Row]:
+    """
+    ログを大量に出したときの一覧 API（GET /api/v1/tweets/）のレイテンシ
+
+    sizes は1リクエストあたりに出す INFO ログの件数（tweets.views ロガー）。
+    ハンドラーは 同期の StreamHandler / QueuedStreamHandler /
+    QueuedStreamHandler + 設定の SamplingFilter を比べる。出力先は一時ファイル（file）と、
+    書き込みごとに待つストリーム（slow: ログ収集へのパイプが詰まっている状態を模す）の2通り。
+    """
+    import logging
+    import tempfile
+
+    from django.core.signals import request_started
+    from django.test import Client
+
+    from tweet_project import settings as project_settings
+    from tweet_project.log import JSONFormatter, QueuedStreamHandler, SamplingFilter
+
+    ensure_tweets(1000)
+    client = Client(SERVER_NAME="localhost")
+    view_logger = logging.getLogger("tweets.views")
+    # ベンチ用の設定は LOGGING を上書きするため、間引く割合はプロジェクトの設定から取る
+    logging_config: dict[str, Any] = project_settings.LOGGING
+    rates = logging_config["filters"]["sampling"]["rates"]
+
+    class SlowStream:
+        """書き込み1回ごとに待つストリーム"""
+
+        def __init__(self, stream, delay: float = 0.0001):
+            self.stream = stream
+            self.delay = delay
+
+        def write(self, text: str) -> None:
+            time.sleep(self.delay)
+            self.stream.write(text)
+
+        def flush(self) -> None:
+            self.stream.flush()
+
+    def build_handler(kind: str, stream) -> logging.Handler | None:
+        if kind == "none":
+            return None
+        if kind == "stream":
+            handler: logging.Handler = logging.StreamHandler(stream)
+        else:
+            handler = QueuedStreamHandler(stream)
+        handler.setFormatter(JSONFormatter())
+        if kind == "queued_sampled":
+            handler.addFilter(SamplingFilter(rates))
+        return handler
+
+    def get():
+        response = client.get("/api/v1/tweets/")
+        if response.status_code != 200:
+            raise RuntimeError(f"GET failed: {response.status_code}")
+
+    # (出力先, ハンドラー)。none はハンドラーなし（ログレコードを作るだけ）
+    configs = [("-", "none")] + [
+        (sink, kind)
+        for sink in ("file", "slow")
+        for kind in ("stream", "queued", "queued_sampled")
+    ]
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    rows = []
+    try:
+        root.setLevel(logging.INFO)
+        for size in sizes:
+
+            def emit(sender, **kwargs):
+                for i in range(size):
+                    view_logger.info("bench log %d of %d", i, size, extra={"bench": True})
+
+            request_started.connect(emit, dispatch_uid="bench_logging")
+            try:
+                for sink, kind in configs:
+                    with tempfile.TemporaryFile("w") as stream:
+                        handler = build_handler(
+                            kind, SlowStream(stream) if sink == "slow" else stream
+                        )
+                        root.handlers = [handler] if handler else []
+                        result = measure(get, repeat)
+                        dropped = getattr(handler, "dropped", 0)
+                        if handler:
+                            # キューに残ったログの書き出しは計測に含めない
+                            handler.close()
+                        rows.append(
+                            {
+                                "logs_per_request": size,
+                                "sink": sink,
+                                "handler": kind,
+                                **result,
+                                "dropped": dropped,
+                            }
+                        )
+            finally:
+                request_started.disconnect(dispatch_uid="bench_logging")
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
+    return rows
+
+
+@case("payload")
+def bench_payload(sizes: list[int], repeat: int, **options) -> list[Row]:
+    """
+    一覧のレスポンスサイズとシリアライズ・圧縮の時間
+
+    sizes は1レスポンスのツイート件数。レンダラーは
+    ascii_json（\\uXXXX エスケープ）/ drf_json（DRF の JSONRenderer）/ fast_json（FastJSONRenderer）、
+    圧縮は なし / gzip / br（CompressionMiddleware と同じ設定）を比べる。
+    時間は JSON 化と圧縮の合計（シリアライザで dict にする時間は含めない）。
+    """
+    import json
+
+    from django.utils.text import compress_string
+    from rest_framework.renderers import JSONRenderer
+
+    from tweet_project.compression import DEFAULT_COMPRESSION_SETTINGS, brotli
+    from tweet_project.renderers import FastJSONRenderer
+
+    from .serializers import TweetReadSerializer
+
+    renderers: dict[str, Callable[[Any], bytes]] = {
+        "ascii_json": lambda data: json.dumps(data).encode(),
+        "drf_json": JSONRenderer().render,
+        "fast_json": FastJSONRenderer().render,
+    }
+    encoders: dict[str, Callable[[bytes], bytes]] = {
+        "identity": lambda content: content,
+        "gzip": compress_string,
+    }
+    if brotli is not None:
+        quality = DEFAULT_COMPRESSION_SETTINGS["BROTLI_QUALITY"]
+        encoders["br"] = lambda content: brotli.compress(content, quality=quality)
+
+    ensure_tweets(max(sizes))
+    rows = []
+    for size in sizes:
+        ordered = Tweet.objects.order_by("-created_at", "-id")
+        data = TweetReadSerializer.serialize_many(
+            TweetReadSerializer.get_queryset(ordered)[:size]
+        )
+        for renderer_name, render in renderers.items():
+            for encoding, encode in encoders.items():
+                payload = encode(render(data))
+                rows.append(
+                    {
+                        "tweets": size,
+                        "renderer": renderer_name,
+                        "encoding": encoding,
+                        "bytes": len(payload),
+                        **measure(lambda: encode(render(data)), repeat),
+                    }
+                )
+    return rows
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# SQLite の場合のみ FTS5（trigram）の全文検索インデックスを作成する
+# 他の DB では tweets.search.ORMSearchBackend などを TWEET_SEARCH_BACKEND に指定する
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS tweets_tweet_fts "
+        "USING fts5(content, tokenize='trigram')"
+    )
+    schema_editor.execute(
+        "INSERT INTO tweets_tweet_fts (rowid, content) "
+        "SELECT id, content FROM tweets_tweet"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS tweets_tweet_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tweets', '0002_tweet_tweet_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
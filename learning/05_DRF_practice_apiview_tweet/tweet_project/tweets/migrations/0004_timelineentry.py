@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-17 10:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tweets', '0003_tweet_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(verbose_name='ツイート作成日時')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL, verbose_name='タイムラインの所有者')),
+                ('tweet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='tweets.tweet', verbose_name='ツイート')),
+            ],
+            options={
+                'verbose_name': 'タイムライン',
+                'verbose_name_plural': 'タイムライン',
+                'indexes': [models.Index(fields=['owner', '-created_at', '-tweet'], name='timeline_owner_created_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'tweet'), name='timeline_entry_owner_tweet_unique')],
+            },
+        ),
+    ]
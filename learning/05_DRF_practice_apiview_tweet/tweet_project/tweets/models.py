@@ -27,8 +27,60 @@ class Tweet(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # カーソルページネーション（TweetCursorPagination）用
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="tweet_created_at_id_idx",
+            ),
+        ]
         verbose_name = "ツイート"
         verbose_name_plural = "ツイート"
     
     def __str__(self):
-        return f"{self.autor.username}: {self.content[:20]}"
+        return f"{self.author.username}: {self.content[:20]}"
+
+
+class TimelineEntry(models.Model):
+    """
+    ホームタイムライン（フォロー中ユーザーのツイート）の実体化テーブル
+
+    ツイート作成時にフォロワーごとに1行追加する（fan-out-on-write）。
+    created_at はツイートの値をコピーし、(owner, created_at, tweet) の索引だけで
+    ページを取得できるようにしている。
+    """
+
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+        verbose_name="タイムラインの所有者"
+    )
+    tweet = models.ForeignKey(
+        Tweet,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+        verbose_name="ツイート"
+    )
+    created_at = models.DateTimeField(
+        verbose_name="ツイート作成日時"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "tweet"],
+                name="timeline_entry_owner_tweet_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["owner", "-created_at", "-tweet"],
+                name="timeline_owner_created_idx",
+            ),
+        ]
+        verbose_name = "タイムライン"
+        verbose_name_plural = "タイムライン"
+
+    def __str__(self):
+        return f"{self.owner_id}: {self.tweet_id}"
@@ -0,0 +1,96 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.pagination import CursorPagination, _positive_int
+
+
+class TweetCursorPagination(CursorPagination):
+    """
+    ツイート一覧用のカーソル（キーセット）ページネーション
+
+    OFFSET を使わず (created_at, id) の位置から次ページを取得するため、
+    ページが深くなってもレスポンス時間が変わらない。
+    next / previous には不透明なカーソル文字列が入る。
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    # Tweet.Meta.ordering と揃え、同時刻のツイートは id で順序を確定させる
+    ordering = ("-created_at", "-id")
+
+
+def parse_page_size(value: str | None) -> int:
+    """
+    page_size クエリパラメータを TweetCursorPagination と同じ規則で解釈する
+
+    1 未満・数値以外・未指定はデフォルト値、上限を超える値は max_page_size に丸める。
+    """
+    if value is None:
+        return TweetCursorPagination.page_size
+    try:
+        page_size: int = _positive_int(
+            value, strict=True, cutoff=TweetCursorPagination.max_page_size
+        )
+        return page_size
+    except ValueError:
+        return TweetCursorPagination.page_size
+
+
+def keyset_filter(
+    created_at: datetime, pk: int, reverse: bool = False, field: str = "id"
+) -> Q:
+    """
+    (created_at, pk) より古い行（reverse=True なら新しい行）の条件
+
+    `created_at < X OR (created_at = X AND id < pk)` だけだと SQLite はインデックスを
+    先頭から走査してしまうため、先頭に `created_at <= X` の範囲条件を付けて
+    (created_at, id) インデックスをカーソル位置から読み始められるようにする。
+    """
+    op = "gt" if reverse else "lt"
+    return Q(**{f"created_at__{op}e": created_at}) & (
+        Q(**{f"created_at__{op}": created_at}) | Q(**{f"{field}__{op}": pk})
+    )
+
+
+def encode_keyset_cursor(created_at: datetime, pk: int, reverse: bool = False) -> str:
+    """
+    (created_at, id) を不透明なカーソル文字列にする（非同期ビュー・タイムライン用）
+
+    reverse=True のカーソルはその位置より新しい側（previous）のページを指す。
+    """
+    raw = f"{created_at.isoformat()}|{pk}" + ("|r" if reverse else "")
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_keyset_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    前方向のカーソル文字列を (created_at, id) に戻す
+
+    Raises:
+        ValueError: 不正なカーソル（reverse カーソルを含む）
+    """
+    created_at, pk, reverse = decode_keyset_cursor_with_direction(cursor)
+    if reverse:
+        raise ValueError("reverse cursor is not supported")
+    return created_at, pk
+
+
+def decode_keyset_cursor_with_direction(cursor: str) -> tuple[datetime, int, bool]:
+    """
+    カーソル文字列を (created_at, id, reverse) に戻す
+
+    Raises:
+        ValueError: 不正なカーソル
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        reverse = raw.endswith("|r")
+        if reverse:
+            raw = raw[: -len("|r")]
+        created_at, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(pk), reverse
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("invalid cursor") from e
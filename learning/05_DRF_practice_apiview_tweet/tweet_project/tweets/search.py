@@ -0,0 +1,154 @@
+from functools import cache
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .models import Tweet
+
+
+class BaseSearchBackend:
+    """
+    ツイート全文検索バックエンドの基底クラス
+
+    検索結果はツイートIDのリスト（関連度順）で返す。
+    インデックスの更新は Tweet の post_save / post_delete シグナルから呼ばれる。
+    """
+
+    def index(self, tweet: Tweet) -> None:
+        self.index_many([tweet])
+
+    def index_many(self, tweets: Iterable[Tweet]) -> None:
+        raise NotImplementedError
+
+    def remove(self, pk: int) -> None:
+        raise NotImplementedError
+
+    def count(self, query: str) -> int:
+        raise NotImplementedError
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[int]:
+        raise NotImplementedError
+
+
+class ORMSearchBackend(BaseSearchBackend):
+    """インデックスを持たないフォールバック（content__icontains による全件走査）"""
+
+    def index_many(self, tweets: Iterable[Tweet]) -> None:
+        pass
+
+    def remove(self, pk: int) -> None:
+        pass
+
+    def _queryset(self, query: str):
+        queryset = Tweet.objects.all()
+        for term in query.split():
+            queryset = queryset.filter(content__icontains=term)
+        return queryset
+
+    def count(self, query: str) -> int:
+        count: int = self._queryset(query).count()
+        return count
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[int]:
+        return list(
+            self._queryset(query).values_list("id", flat=True)[offset : offset + limit]
+        )
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 による転置インデックス検索
+
+    日本語を扱うため trigram トークナイザを使う（migrations/0003 で作成）。
+    3文字以上の語は MATCH（bm25 で順位付け）、3文字未満の語は LIKE で絞り込む。
+    """
+
+    table = "tweets_tweet_fts"
+    min_match_length = 3
+
+    def index_many(self, tweets: Iterable[Tweet]) -> None:
+        rows = [(tweet.pk, tweet.content) for tweet in tweets]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s", [(pk,) for pk, _ in rows]
+            )
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, content) VALUES (%s, %s)", rows
+            )
+
+    def remove(self, pk: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [pk])
+
+    def _where(self, query: str) -> tuple[str, list[str], bool]:
+        """WHERE 句・パラメータ・MATCH を使うかどうかを返す"""
+        terms = query.split()
+        match_terms = [t for t in terms if len(t) >= self.min_match_length]
+        like_terms = [t for t in terms if len(t) < self.min_match_length]
+
+        clauses: list[str] = []
+        params: list[str] = []
+        if match_terms:
+            # 語をフレーズとしてクォートし、FTS5 の演算子として解釈させない
+            clauses.append(f"{self.table} MATCH %s")
+            params.append(" ".join('"' + t.replace('"', '""') + '"' for t in match_terms))
+        for term in like_terms:
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("content LIKE %s ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+
+        return " AND ".join(clauses) or "0", params, bool(match_terms)
+
+    def count(self, query: str) -> int:
+        where, params, _ = self._where(query)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {self.table} WHERE {where}", params)
+            count: int = cursor.fetchone()[0]
+            return count
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[int]:
+        where, params, use_rank = self._where(query)
+        order_by = "rank, rowid DESC" if use_rank else "rowid DESC"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {where} "
+                f"ORDER BY {order_by} LIMIT %s OFFSET %s",
+                [*params, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+@cache
+def get_search_backend() -> BaseSearchBackend:
+    backend_path = getattr(
+        settings, "TWEET_SEARCH_BACKEND", "tweets.search.SQLiteFTS5SearchBackend"
+    )
+    backend: BaseSearchBackend = import_string(backend_path)()
+    return backend
+
+
+class SearchResults:
+    """
+    検索結果の遅延シーケンス
+
+    DRF の LimitOffsetPagination にクエリセットの代わりに渡し、
+    count() とスライスをそれぞれ検索バックエンドへの問い合わせに変換する。
+    """
+
+    def __init__(self, query: str, backend: BaseSearchBackend | None = None):
+        self.query = query
+        self.backend = backend or get_search_backend()
+
+    def count(self) -> int:
+        return self.backend.count(self.query)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, key: slice) -> list[int]:
+        offset = key.start or 0
+        return self.backend.search(self.query, limit=key.stop - offset, offset=offset)
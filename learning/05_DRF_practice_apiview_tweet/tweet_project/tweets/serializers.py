@@ -1,16 +1,186 @@
-from rest_framework import serializers
+from datetime import datetime
+from typing import Any, Callable, Iterable
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .cache import TweetCache
 from .models import Tweet
+from .search import get_search_backend
+from .timeline import TimelineService
+
+User = get_user_model()
+
+
+class EagerLoadingMixin:
+    """
+    Serializer が必要とするリレーション・カラムを宣言し、
+    クエリセットへまとめて適用するための Mixin
 
+    - select_related_fields: JOIN で同時取得する外部キー
+    - prefetch_related_fields: 別クエリでまとめて取得するリレーション
+    - only_fields: 取得するカラム（未指定なら全カラム）
+    """
+
+    select_related_fields: tuple[str, ...] = ()
+    prefetch_related_fields: tuple[str, ...] = ()
+    only_fields: tuple[str, ...] = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset: QuerySet) -> QuerySet:
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        if cls.only_fields:
+            queryset = queryset.only(*cls.only_fields)
+        return queryset
 
-class TweetSerializer(serializers.ModelSerializer):
+
+class TweetSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     ツイート一覧・詳細表示用
     """
 
     author = serializers.StringRelatedField(read_only=True)
 
+    # author の __str__（username）を行ごとに問い合わせないよう JOIN で取得する
+    select_related_fields = ("author",)
+    only_fields = (
+        "id",
+        "content",
+        "created_at",
+        "updated_at",
+        "author__username",
+    )
+
     class Meta:
         model = Tweet
         fields = ["id", "author", "content", "created_at", "updated_at"]
         read_only_fields = ["id", "author", "created_at", "updated_at"]
+
+
+class TweetBulkCreateListSerializer(serializers.ListSerializer):
+    """
+    ツイート一括作成用の ListSerializer
+
+    1件ずつ create() せず、bulk_create でバッチ単位にまとめて INSERT する。
+    全件を1トランザクションで保存する。
+    """
+
+    def create(self, validated_data: list[dict[str, Any]]) -> list[Tweet]:
+        author = self.context["request"].user
+        batch_size = self.context.get(
+            "batch_size", getattr(settings, "TWEET_BULK_CREATE_BATCH_SIZE", 500)
+        )
+        tweets = [Tweet(author=author, **item) for item in validated_data]
+
+        with transaction.atomic():
+            created: list[Tweet] = Tweet.objects.bulk_create(tweets, batch_size=batch_size)
+            # bulk_create は post_save シグナルを送らないため、ツイート数・検索インデックス・
+            # タイムライン・一覧キャッシュを明示的に更新する
+            User.objects.filter(pk=author.pk).update(
+                tweet_count=F("tweet_count") + len(created)
+            )
+            get_search_backend().index_many(created)
+            TimelineService.fan_out_many(created)
+            transaction.on_commit(TweetCache.bump_list_version)
+
+        return created
+
+
+class TweetCreateSerializer(serializers.ModelSerializer):
+    """ツイート作成用（author はリクエストユーザーを自動設定）"""
+
+    class Meta:
+        model = Tweet
+        fields = ["content"]
+        list_serializer_class = TweetBulkCreateListSerializer
+
+    def create(self, validated_data):
+        validated_data["author"] = self.context["request"].user
+        return super().create(validated_data)
+
+
+class TweetReadSerializer:
+    """
+    ツイート一覧表示用の高速シリアライザ（読み取り専用）
+
+    ModelSerializer のフィールド生成・モデルインスタンス生成を経由せず、
+    values() の行から直接 dict を組み立てる。
+    出力は TweetSerializer と同一（キー順・日時フォーマットを含む）。
+    """
+
+    value_fields = ("id", "author__username", "content", "created_at", "updated_at")
+
+    @classmethod
+    def get_queryset(cls, queryset: QuerySet) -> QuerySet:
+        return queryset.values(*cls.value_fields)
+
+    @classmethod
+    def datetime_formatter(cls) -> Callable[[Any], Any]:
+        """
+        日時を DRF の DateTimeField と同じ規則（DATETIME_FORMAT / タイムゾーン）で文字列化する関数を返す
+
+        DateTimeField は値ごとに現在のタイムゾーンを引き直し、一覧の処理時間の大半を占める。
+        タイムゾーンと出力形式は呼び出し時点で一度だけ解決し、DB から来る aware な日時を
+        ISO 8601 で出力する通常のケースは DateTimeField を経由せずに変換する。
+        """
+        field_timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+        field = serializers.DateTimeField(read_only=True, default_timezone=field_timezone)
+        represent: Callable[[Any], Any] = field.to_representation
+        output_format = api_settings.DATETIME_FORMAT
+        if (
+            field_timezone is None
+            or output_format is None
+            or output_format.lower() != ISO_8601
+        ):
+            return represent
+
+        def format_datetime(value: Any) -> Any:
+            if not isinstance(value, datetime) or not timezone.is_aware(value):
+                return represent(value)
+            text = value.astimezone(field_timezone).isoformat()
+            return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+        return format_datetime
+
+    @classmethod
+    def to_representation(
+        cls,
+        row: dict[str, Any],
+        format_datetime: Callable[[Any], Any] | None = None,
+    ) -> dict[str, Any]:
+        if format_datetime is None:
+            format_datetime = cls.datetime_formatter()
+        return {
+            "id": row["id"],
+            "author": row["author__username"],
+            "content": row["content"],
+            "created_at": format_datetime(row["created_at"]),
+            "updated_at": format_datetime(row["updated_at"]),
+        }
+
+    @classmethod
+    def serialize_many(cls, rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        format_datetime = cls.datetime_formatter()
+        return [cls.to_representation(row, format_datetime) for row in rows]
+
+    @classmethod
+    def serialize_instances(cls, tweets: Iterable[Tweet]) -> list[dict[str, Any]]:
+        """作成直後などモデルインスタンスが手元にある場合（author は読み込み済みであること）"""
+        return cls.serialize_many(
+            {
+                "id": tweet.pk,
+                "author__username": tweet.author.username,
+                "content": tweet.content,
+                "created_at": tweet.created_at,
+                "updated_at": tweet.updated_at,
+            }
+            for tweet in tweets
+        )
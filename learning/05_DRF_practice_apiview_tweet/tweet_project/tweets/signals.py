@@ -0,0 +1,82 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from user.models import Follow
+
+from .cache import TweetCache
+from .models import Tweet
+from .search import get_search_backend
+from .timeline import TimelineService
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Tweet)
+@receiver(post_delete, sender=Tweet)
+def invalidate_tweet_cache(sender, instance: Tweet, using: str, **kwargs) -> None:
+    """
+    ツイートの作成・更新・削除時にキャッシュを無効化
+
+    コミット前に無効化すると、並行するリクエストがコミット前の状態でキャッシュを
+    作り直してしまうため、一括作成と同じくコミット後に行う。
+    """
+    transaction.on_commit(partial(TweetCache.invalidate_tweet, instance.pk), using=using)
+
+
+@receiver(post_save, sender=Tweet)
+def index_tweet(sender, instance: Tweet, **kwargs) -> None:
+    """ツイートの作成・更新時に検索インデックスを更新"""
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Tweet)
+def unindex_tweet(sender, instance: Tweet, **kwargs) -> None:
+    """ツイートの削除時に検索インデックスから削除"""
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=Tweet)
+def fan_out_tweet(sender, instance: Tweet, created: bool, **kwargs) -> None:
+    """ツイート作成時にフォロワーのタイムラインへ配信"""
+    if created:
+        TimelineService.fan_out(instance)
+
+
+@receiver(post_save, sender=Tweet)
+def increment_tweet_count(sender, instance: Tweet, created: bool, **kwargs) -> None:
+    """ツイート作成時に投稿者のツイート数を +1"""
+    if created:
+        User.objects.filter(pk=instance.author_id).update(tweet_count=F("tweet_count") + 1)
+
+
+@receiver(post_delete, sender=Tweet)
+def decrement_tweet_count(sender, instance: Tweet, **kwargs) -> None:
+    """ツイート削除時に投稿者のツイート数を -1"""
+    User.objects.filter(pk=instance.author_id, tweet_count__gt=0).update(
+        tweet_count=F("tweet_count") - 1
+    )
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline(sender, instance: Follow, created: bool, **kwargs) -> None:
+    """フォロー時に最近のツイートをタイムラインへ配信"""
+    if created:
+        TimelineService.on_follow(instance.follower, instance.followee)
+
+
+@receiver(post_delete, sender=Follow)
+def remove_from_timeline(sender, instance: Follow, **kwargs) -> None:
+    """フォロー解除時にタイムラインからそのユーザーのツイートを削除"""
+    TimelineService.on_unfollow(instance.follower_id, instance.followee_id)
+
+
+@receiver(setting_changed)
+def reset_search_backend(sender, setting: str, **kwargs) -> None:
+    """TWEET_SEARCH_BACKEND の変更（override_settings など）を get_search_backend に反映"""
+    if setting == "TWEET_SEARCH_BACKEND":
+        get_search_backend.cache_clear()
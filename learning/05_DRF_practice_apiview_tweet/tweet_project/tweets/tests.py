@@ -1,3 +1,889 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import json
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import connection, connections
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from tweet_project.compression import CompressionMiddleware, brotli
+from tweet_project.db_routers import (
+    PrimaryReplicaRouter,
+    ReplicaStickinessMiddleware,
+    use_primary,
+)
+from tweet_project.log import QueuedStreamHandler, SamplingFilter
+from tweet_project.profiling import RequestProfilingMiddleware
+from tweet_project.renderers import FastJSONRenderer
+
+from .cache import TweetCache
+from .models import TimelineEntry, Tweet
+from .search import ORMSearchBackend, SQLiteFTS5SearchBackend, get_search_backend
+from .serializers import TweetReadSerializer, TweetSerializer
+
+User = get_user_model()
+
+
+class TweetListQueryCountTest(APITestCase):
+    """ツイート一覧のクエリ数がツイート件数に比例しないことを確認"""
+
+    def _create_tweets(self, count: int) -> None:
+        for i in range(count):
+            author = User.objects.create_user(
+                username=f"user{Tweet.objects.count()}_{i}",
+                password="password123",
+            )
+            Tweet.objects.create(author=author, content=f"tweet {i}")
+
+    def _count_list_queries(self) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("tweet-list-create"))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_constant(self):
+        self._create_tweets(2)
+        few = self._count_list_queries()
+
+        self._create_tweets(10)
+        many = self._count_list_queries()
+
+        self.assertEqual(few, many)
+
+
+class TweetListCursorPaginationTest(APITestCase):
+    """一覧のカーソルで前後に辿っても、同時刻のツイートが重複・欠落しないことを確認"""
+
+    def setUp(self):
+        author = User.objects.create_user(username="author", password="password123")
+        for i in range(3):
+            Tweet.objects.create(author=author, content=f"old {i}")
+        # ページ境界をまたいで created_at が同じツイートを並べる（DRF はオフセットで区別する）
+        same_time = timezone.now()
+        tweets = [Tweet.objects.create(author=author, content=f"tie {i}") for i in range(5)]
+        Tweet.objects.filter(pk__in=[t.pk for t in tweets]).update(created_at=same_time)
+        self.expected = list(
+            Tweet.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def _get(self, url: str) -> dict:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data: dict = response.json()
+        return data
+
+    def test_next_and_previous_across_equal_created_at(self):
+        pages = [self._get(reverse("tweet-list-create") + "?page_size=2")]
+        while pages[-1]["next"]:
+            pages.append(self._get(pages[-1]["next"]))
+
+        forward = [tweet["id"] for page in pages for tweet in page["results"]]
+        self.assertEqual(forward, self.expected)
+
+        # 最後のページから previous で先頭まで戻る
+        backward = []
+        page = pages[-1]
+        while page["previous"]:
+            page = self._get(page["previous"])
+            backward = [tweet["id"] for tweet in page["results"]] + backward
+        last_ids = [tweet["id"] for tweet in pages[-1]["results"]]
+        self.assertEqual(backward + last_ids, self.expected)
+
+
+class TweetReadSerializerTest(APITestCase):
+    """高速シリアライザが TweetSerializer と同じ JSON を出力することを確認"""
+
+    def test_output_matches_model_serializer(self):
+        author = User.objects.create_user(username="author", password="password123")
+        Tweet.objects.create(author=author, content="こんにちは")
+        Tweet.objects.create(author=author, content="hello")
+
+        expected = TweetSerializer(Tweet.objects.all(), many=True).data
+        rows = TweetReadSerializer.get_queryset(Tweet.objects.all())
+        actual = TweetReadSerializer.serialize_many(rows)
+
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(actual), renderer.render(expected))
+
+    def test_output_matches_in_non_utc_timezone(self):
+        author = User.objects.create_user(username="author", password="password123")
+        Tweet.objects.create(author=author, content="こんにちは")
+
+        with timezone.override("Asia/Tokyo"):
+            expected = TweetSerializer(Tweet.objects.all(), many=True).data
+            actual = TweetReadSerializer.serialize_many(
+                TweetReadSerializer.get_queryset(Tweet.objects.all())
+            )
+
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(actual), renderer.render(expected))
+        self.assertTrue(actual[0]["created_at"].endswith("+09:00"))
+
+    def test_instances_output_matches_model_serializer(self):
+        author = User.objects.create_user(username="author", password="password123")
+        Tweet.objects.create(author=author, content="こんにちは")
+
+        tweets = list(Tweet.objects.select_related("author"))
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(TweetReadSerializer.serialize_instances(tweets)),
+            renderer.render(TweetSerializer(tweets, many=True).data),
+        )
+
+
+class TweetCacheTest(APITestCase):
+    """一覧キャッシュのヒットと書き込み時の無効化を確認"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", password="password123")
+        # キャッシュの無効化はコミット後に行われる
+        with self.captureOnCommitCallbacks(execute=True):
+            Tweet.objects.create(author=self.author, content="first")
+
+    def test_second_read_hits_cache(self):
+        url = reverse("tweet-list-create")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_create_invalidates_list(self):
+        url = reverse("tweet-list-create")
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Tweet.objects.create(author=self.author, content="second")
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_invalidation_waits_for_commit(self):
+        url = reverse("tweet-list-create")
+        self.client.get(url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Tweet.objects.create(author=self.author, content="second")
+            # コミット前はキャッシュを消さない（コミット前の状態で作り直させない）
+            self.assertEqual(len(self.client.get(url).data["results"]), 1)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(self.client.get(url).data["results"]), 2)
+
+
+class TweetConditionalGetTest(APITestCase):
+    """ETag が一致すれば 304 を返し、更新後は 200 に戻ることを確認"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", password="password123")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tweet = Tweet.objects.create(author=self.author, content="first")
+
+    def test_list_not_modified(self):
+        url = reverse("tweet-list-create")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Tweet.objects.create(author=self.author, content="second")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_etag_differs_per_page(self):
+        url = reverse("tweet-list-create")
+        first = self.client.get(url, {"page_size": 1})["ETag"]
+
+        self.assertNotEqual(self.client.get(url, {"page_size": 2})["ETag"], first)
+        response = self.client.get(url, {"page_size": 2}, HTTP_IF_NONE_MATCH=first)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_etag_ignores_query_order(self):
+        url = reverse("tweet-list-create")
+        first = self.client.get(url + "?page_size=1&lang=ja")
+        second = self.client.get(url + "?lang=ja&page_size=1")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_detail_not_modified(self):
+        url = reverse("tweet-detail", args=[self.tweet.pk])
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class TweetBulkCreateTest(APITestCase):
+    """ツイート一括作成"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", password="password123")
+        self.client.force_authenticate(self.author)
+
+    def test_bulk_create(self):
+        payload = [{"content": f"tweet {i}"} for i in range(5)]
+        response = self.client.post(reverse("tweet-bulk-create"), payload, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(Tweet.objects.filter(author=self.author).count(), 5)
+
+    def test_invalid_item_rolls_back_and_reports_per_item_errors(self):
+        payload = [{"content": "ok"}, {"content": "x" * 281}]
+        response = self.client.post(reverse("tweet-bulk-create"), payload, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0], {})
+        self.assertIn("content", response.data["errors"][1])
+        self.assertEqual(len(response.json()["errors"]), 2)
+        self.assertFalse(Tweet.objects.exists())
+
+
+class TweetExportTest(APITestCase):
+    """エクスポートが JSON / NDJSON として正しく、iterator で少しずつ読み出すことを確認"""
+
+    def _create_tweets(self, count: int) -> None:
+        author = User.objects.create_user(username="author", password="password123")
+        for i in range(count):
+            Tweet.objects.create(author=author, content=f"tweet {i}")
+
+    def _export(self, output: str) -> tuple[str, list[bytes]]:
+        response = self.client.get(reverse("tweet-export"), {"output": output})
+        self.assertEqual(response.status_code, 200)
+        return response["Content-Type"], list(response.streaming_content)
+
+    def test_json_array(self):
+        self._create_tweets(5)
+        content_type, chunks = self._export("json")
+
+        self.assertEqual(content_type, "application/json")
+        tweets = json.loads(b"".join(chunks))
+        # Tweet.Meta.ordering の新しい順
+        self.assertEqual(
+            [tweet["content"] for tweet in tweets],
+            [f"tweet {i}" for i in range(4, -1, -1)],
+        )
+        self.assertEqual(set(tweets[0]), set(TweetSerializer.Meta.fields))
+
+    def test_ndjson(self):
+        self._create_tweets(5)
+        content_type, chunks = self._export("ndjson")
+
+        self.assertEqual(content_type, "application/x-ndjson")
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)["content"] for line in lines],
+            [f"tweet {i}" for i in range(4, -1, -1)],
+        )
+
+    def test_empty_table(self):
+        self.assertEqual(b"".join(self._export("json")[1]), b"[]")
+        self.assertEqual(b"".join(self._export("ndjson")[1]), b"")
+
+    def test_invalid_output(self):
+        response = self.client.get(reverse("tweet-export"), {"output": "csv"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_reads_rows_in_chunks_with_one_query(self):
+        self._create_tweets(5)
+        with mock.patch("tweets.views.TweetExportView.chunk_size", 2):
+            with CaptureQueriesContext(connection) as ctx:
+                content_type, chunks = self._export("json")
+
+        # "[" + 2件ずつ3回 + "]"。件数が増えてもクエリは1回（全件を一度に読み込まない）
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(len(json.loads(b"".join(chunks))), 5)
+        tweet_queries = [q for q in ctx.captured_queries if "tweets_tweet" in q["sql"]]
+        self.assertEqual(len(tweet_queries), 1)
+
+
+class TweetSearchTest(APITestCase):
+    """全文検索インデックスがシグナルで同期されることを確認"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", password="password123")
+        self.sunny = Tweet.objects.create(author=self.author, content="今日はいい天気です")
+        Tweet.objects.create(author=self.author, content="明日は雨の予報")
+
+    def _search(self, query: str) -> list[int]:
+        response = self.client.get(reverse("tweet-search"), {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [tweet["id"] for tweet in response.data["results"]]
+
+    def test_search(self):
+        self.assertEqual(self._search("いい天気"), [self.sunny.pk])
+
+    def test_index_follows_update_and_delete(self):
+        self.sunny.content = "今日は曇りです"
+        self.sunny.save()
+        self.assertEqual(self._search("いい天気"), [])
+        self.assertEqual(self._search("曇りです"), [self.sunny.pk])
+
+        self.sunny.delete()
+        self.assertEqual(self._search("曇りです"), [])
+
+    def test_backend_follows_setting_override(self):
+        with override_settings(TWEET_SEARCH_BACKEND="tweets.search.ORMSearchBackend"):
+            self.assertIsInstance(get_search_backend(), ORMSearchBackend)
+            self.assertEqual(self._search("いい天気"), [self.sunny.pk])
+        self.assertIsInstance(get_search_backend(), SQLiteFTS5SearchBackend)
+
+
+class TimelineTest(APITestCase):
+    """フォロー中ユーザーのツイートがホームタイムラインに載ることを確認"""
+
+    def setUp(self):
+        self.reader = User.objects.create_user(username="reader", password="password123")
+        self.author = User.objects.create_user(username="author", password="password123")
+        self.stranger = User.objects.create_user(username="stranger", password="password123")
+        self.client.force_authenticate(self.reader)
+
+    def _timeline(self) -> list[str]:
+        response = self.client.get(reverse("tweet-timeline"))
+        self.assertEqual(response.status_code, 200)
+        return [tweet["content"] for tweet in response.data["results"]]
+
+    def test_fan_out_on_write(self):
+        Tweet.objects.create(author=self.author, content="before follow")
+        self.client.post(reverse("user-follow", args=[self.author.pk]))
+        Tweet.objects.create(author=self.author, content="after follow")
+        Tweet.objects.create(author=self.stranger, content="not followed")
+
+        self.assertEqual(self._timeline(), ["after follow", "before follow"])
+
+        self.client.delete(reverse("user-follow", args=[self.author.pk]))
+        self.assertEqual(self._timeline(), [])
+
+    @override_settings(TIMELINE={"FANOUT_MAX_FOLLOWERS": 0})
+    def test_large_account_is_merged_on_read(self):
+        self.client.post(reverse("user-follow", args=[self.author.pk]))
+        self.author.refresh_from_db()
+        self.assertTrue(self.author.fanout_on_read)
+
+        Tweet.objects.create(author=self.reader, content="own tweet")
+        Tweet.objects.create(author=self.author, content="large account")
+
+        self.assertEqual(self._timeline(), ["large account", "own tweet"])
+
+    @override_settings(TIMELINE={"FANOUT_MAX_FOLLOWERS": 0})
+    def test_unfollow_large_account(self):
+        self.client.post(reverse("user-follow", args=[self.author.pk]))
+        Tweet.objects.create(author=self.author, content="large account")
+        self.assertEqual(self._timeline(), ["large account"])
+
+        # 配信していないので削除するエントリはなく、読み取り時の合流からも外れる
+        self.client.delete(reverse("user-follow", args=[self.author.pk]))
+        self.assertEqual(self._timeline(), [])
+
+    @override_settings(TIMELINE={"MAX_LENGTH": 2})
+    def test_trim_timelines_command(self):
+        self.client.post(reverse("user-follow", args=[self.author.pk]))
+        for i in range(4):
+            Tweet.objects.create(author=self.author, content=f"tweet {i}")
+
+        out = io.StringIO()
+        call_command("trim_timelines", stdout=out)
+
+        # 投稿者本人と reader のタイムラインからそれぞれ古い2件を削除する
+        self.assertIn("4 件", out.getvalue())
+        for owner in (self.reader, self.author):
+            contents = TimelineEntry.objects.filter(owner=owner).order_by(
+                "-created_at", "-tweet_id"
+            ).values_list("tweet__content", flat=True)
+            self.assertEqual(list(contents), ["tweet 3", "tweet 2"])
+        self.assertEqual(self._timeline(), ["tweet 3", "tweet 2"])
+
+    def test_invalid_page_size_falls_back_to_default(self):
+        for i in range(3):
+            Tweet.objects.create(author=self.reader, content=f"tweet {i}")
+
+        for page_size in ("0", "-1", "abc"):
+            with self.subTest(page_size=page_size):
+                response = self.client.get(
+                    reverse("tweet-timeline"), {"page_size": page_size}
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data["results"]), 3)
+                self.assertIsNone(response.data["next"])
+
+
+class TweetCountTest(APITestCase):
+    """投稿者のツイート数カウンタが作成・削除で増減することを確認"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", password="password123")
+
+    def _tweet_count(self) -> int:
+        response = self.client.get(reverse("user-detail", args=[self.author.pk]))
+        count: int = response.data["tweet_count"]
+        return count
+
+    def test_counter_follows_create_and_delete(self):
+        tweet = Tweet.objects.create(author=self.author, content="first")
+        Tweet.objects.create(author=self.author, content="second")
+        self.assertEqual(self._tweet_count(), 2)
+
+        tweet.delete()
+        self.assertEqual(self._tweet_count(), 1)
+
+    def test_bulk_create_updates_counter(self):
+        self.client.force_authenticate(self.author)
+        payload = [{"content": f"tweet {i}"} for i in range(3)]
+        self.client.post(reverse("tweet-bulk-create"), payload, format="json")
+        self.assertEqual(self._tweet_count(), 3)
+
+    def test_reconcile_repairs_drifted_counter(self):
+        other = User.objects.create_user(username="other", password="password123")
+        Tweet.objects.create(author=self.author, content="first")
+        Tweet.objects.create(author=self.author, content="second")
+        # シグナルを経由しない更新でカウンタがずれた状態にする
+        User.objects.filter(pk=self.author.pk).update(tweet_count=7)
+        User.objects.filter(pk=other.pk).update(tweet_count=3)
+
+        out = io.StringIO()
+        call_command("reconcile_tweet_counts", "--dry-run", stdout=out)
+        self.assertIn("2 件がずれています", out.getvalue())
+        self.assertEqual(self._tweet_count(), 7)
+
+        out = io.StringIO()
+        # バッチの境界をまたいでも補正できる
+        call_command("reconcile_tweet_counts", "--batch-size", "1", stdout=out)
+        self.assertIn("2 件を補正しました", out.getvalue())
+        self.assertEqual(self._tweet_count(), 2)
+        other.refresh_from_db()
+        self.assertEqual(other.tweet_count, 0)
+
+
+class SQLiteSettingsTest(SimpleTestCase):
+    """DATABASES の init_command が実際の接続に効いていることを確認"""
+
+    def test_connection_uses_wal(self):
+        # テスト用 DB はインメモリ（journal_mode=memory）のため、同じ設定でファイルの DB に接続する
+        with tempfile.TemporaryDirectory() as tmp:
+            default = connections["default"]
+            settings_dict = {**default.settings_dict, "NAME": str(Path(tmp) / "wal.sqlite3")}
+            wal_connection = default.__class__(settings_dict, alias="wal_check")
+            try:
+                with wal_connection.cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode")
+                    self.assertEqual(cursor.fetchone()[0], "wal")
+                    cursor.execute("PRAGMA synchronous")
+                    # 1 = NORMAL
+                    self.assertEqual(cursor.fetchone()[0], 1)
+            finally:
+                wal_connection.close()
+
+
+@override_settings(DATABASE_REPLICAS=["replica1", "replica2"], REPLICA_READ_APPS=["tweets"])
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    """ツイートの読み取りがレプリカへ振り分けられることを確認"""
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_go_to_replicas_round_robin(self):
+        chosen = {self.router.db_for_read(Tweet) for _ in range(4)}
+        self.assertEqual(chosen, {"replica1", "replica2"})
+
+    def test_writes_and_pinned_reads_go_to_primary(self):
+        self.assertEqual(self.router.db_for_write(Tweet), "default")
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(Tweet), "default")
+
+    def test_other_apps_read_from_primary(self):
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica1"],
+    REPLICA_READ_APPS=["tweets"],
+    REPLICA_STICKY_CACHE_ALIAS="sticky",
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "sticky": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+)
+class ReplicaStickinessMiddlewareTest(SimpleTestCase):
+    """書き込み中と書き込み直後の同じクライアントの読み取りがプライマリへ行くことを確認"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+        self.status_code = 200
+        self.middleware = ReplicaStickinessMiddleware(self._get_response)
+        caches["sticky"].clear()
+
+    def _get_response(self, request):
+        # ビューの中でツイートを読んだときの振り分け先を記録する
+        request.read_db = self.router.db_for_read(Tweet)
+        return HttpResponse(status=self.status_code)
+
+    def _read_db(self, method: str, token: str | None) -> str:
+        headers = {"HTTP_AUTHORIZATION": f"Token {token}"} if token else {}
+        request = self.factory.generic(method, "/", REMOTE_ADDR="203.0.113.1", **headers)
+        self.middleware(request)
+        read_db: str = request.read_db
+        return read_db
+
+    def test_write_request_reads_from_primary(self):
+        self.assertEqual(self._read_db("POST", "alice"), "default")
+
+    def test_reads_after_write_stick_to_primary(self):
+        self.assertEqual(self._read_db("GET", "alice"), "replica1")
+        self._read_db("POST", "alice")
+
+        self.assertEqual(self._read_db("GET", "alice"), "default")
+        # 他のクライアントはレプリカのまま
+        self.assertEqual(self._read_db("GET", "bob"), "replica1")
+
+    def test_anonymous_clients_do_not_stick(self):
+        # 同じ IP アドレス（NAT・プロキシの裏）の匿名クライアントをまとめて固定しない
+        self.assertEqual(self._read_db("POST", None), "default")
+        with mock.patch.object(ReplicaStickinessMiddleware, "_get_cache") as get_cache:
+            self.assertEqual(self._read_db("GET", None), "replica1")
+        get_cache.return_value.get.assert_not_called()
+
+    async def test_async_requests_stick_to_primary(self):
+        async def get_response(request):
+            # 非同期のコードと sync_to_async の中の ORM の両方で振り分け先を確認する
+            request.read_db = self.router.db_for_read(Tweet)
+            request.sync_read_db = await sync_to_async(self.router.db_for_read)(Tweet)
+            return HttpResponse(status=self.status_code)
+
+        middleware = ReplicaStickinessMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+
+        async def read_dbs(method: str) -> tuple[str, str]:
+            request = self.factory.generic(method, "/", HTTP_AUTHORIZATION="Token alice")
+            await middleware(request)
+            return request.read_db, request.sync_read_db
+
+        self.assertEqual(await read_dbs("GET"), ("replica1", "replica1"))
+        self.assertEqual(await read_dbs("POST"), ("default", "default"))
+        self.assertEqual(await read_dbs("GET"), ("default", "default"))
+
+    def test_failed_write_does_not_stick(self):
+        self.status_code = 400
+        self._read_db("POST", "alice")
+        self.assertEqual(self._read_db("GET", "alice"), "replica1")
+
+    def test_cache_fill_reads_from_primary(self):
+        TweetCache.get_or_set(
+            "tweets:test", lambda: self.router.db_for_read(Tweet)
+        )
+        self.assertEqual(TweetCache.get_cache().get("tweets:test"), "default")
+
+
+class AsyncTweetListTest(APITestCase):
+    """非同期一覧のカーソルが前後どちらにも辿れることを確認"""
+
+    def setUp(self):
+        author = User.objects.create_user(username="author", password="password123")
+        for i in range(5):
+            Tweet.objects.create(author=author, content=f"tweet {i}")
+
+    def _get(self, url: str, **params) -> dict:
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        data: dict = response.json()
+        return data
+
+    def _contents(self, page: dict) -> list[str]:
+        return [tweet["content"] for tweet in page["results"]]
+
+    def test_next_and_previous(self):
+        first = self._get(reverse("tweet-list-async"), page_size=2)
+        self.assertEqual(self._contents(first), ["tweet 4", "tweet 3"])
+        self.assertIsNone(first["previous"])
+
+        second = self._get(first["next"])
+        self.assertEqual(self._contents(second), ["tweet 2", "tweet 1"])
+
+        back = self._get(second["previous"])
+        self.assertEqual(self._contents(back), ["tweet 4", "tweet 3"])
+        self.assertIsNone(back["previous"])
+        self.assertEqual(self._contents(self._get(back["next"])), ["tweet 2", "tweet 1"])
+
+    def test_invalid_page_size_falls_back_to_default(self):
+        for page_size in ("0", "-1", "abc"):
+            with self.subTest(page_size=page_size):
+                page = self._get(reverse("tweet-list-async"), page_size=page_size)
+                self.assertEqual(len(page["results"]), 5)
+                self.assertIsNone(page["next"])
+
+
+class LoggingSamplingTest(SimpleTestCase):
+    """設定の SamplingFilter がツイートの INFO ログだけを間引くことを確認"""
+
+    def setUp(self):
+        self.sampling = next(
+            f
+            for handler in logging.getLogger().handlers
+            for f in handler.filters
+            if isinstance(f, SamplingFilter)
+        )
+
+    def _kept(self, name: str, level: int, random_value: float) -> bool:
+        record = logging.LogRecord(name, level, __file__, 0, "message", None, None)
+        with mock.patch("tweet_project.log.random.random", return_value=random_value):
+            kept: bool = self.sampling.filter(record)
+        return kept
+
+    def test_tweet_info_logs_are_sampled(self):
+        self.assertFalse(self._kept("tweets.views", logging.INFO, 0.5))
+        self.assertTrue(self._kept("tweets.views", logging.INFO, 0.05))
+
+    def test_warnings_and_other_loggers_are_kept(self):
+        self.assertTrue(self._kept("tweets.views", logging.WARNING, 0.99))
+        self.assertTrue(self._kept("user.views", logging.INFO, 0.99))
+        # 前方一致はロガー名の区切り（.）単位
+        self.assertTrue(self._kept("tweetsfoo", logging.INFO, 0.99))
+
+    def test_sampled_out_records_are_not_prepared(self):
+        prepare = QueuedStreamHandler.prepare
+        logger = logging.getLogger("tweets.tests.sampled")
+        with mock.patch.object(
+            QueuedStreamHandler, "prepare", autospec=True, side_effect=prepare
+        ) as mocked:
+            with mock.patch("tweet_project.log.random.random", return_value=0.99):
+                logger.info("dropped %s", "record")
+            mocked.assert_not_called()
+            with mock.patch("tweet_project.log.random.random", return_value=0.01):
+                logger.info("kept %s", "record")
+            mocked.assert_called_once()
+
+
+class QueuedStreamHandlerTest(SimpleTestCase):
+    """キューが満杯でもハンドラーを閉じられ、キューに入ったログが書き出されることを確認"""
+
+    def test_close_with_full_queue_flushes_queued_records(self):
+        writing = threading.Event()
+        gate = threading.Event()
+
+        class BlockedStream(io.StringIO):
+            # 出力先が詰まっている状態を模す
+            def write(self, text):
+                writing.set()
+                gate.wait()
+                return super().write(text)
+
+        stream = BlockedStream()
+        handler = QueuedStreamHandler(stream, queue_size=2)
+        logger = logging.getLogger("tweets.tests.queued")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            # 1件目の書き込みでリスナーが止まってから、残りでキューを満杯にする
+            logger.warning("record 0")
+            self.assertTrue(writing.wait(5))
+            for i in range(1, 10):
+                logger.warning("record %d", i)
+            self.assertEqual(handler.dropped, 7)
+
+            # 閉じる時点ではキューは満杯のまま。少し後に出力先の詰まりを解消する
+            threading.Timer(0.1, gate.set).start()
+            handler.close()
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+            gate.set()
+
+        self.assertEqual(
+            stream.getvalue().splitlines(), ["record 0", "record 1", "record 2"]
+        )
+
+    def test_close_with_full_queue_after_listener_stopped(self):
+        handler = QueuedStreamHandler(io.StringIO(), queue_size=2)
+        handler.listener.stop_timeout = 0.05
+        # リスナースレッドが先に終わり、キューが満杯のまま残った状態
+        handler.queue.put_nowait(None)
+        handler.listener._thread.join(5)
+        for i in range(2):
+            handler.queue.put_nowait(logging.makeLogRecord({"msg": f"record {i}"}))
+
+        closer = threading.Thread(target=handler.close, daemon=True)
+        closer.start()
+        closer.join(5)
+        self.assertFalse(closer.is_alive())
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    """orjson の有無で同じ JSON を出力することを確認"""
+
+    data = {"message": "入力内容に誤りがあります。", "errors": {1: {"content": ["長すぎます"]}}}
+
+    def test_non_str_keys_are_rendered_as_strings(self):
+        rendered = FastJSONRenderer().render(self.data)
+        self.assertEqual(json.loads(rendered)["errors"], {"1": {"content": ["長すぎます"]}})
+
+    def test_output_matches_without_orjson(self):
+        expected = FastJSONRenderer().render(self.data)
+        with mock.patch("tweet_project.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.data), expected)
+
+
+@override_settings(RESPONSE_COMPRESSION={"MIN_SIZE": 200, "PATH_PREFIXES": ["/api/v1/tweets/"]})
+class CompressionMiddlewareTest(APITestCase):
+    """一覧のレスポンスが Accept-Encoding に応じて圧縮されることを確認"""
+
+    def setUp(self):
+        author = User.objects.create_user(username="author", password="password123")
+        for i in range(10):
+            Tweet.objects.create(author=author, content=f"tweet {i}")
+
+    def _get(self, accept_encoding: str):
+        return self.client.get(
+            reverse("tweet-list-create"), HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+
+    def test_gzip_without_brotli(self):
+        plain = self._get("")
+        with mock.patch("tweet_project.compression.brotli", None):
+            response = self._get("gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        # SessionMiddleware の Vary と両方が付く
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertIn("Cookie", response["Vary"])
+        self.assertFalse(plain.has_header("Content-Encoding"))
+
+    @skipUnless(brotli, "brotli がインストールされていない")
+    def test_brotli(self):
+        plain = self._get("")
+        response = self._get("gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+
+    def _export(self, accept_encoding: str):
+        response = self.client.get(
+            reverse("tweet-export"), {"output": "ndjson"}, HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+        return response, b"".join(response.streaming_content)
+
+    @skipUnless(brotli, "brotli がインストールされていない")
+    def test_streaming_brotli(self):
+        _, plain = self._export("")
+        response, body = self._export("gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(body), plain)
+
+    def test_streaming_gzip_without_brotli(self):
+        _, plain = self._export("")
+        with mock.patch("tweet_project.compression.brotli", None):
+            response, body = self._export("gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), plain)
+
+    async def test_async_streaming(self):
+        async def chunks():
+            for i in range(3):
+                yield f"chunk {i}\n" * 100
+
+        async def get_response(request):
+            return StreamingHttpResponse(chunks())
+
+        middleware = CompressionMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+
+        request = RequestFactory().get(reverse("tweet-export"), HTTP_ACCEPT_ENCODING="gzip")
+        with mock.patch("tweet_project.compression.brotli", None):
+            response = await middleware(request)
+            body = b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        expected = "".join(f"chunk {i}\n" * 100 for i in range(3)).encode()
+        self.assertEqual(gzip.decompress(body), expected)
+
+    def test_asgi_chain_is_not_adapted_to_sync(self):
+        # 同期専用のミドルウェアがあると、非同期との切り替えを DEBUG ログに出す（DEBUG=True のときだけ）
+        with self.settings(DEBUG=True), self.assertLogs("django.request", "DEBUG") as logs:
+            logging.getLogger("django.request").debug("loading middleware")
+            ASGIHandler()
+        self.assertFalse([line for line in logs.output if "adapted" in line], logs.output)
+
+
+@override_settings(REQUEST_PROFILING={"ENABLED": True, "SAMPLE_RATE": 0.0})
+class RequestProfilingMiddlewareTest(APITestCase):
+    """WSGI・ASGI のどちらでも Server-Timing に SQL の件数が載ることを確認"""
+
+    server_timing_db = r'db;dur=[\d.]+;desc="[1-9]\d* queries"'
+
+    def setUp(self):
+        author = User.objects.create_user(username="author", password="password123")
+        with self.captureOnCommitCallbacks(execute=True):
+            Tweet.objects.create(author=author, content="tweet")
+
+    def test_follows_get_response_mode(self):
+        async def async_get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(RequestProfilingMiddleware(async_get_response)))
+        self.assertFalse(
+            iscoroutinefunction(RequestProfilingMiddleware(lambda request: HttpResponse()))
+        )
+
+    def test_server_timing_on_sync_request(self):
+        response = self.client.get(reverse("tweet-list-create"))
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], self.server_timing_db)
+
+    async def test_server_timing_on_async_request(self):
+        # 内側が同期専用のミドルウェアだと同期に切り替わるため、非同期対応のものだけで組む
+        middleware = [
+            "tweet_project.profiling.RequestProfilingMiddleware",
+            "django.middleware.common.CommonMiddleware",
+        ]
+        acall = RequestProfilingMiddleware.__acall__
+        paths = []
+
+        async def spy(middleware, request):
+            paths.append(request.path)
+            return await acall(middleware, request)
+
+        with self.settings(MIDDLEWARE=middleware), mock.patch.object(
+            RequestProfilingMiddleware, "__acall__", spy
+        ):
+            response = await self.async_client.get(reverse("tweet-list-async"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(paths, [reverse("tweet-list-async")])
+        self.assertRegex(response["Server-Timing"], self.server_timing_db)
+
+    async def test_concurrent_async_requests_count_own_queries(self):
+        # 2つのリクエストの SQL が同じスレッド・同じ接続で交互に実行される
+        barrier = asyncio.Barrier(2)
+
+        async def get_response(request):
+            await barrier.wait()
+            for _ in range(int(request.GET["n"])):
+                await Tweet.objects.acount()
+                await asyncio.sleep(0)
+            await barrier.wait()
+            return HttpResponse()
+
+        middleware = RequestProfilingMiddleware(get_response)
+        factory = RequestFactory()
+        one, three = await asyncio.gather(
+            middleware(factory.get("/", {"n": 1})),
+            middleware(factory.get("/", {"n": 3})),
+        )
+        self.assertIn('desc="1 queries"', one["Server-Timing"])
+        self.assertIn('desc="3 queries"', three["Server-Timing"])
@@ -0,0 +1,164 @@
+import heapq
+from datetime import datetime
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q, QuerySet
+
+from .models import TimelineEntry, Tweet
+from .pagination import keyset_filter
+
+User = get_user_model()
+
+
+class TimelineService:
+    """
+    ホームタイムライン（fan-out-on-write）
+
+    - 書き込み時: ツイートを投稿者本人とフォロワー全員の TimelineEntry に配信する
+    - フォロワーが多いユーザー（fanout_on_read=True）は配信せず、読み取り時に
+      そのユーザーのツイートを直接取得して合流する
+    - 読み取り時: (owner, created_at, tweet) の索引で1ページ分だけ取得する
+    """
+
+    @classmethod
+    def get_settings(cls) -> dict[str, int]:
+        return {
+            # これを超えるフォロワーを持つユーザーは fanout_on_read に切り替える
+            "FANOUT_MAX_FOLLOWERS": 10000,
+            # フォロー時に遡って配信するツイート数
+            "BACKFILL_SIZE": 100,
+            # 1ユーザーのタイムラインに保持する最大件数（trim_timelines で削る）
+            "MAX_LENGTH": 800,
+            "BATCH_SIZE": 1000,
+            **getattr(settings, "TIMELINE", {}),
+        }
+
+    # ---- 書き込み ----
+
+    @classmethod
+    def fan_out(cls, tweet: Tweet) -> None:
+        cls.fan_out_many([tweet])
+
+    @classmethod
+    def fan_out_many(cls, tweets: Iterable[Tweet]) -> None:
+        """ツイートを投稿者本人とフォロワーのタイムラインへ配信する"""
+        config = cls.get_settings()
+        tweets_by_author: dict[int, list[Tweet]] = {}
+        for tweet in tweets:
+            tweets_by_author.setdefault(tweet.author_id, []).append(tweet)
+
+        for author_id, author_tweets in tweets_by_author.items():
+            owner_ids = [author_id]
+            if not User.objects.filter(pk=author_id, fanout_on_read=True).exists():
+                owner_ids += list(
+                    User.objects.filter(following=author_id).values_list("id", flat=True)
+                )
+
+            entries = [
+                TimelineEntry(
+                    owner_id=owner_id, tweet_id=tweet.pk, created_at=tweet.created_at
+                )
+                for tweet in author_tweets
+                for owner_id in owner_ids
+            ]
+            TimelineEntry.objects.bulk_create(
+                entries, batch_size=config["BATCH_SIZE"], ignore_conflicts=True
+            )
+
+    @classmethod
+    def on_follow(cls, follower: Any, followee: Any) -> None:
+        """フォロー時: 最近のツイートを遡って配信し、フォロワー数の上限を確認する"""
+        config = cls.get_settings()
+
+        if (
+            not followee.fanout_on_read
+            and followee.followers.count() > config["FANOUT_MAX_FOLLOWERS"]
+        ):
+            User.objects.filter(pk=followee.pk).update(fanout_on_read=True)
+            followee.fanout_on_read = True
+
+        if followee.fanout_on_read:
+            return
+
+        recent = Tweet.objects.filter(author=followee).only("id", "created_at")[
+            : config["BACKFILL_SIZE"]
+        ]
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(owner=follower, tweet=tweet, created_at=tweet.created_at)
+                for tweet in recent
+            ],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def on_unfollow(cls, follower: Any, followee: Any) -> None:
+        TimelineEntry.objects.filter(owner=follower, tweet__author=followee).delete()
+
+    @classmethod
+    def trim(cls, owner_id: int) -> int:
+        """タイムラインを MAX_LENGTH 件に切り詰め、削除件数を返す"""
+        max_length = cls.get_settings()["MAX_LENGTH"]
+        boundary = list(
+            TimelineEntry.objects.filter(owner_id=owner_id)
+            .order_by("-created_at", "-tweet_id")
+            .values_list("created_at", "tweet_id")[max_length : max_length + 1]
+        )
+        if not boundary:
+            return 0
+        created_at, tweet_id = boundary[0]
+        deleted: int
+        deleted, _ = TimelineEntry.objects.filter(
+            _before(created_at, tweet_id, field="tweet_id")
+            | Q(created_at=created_at, tweet_id=tweet_id),
+            owner_id=owner_id,
+        ).delete()
+        return deleted
+
+    # ---- 読み取り ----
+
+    @classmethod
+    def get_page(
+        cls,
+        user: Any,
+        page_size: int,
+        cursor: tuple[datetime, int] | None = None,
+    ) -> list[tuple[datetime, int]]:
+        """
+        タイムラインの1ページ分の (created_at, tweet_id) を新しい順に返す
+
+        配信済みのエントリと、fanout_on_read ユーザーのツイートをマージする。
+        """
+        entries = TimelineEntry.objects.filter(owner=user).order_by(
+            "-created_at", "-tweet_id"
+        )
+        if cursor:
+            entries = entries.filter(_before(*cursor, field="tweet_id"))
+        streams = [list(entries.values_list("created_at", "tweet_id")[:page_size])]
+
+        read_time_authors = User.objects.filter(
+            followers=user, fanout_on_read=True
+        ).values_list("id", flat=True)
+        pulled: QuerySet = Tweet.objects.filter(author__in=read_time_authors).order_by(
+            "-created_at", "-id"
+        )
+        if cursor:
+            pulled = pulled.filter(_before(*cursor, field="id"))
+        streams.append(list(pulled.values_list("created_at", "id")[:page_size]))
+
+        merged = heapq.merge(*streams, reverse=True)
+        page: list[tuple[datetime, int]] = []
+        for item in merged:
+            if page and page[-1] == item:
+                continue
+            page.append(item)
+            if len(page) >= page_size:
+                break
+        return page
+
+
+def _before(created_at: datetime, pk: int, field: str) -> Q:
+    """(created_at, pk) より古い行の条件（キーセットページネーション用）"""
+    return keyset_filter(created_at, pk, field=field)
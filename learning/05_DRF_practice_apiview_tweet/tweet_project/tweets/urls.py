@@ -4,5 +4,15 @@ from . import views
 
 urlpatterns = [
     path("", views.TweetListCreateView.as_view(), name="tweet-list-create"),
-    # path("<int:pk>/", views.TweetDetailView.as_view(), name="tweet-detail"),
+    path("bulk/", views.TweetBulkCreateView.as_view(), name="tweet-bulk-create"),
+    path("timeline/", views.TimelineView.as_view(), name="tweet-timeline"),
+    path("search/", views.TweetSearchView.as_view(), name="tweet-search"),
+    path("export/", views.TweetExportView.as_view(), name="tweet-export"),
+    path("<int:pk>/", views.TweetDetailView.as_view(), name="tweet-detail"),
+    path("async/", views.AsyncTweetListView.as_view(), name="tweet-list-async"),
+    path(
+        "async/<int:pk>/",
+        views.AsyncTweetDetailView.as_view(),
+        name="tweet-detail-async",
+    ),
 ]
@@ -1,24 +1,414 @@
+import json
 import logging
+from typing import Any, Iterable, Iterator
 
-from rest_framework import status
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import condition
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from tweet_project.profiling import profile_section
 
+from .cache import TweetCache
+from .conditions import (
+    tweet_detail_etag,
+    tweet_detail_last_modified,
+    tweet_list_etag,
+)
 from .models import Tweet
-from .serializers import TweetSerializer
+from .pagination import (
+    TweetCursorPagination,
+    decode_keyset_cursor,
+    decode_keyset_cursor_with_direction,
+    encode_keyset_cursor,
+    keyset_filter,
+    parse_page_size,
+)
+from .search import SearchResults
+from .serializers import TweetCreateSerializer, TweetReadSerializer, TweetSerializer
+from .timeline import TimelineService
 
 # Create your views here.
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _iter_json_array(rows: Iterable[dict[str, Any]], chunk_size: int) -> Iterator[str]:
+    """行を JSON 配列として chunk_size 件ずつ書き出す"""
+    yield "["
+    format_datetime = TweetReadSerializer.datetime_formatter()
+    buffer: list[str] = []
+    first = True
+    for row in rows:
+        buffer.append(_dumps(TweetReadSerializer.to_representation(row, format_datetime)))
+        if len(buffer) >= chunk_size:
+            yield ("" if first else ",") + ",".join(buffer)
+            buffer.clear()
+            first = False
+    if buffer:
+        yield ("" if first else ",") + ",".join(buffer)
+    yield "]"
+
+
+def _iter_ndjson(rows: Iterable[dict[str, Any]], chunk_size: int) -> Iterator[str]:
+    """行を NDJSON（1行1オブジェクト）として chunk_size 件ずつ書き出す"""
+    format_datetime = TweetReadSerializer.datetime_formatter()
+    buffer: list[str] = []
+    for row in rows:
+        buffer.append(
+            _dumps(TweetReadSerializer.to_representation(row, format_datetime)) + "\n"
+        )
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+    if buffer:
+        yield "".join(buffer)
+
+
+def _errors_by_item(errors: Any, count: int) -> Any:
+    """
+    ListSerializer のエラーを入力と同じ順序の配列にそろえる
+
+    DRF 3.15 以降は失敗した要素だけを {index: errors} の dict で返すため、
+    成功した要素は {} として埋める（要素以外のエラーはそのまま返す）。
+    """
+    if isinstance(errors, dict) and all(isinstance(key, int) for key in errors):
+        return [errors.get(index, {}) for index in range(count)]
+    return errors
+
+
 class TweetListCreateView(APIView):
+    pagination_class = TweetCursorPagination
+
+    @method_decorator(condition(etag_func=tweet_list_etag))
     def get(self, request: Request) -> Response:
-        tweets = Tweet.objects.all()
-        serializer = TweetSerializer(tweets, many=True)
+        data = TweetCache.get_or_set(
+            TweetCache.list_key(request.build_absolute_uri()),
+            lambda: self._build_page(request),
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    def _build_page(self, request: Request) -> dict[str, Any]:
+        tweets = TweetReadSerializer.get_queryset(Tweet.objects.all())
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(tweets, request, view=self)
+        with profile_section("serialize"):
+            data = TweetReadSerializer.serialize_many(page)
+
+        logger.debug("Tweet list page built: %d tweets", len(page))
+
+        return dict(paginator.get_paginated_response(data).data)
+
+
+class TweetDetailView(APIView):
+    """ツイート詳細"""
+
+    @method_decorator(
+        condition(
+            etag_func=tweet_detail_etag,
+            last_modified_func=tweet_detail_last_modified,
+        )
+    )
+    def get(self, request: Request, pk: int) -> Response:
+        try:
+            data = TweetCache.get_or_set(
+                TweetCache.detail_key(pk),
+                lambda: self._build_detail(pk),
+            )
+        except Tweet.DoesNotExist:
+            return Response(
+                {"error": "ツイートが見つかりません"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(data, status=status.HTTP_200_OK)
+
+    def _build_detail(self, pk: int) -> dict[str, Any]:
+        tweet = TweetSerializer.setup_eager_loading(Tweet.objects.all()).get(pk=pk)
+        with profile_section("serialize"):
+            return dict(TweetSerializer(tweet).data)
+
+
+class TweetBulkCreateView(APIView):
+    """ツイート一括作成API"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        """
+        ツイート一括作成
+
+        Request Body:
+            - ツイートの配列: [{"content": "..."}, ...]
+
+        Returns:
+            201: 作成成功（作成したツイート一覧）
+            400: バリデーションエラー（errors は入力と同じ順序の配列）
+        """
+        max_items = getattr(settings, "TWEET_BULK_CREATE_MAX_ITEMS", 1000)
+        if not isinstance(request.data, list) or not request.data:
+            return Response(
+                {"message": "ツイートの配列を指定してください。"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(request.data) > max_items:
+            return Response(
+                {"message": f"一度に作成できるツイートは{max_items}件までです。"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = TweetCreateSerializer(
+            data=request.data, many=True, context={"request": request}
+        )
+
+        if not serializer.is_valid():
+            errors = _errors_by_item(serializer.errors, len(request.data))
+            logger.warning("Tweet bulk create failed: %s", errors)
+            return Response(
+                {"message": "入力内容に誤りがあります。", "errors": errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        tweets = serializer.save()
+        logger.info(
+            "Tweets bulk created: %s by %s", len(tweets), request.user.username
+        )
+
+        return Response(
+            {
+                "count": len(tweets),
+                "results": TweetReadSerializer.serialize_instances(tweets),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class TimelineView(APIView):
+    """
+    ホームタイムライン（自分とフォロー中ユーザーのツイート）
+
+    Query Params:
+        - cursor: 前ページの next に含まれるカーソル
+        - page_size: 1ページの件数（最大 TweetCursorPagination.max_page_size）
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        page_size = parse_page_size(request.query_params.get("page_size"))
+
+        cursor = None
+        if request.query_params.get("cursor"):
+            try:
+                cursor = decode_keyset_cursor(request.query_params["cursor"])
+            except ValueError:
+                return Response(
+                    {"error": "カーソルが不正です"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        page = TimelineService.get_page(request.user, page_size, cursor)
+
+        ids = [tweet_id for _, tweet_id in page]
+        rows = TweetReadSerializer.get_queryset(Tweet.objects.filter(id__in=ids))
+        rows_by_id = {row["id"]: row for row in rows}
+
+        next_url = None
+        if len(page) == page_size:
+            query = request.query_params.copy()
+            query["cursor"] = encode_keyset_cursor(*page[-1])
+            next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+
+        return Response(
+            {
+                "next": next_url,
+                "results": TweetReadSerializer.serialize_many(
+                    rows_by_id[pk] for pk in ids if pk in rows_by_id
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class TweetSearchPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
+
+
+class TweetSearchView(APIView):
+    """
+    ツイート全文検索（関連度順）
+
+    Query Params:
+        - q: 検索語（空白区切りで AND 検索）
+        - limit / offset: ページネーション
+    """
+
+    pagination_class = TweetSearchPagination
+
+    def get(self, request: Request) -> Response:
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": "検索語（q）を指定してください"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        paginator = self.pagination_class()
+        ids = paginator.paginate_queryset(SearchResults(query), request, view=self)
+
+        # 検索結果の順位を保ったまま、ページ分だけまとめて取得する
+        rows = TweetReadSerializer.get_queryset(Tweet.objects.filter(id__in=ids))
+        rows_by_id = {row["id"]: row for row in rows}
+        data = TweetReadSerializer.serialize_many(
+            rows_by_id[pk] for pk in ids if pk in rows_by_id
+        )
+
+        return paginator.get_paginated_response(data)
+
+
+class TweetExportView(APIView):
+    """
+    ツイート全件エクスポート（ストリーミング）
+
+    サーバーサイドカーソル（iterator）で少しずつ読み出して書き出すため、
+    件数に関係なくメモリ使用量は一定で、最初のバイトもすぐに返る。
+
+    Query Params:
+        - output: "json"（JSON 配列、デフォルト）または "ndjson"
+    """
+
+    chunk_size = 2000
+
+    def get(self, request: Request) -> StreamingHttpResponse | Response:
+        output = request.query_params.get("output", "json")
+        if output not in ("json", "ndjson"):
+            return Response(
+                {"error": "output は json または ndjson を指定してください"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = TweetReadSerializer.get_queryset(Tweet.objects.all()).iterator(
+            chunk_size=self.chunk_size
+        )
+
+        if output == "ndjson":
+            return StreamingHttpResponse(
+                _iter_ndjson(rows, self.chunk_size),
+                content_type="application/x-ndjson",
+            )
+        return StreamingHttpResponse(
+            _iter_json_array(rows, self.chunk_size),
+            content_type="application/json",
+        )
+
+
+# ---- ASGI 用の非同期ビュー ----
+# DRF の APIView は同期のため、Django の View と非同期 ORM で実装する。
+# レスポンス形式は同期版（TweetReadSerializer）と同じ。
+
+JSON_DUMPS_PARAMS = {"ensure_ascii": False}
+
+
+class AsyncTweetListView(View):
+    """
+    ツイート一覧（非同期）
+
+    レスポンスは同期版と同じ next / previous / results の形。
+    カーソルは (created_at, id) のキーセットで、同期版のカーソルとは互換性がない。
+
+    Query Params:
+        - cursor: 前ページの next / previous に含まれるカーソル
+        - page_size: 1ページの件数（最大 TweetCursorPagination.max_page_size）
+    """
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        page_size = parse_page_size(request.GET.get("page_size"))
+
+        queryset = TweetReadSerializer.get_queryset(Tweet.objects.all())
+
+        position = None
+        reverse = False
+        cursor = request.GET.get("cursor")
+        if cursor:
+            try:
+                created_at, pk, reverse = decode_keyset_cursor_with_direction(cursor)
+            except ValueError:
+                return JsonResponse(
+                    {"error": "カーソルが不正です"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                    json_dumps_params=JSON_DUMPS_PARAMS,
+                )
+            position = (created_at, pk)
+
+        if reverse:
+            # previous: カーソル位置より新しい行を古い順に取り、最後に並べ直す
+            queryset = queryset.filter(
+                keyset_filter(created_at, pk, reverse=True)
+            ).order_by("created_at", "id")
+        else:
+            queryset = queryset.order_by(*TweetCursorPagination.ordering)
+            if position:
+                queryset = queryset.filter(keyset_filter(created_at, pk))
+
+        # 続きのページの有無を判定するため1件多く取得する
+        rows = [row async for row in queryset[: page_size + 1].aiterator()]
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            # 新しい側へ戻ってきたので、古い側（next）は必ずある
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        return JsonResponse(
+            {
+                "next": (
+                    self._page_url(request, rows[-1], reverse=False)
+                    if has_next and rows
+                    else None
+                ),
+                "previous": (
+                    self._page_url(request, rows[0], reverse=True)
+                    if has_previous and rows
+                    else None
+                ),
+                "results": TweetReadSerializer.serialize_many(rows),
+            },
+            json_dumps_params=JSON_DUMPS_PARAMS,
+        )
+
+    @staticmethod
+    def _page_url(request: HttpRequest, row: dict[str, Any], reverse: bool) -> str:
+        query = request.GET.copy()
+        query["cursor"] = encode_keyset_cursor(row["created_at"], row["id"], reverse)
+        url: str = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+        return url
+
 
-        logger.info(tweets)
-        logger.info(serializer)
+class AsyncTweetDetailView(View):
+    """ツイート詳細（非同期）"""
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    async def get(self, request: HttpRequest, pk: int) -> JsonResponse:
+        try:
+            row = await TweetReadSerializer.get_queryset(Tweet.objects.all()).aget(pk=pk)
+        except Tweet.DoesNotExist:
+            return JsonResponse(
+                {"error": "ツイートが見つかりません"},
+                status=status.HTTP_404_NOT_FOUND,
+                json_dumps_params=JSON_DUMPS_PARAMS,
+            )
+        return JsonResponse(
+            TweetReadSerializer.to_representation(row),
+            json_dumps_params=JSON_DUMPS_PARAMS,
+        )
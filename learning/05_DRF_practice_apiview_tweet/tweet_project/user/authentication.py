@@ -0,0 +1,128 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenUserCache:
+    """
+    トークン（ユーザーを含む）のキャッシュ
+
+    - 1段目: プロセス内の LRU（件数上限 + TOKEN_AUTH_CACHE_LOCAL_TTL）
+    - 2段目: ワーカープロセス間で共有する Django キャッシュ（TOKEN_AUTH_CACHE_ALIAS、
+      TOKEN_AUTH_CACHE_TTL）
+
+    トークン削除時はシグナル（user.signals）で両方から即時に削除する。
+    ただし別プロセスの1段目には届かないため、失効後も最大 TOKEN_AUTH_CACHE_LOCAL_TTL 秒は
+    そのプロセスで認証が通りうる。1段目の TTL を短くしてこの時間を抑える。
+
+    キャッシュしたインスタンスはリクエスト・スレッド間で共有しないよう、
+    保存時と取得時に複製する。
+    """
+
+    KEY_PREFIX = "auth:token"
+
+    _lock = threading.Lock()
+    _local: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    @classmethod
+    def get_ttl(cls) -> int:
+        return getattr(settings, "TOKEN_AUTH_CACHE_TTL", 60)
+
+    @classmethod
+    def get_local_ttl(cls) -> int:
+        return getattr(settings, "TOKEN_AUTH_CACHE_LOCAL_TTL", cls.get_ttl())
+
+    @classmethod
+    def get_max_size(cls) -> int:
+        return getattr(settings, "TOKEN_AUTH_CACHE_MAX_SIZE", 10000)
+
+    @classmethod
+    def get_shared_cache(cls):
+        alias = getattr(settings, "TOKEN_AUTH_CACHE_ALIAS", None)
+        return caches[alias] if alias else None
+
+    @classmethod
+    def shared_key(cls, key: str) -> str:
+        return f"{cls.KEY_PREFIX}:{key}"
+
+    @classmethod
+    def get(cls, key: str) -> Any | None:
+        now = time.monotonic()
+        with cls._lock:
+            entry = cls._local.get(key)
+            if entry is not None:
+                expires_at, token = entry
+                if expires_at > now:
+                    cls._local.move_to_end(key)
+                    return cls._copy(token)
+                del cls._local[key]
+
+        shared = cls.get_shared_cache()
+        if shared is None:
+            return None
+        token = shared.get(cls.shared_key(key))
+        if token is None:
+            return None
+        cls._set_local(key, token)
+        return cls._copy(token)
+
+    @classmethod
+    def set(cls, key: str, token: Any) -> None:
+        cls._set_local(key, cls._copy(token))
+        shared = cls.get_shared_cache()
+        if shared is not None:
+            shared.set(cls.shared_key(key), token, timeout=cls.get_ttl())
+
+    @classmethod
+    def _set_local(cls, key: str, token: Any) -> None:
+        with cls._lock:
+            cls._local[key] = (time.monotonic() + cls.get_local_ttl(), token)
+            cls._local.move_to_end(key)
+            while len(cls._local) > cls.get_max_size():
+                cls._local.popitem(last=False)
+
+    @staticmethod
+    def _copy(token: Any) -> Any:
+        """トークンと関連するユーザーを複製する（呼び出し側の変更がキャッシュに残らないように）"""
+        user = copy.copy(token.user)
+        token = copy.copy(token)
+        token.user = user
+        return token
+
+    @classmethod
+    def delete(cls, *keys: str) -> None:
+        with cls._lock:
+            for key in keys:
+                cls._local.pop(key, None)
+        shared = cls.get_shared_cache()
+        if shared is not None and keys:
+            shared.delete_many([cls.shared_key(key) for key in keys])
+
+    @classmethod
+    def clear(cls) -> None:
+        """プロセス内キャッシュをすべて削除（テスト用）"""
+        with cls._lock:
+            cls._local.clear()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication の認証結果をキャッシュする認証クラス
+
+    キャッシュヒット時は authtoken_token と user の JOIN クエリを発行しない。
+    """
+
+    def authenticate_credentials(self, key: str):
+        token = TokenUserCache.get(key)
+        if token is not None:
+            return (token.user, token)
+
+        user, token = super().authenticate_credentials(key)
+        TokenUserCache.set(key, token)
+        return (user, token)
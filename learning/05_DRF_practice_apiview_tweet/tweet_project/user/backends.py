@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashers import acheck_password, amake_password
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    aauthenticate() のパスワード計算をイベントループの外で待つ ModelBackend
+
+    Django 5.2 の ModelBackend.aauthenticate は check_password / set_password を
+    イベントループ上で同期的に実行するため、PBKDF2 の計算中は他のリクエストも止まる。
+    ここでは user.hashers の非同期版（HashingExecutor.arun）で待つ。
+    同期の authenticate() は ModelBackend のまま。
+    """
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # 存在しないユーザーでも1回ハッシュを計算し、応答時間の差を小さくする
+            await amake_password(password)
+            return None
+
+        async def setter(raw_password: str) -> None:
+            # ハッシュのアップグレード（AbstractBaseUser.acheck_password と同じ）
+            user.password = await amake_password(raw_password)
+            user._password = None
+            await user.asave(update_fields=["password"])
+
+        if await acheck_password(password, user.password, setter) and (
+            self.user_can_authenticate(user)
+        ):
+            return user
+        return None
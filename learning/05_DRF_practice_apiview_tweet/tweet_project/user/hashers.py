@@ -0,0 +1,268 @@
+import asyncio
+import base64
+import hashlib
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    get_hasher,
+    identify_hasher,
+    is_password_usable,
+    make_password,
+    verify_password,
+)
+from django.utils.crypto import constant_time_compare
+from django.utils.encoding import force_bytes
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+DEFAULT_EXECUTOR_SETTINGS = {
+    "KIND": "thread",  # "thread" または "process"
+    "MAX_WORKERS": 4,
+    "MAX_QUEUE": 16,  # 実行中 + 待ち行列の上限（超えたら 503）
+    "RETRY_AFTER": 1,  # 503 時の Retry-After（秒）
+}
+
+
+class HashingPoolSaturated(APIException):
+    """ハッシュ計算プールが満杯（503 + Retry-After）"""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "混み合っています。しばらくしてから再度お試しください。"
+    default_code = "hashing_pool_saturated"
+
+    def __init__(self, wait: int, detail=None, code=None):
+        super().__init__(detail, code)
+        # DRF の exception_handler が Retry-After ヘッダーに変換する
+        self.wait = wait
+
+
+def _pbkdf2_sha256(password: str, salt: str, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac(
+        "sha256", force_bytes(password), force_bytes(salt), iterations
+    )
+
+
+def _timed_call(func: Callable[..., Any], *args: Any) -> tuple[float, float, Any]:
+    # プロセスプールでも計測できるよう time.time() を使う
+    started_at = time.time()
+    result = func(*args)
+    return started_at, time.time(), result
+
+
+class HashingExecutor:
+    """
+    パスワードハッシュ計算用の上限付きワーカープール
+
+    リクエストスレッドで PBKDF2 を直接実行せず、専用プールで計算する。
+    同期の処理は run()、非同期の処理は arun() で結果を待つ（arun はイベントループを止めない）。
+    実行中 + 待ち行列が MAX_QUEUE を超えた場合は HashingPoolSaturated を送出する。
+    設定は settings.PASSWORD_HASH_EXECUTOR（DEFAULT_EXECUTOR_SETTINGS を上書き）。
+    """
+
+    _lock = threading.Lock()
+    _executor: Executor | None = None
+    _slots: threading.BoundedSemaphore | None = None
+
+    _stats_lock = threading.Lock()
+    _EMPTY_STATS = {
+        "count": 0,
+        "rejected": 0,
+        "hash_time_total": 0.0,
+        "hash_time_max": 0.0,
+        "queue_wait_total": 0.0,
+        "queue_wait_max": 0.0,
+    }
+    _stats = dict(_EMPTY_STATS)
+
+    @classmethod
+    def get_settings(cls) -> dict[str, Any]:
+        return {
+            **DEFAULT_EXECUTOR_SETTINGS,
+            **getattr(settings, "PASSWORD_HASH_EXECUTOR", {}),
+        }
+
+    @classmethod
+    def _get_executor(cls) -> tuple[Executor, threading.BoundedSemaphore]:
+        with cls._lock:
+            if cls._executor is None or cls._slots is None:
+                config = cls.get_settings()
+                executor_class = (
+                    ProcessPoolExecutor if config["KIND"] == "process" else ThreadPoolExecutor
+                )
+                cls._executor = executor_class(max_workers=config["MAX_WORKERS"])
+                cls._slots = threading.BoundedSemaphore(config["MAX_QUEUE"])
+            return cls._executor, cls._slots
+
+    @classmethod
+    def _submit(cls, func: Callable[..., Any], *args: Any) -> tuple[Future, float]:
+        """空き枠があればプールに投入する（満杯なら HashingPoolSaturated）"""
+        executor, slots = cls._get_executor()
+
+        if not slots.acquire(blocking=False):
+            cls._record_rejected()
+            raise HashingPoolSaturated(wait=cls.get_settings()["RETRY_AFTER"])
+
+        submitted_at = time.time()
+        try:
+            future = executor.submit(_timed_call, func, *args)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future, submitted_at
+
+    @classmethod
+    def _result(cls, timed: tuple[float, float, Any], submitted_at: float) -> Any:
+        started_at, finished_at, result = timed
+        cls._record(
+            queue_wait=max(started_at - submitted_at, 0.0),
+            hash_time=finished_at - started_at,
+        )
+        return result
+
+    @classmethod
+    def run(cls, func: Callable[..., Any], *args: Any) -> Any:
+        future, submitted_at = cls._submit(func, *args)
+        return cls._result(future.result(), submitted_at)
+
+    @classmethod
+    async def arun(cls, func: Callable[..., Any], *args: Any) -> Any:
+        """run() の非同期版（計算を待つ間もイベントループは他のリクエストを処理できる）"""
+        future, submitted_at = cls._submit(func, *args)
+        return cls._result(await asyncio.wrap_future(future), submitted_at)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=True)
+            cls._executor = None
+            cls._slots = None
+
+    # ---- メトリクス ----
+
+    @classmethod
+    def _record(cls, queue_wait: float, hash_time: float) -> None:
+        with cls._stats_lock:
+            cls._stats["count"] += 1
+            cls._stats["hash_time_total"] += hash_time
+            cls._stats["hash_time_max"] = max(cls._stats["hash_time_max"], hash_time)
+            cls._stats["queue_wait_total"] += queue_wait
+            cls._stats["queue_wait_max"] = max(cls._stats["queue_wait_max"], queue_wait)
+
+    @classmethod
+    def _record_rejected(cls) -> None:
+        with cls._stats_lock:
+            cls._stats["rejected"] += 1
+
+    @classmethod
+    def stats(cls) -> dict[str, float]:
+        with cls._stats_lock:
+            stats = dict(cls._stats)
+        count = stats["count"]
+        stats["hash_time_avg"] = stats["hash_time_total"] / count if count else 0.0
+        stats["queue_wait_avg"] = stats["queue_wait_total"] / count if count else 0.0
+        return stats
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        with cls._stats_lock:
+            cls._stats = dict(cls._EMPTY_STATS)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 の計算を HashingExecutor で行うパスワードハッシャー
+
+    アルゴリズム名は pbkdf2_sha256 のままなので、既存のハッシュもそのまま検証できる。
+    authenticate() / create_user() など make_password・check_password を使う処理すべてに効く。
+    """
+
+    def encode(self, password, salt, iterations=None):
+        self._check_encode_args(password, salt)
+        iterations = iterations or self.iterations
+        hash = HashingExecutor.run(_pbkdf2_sha256, password, salt, iterations)
+        return self._format(salt, iterations, hash)
+
+    async def aencode(self, password: str, salt: str, iterations: int | None = None) -> str:
+        """encode() の非同期版"""
+        self._check_encode_args(password, salt)
+        iterations = iterations or self.iterations
+        hash = await HashingExecutor.arun(_pbkdf2_sha256, password, salt, iterations)
+        return self._format(salt, iterations, hash)
+
+    async def averify(self, password: str, encoded: str) -> bool:
+        """verify() の非同期版"""
+        decoded = self.decode(encoded)
+        encoded_2 = await self.aencode(password, decoded["salt"], decoded["iterations"])
+        return bool(constant_time_compare(encoded, encoded_2))
+
+    async def aharden_runtime(self, password: str, encoded: str) -> None:
+        """harden_runtime() の非同期版"""
+        decoded = self.decode(encoded)
+        extra_iterations = self.iterations - decoded["iterations"]
+        if extra_iterations > 0:
+            await self.aencode(password, decoded["salt"], extra_iterations)
+
+    def _format(self, salt: str, iterations: int, hash: bytes) -> str:
+        encoded_hash = base64.b64encode(hash).decode("ascii").strip()
+        return "%s$%d$%s$%s" % (self.algorithm, iterations, salt, encoded_hash)
+
+
+# ---- 非同期ビュー用 ----
+# Django 5.2 の acheck_password（ModelBackend.aauthenticate から呼ばれる）は
+# verify_password をイベントループ上で同期的に実行し、プールの計算が終わるまでループを止める。
+# 以下はプールのハッシャーなら arun で待ち、それ以外はワーカースレッドで計算する。
+
+
+async def amake_password(password: str) -> str:
+    """make_password() の非同期版"""
+    hasher = get_hasher()
+    if isinstance(hasher, PooledPBKDF2PasswordHasher):
+        return await hasher.aencode(password, hasher.salt())
+    encoded: str = await sync_to_async(make_password, thread_sensitive=False)(password)
+    return encoded
+
+
+async def acheck_password(
+    password: str | None,
+    encoded: str,
+    setter: Callable[[str], Awaitable[None]] | None = None,
+) -> bool:
+    """check_password() の非同期版（手順は django.contrib.auth.hashers.verify_password と同じ）"""
+    is_correct: bool
+    must_update: bool
+    hasher = None
+    if password is not None and is_password_usable(encoded):
+        try:
+            hasher = identify_hasher(encoded)
+        except ValueError:
+            pass
+
+    if password is None or not isinstance(hasher, PooledPBKDF2PasswordHasher):
+        # 使えないパスワード（ダミー計算でタイミングをそろえる）や他のアルゴリズム
+        is_correct, must_update = await sync_to_async(
+            verify_password, thread_sensitive=False
+        )(password, encoded)
+    else:
+        preferred = get_hasher()
+        hasher_changed = hasher.algorithm != preferred.algorithm
+        must_update = hasher_changed or preferred.must_update(encoded)
+        is_correct = await hasher.averify(password, encoded)
+        if not is_correct and not hasher_changed and must_update:
+            await hasher.aharden_runtime(password, encoded)
+
+    if setter and is_correct and must_update and password is not None:
+        await setter(password)
+    return is_correct
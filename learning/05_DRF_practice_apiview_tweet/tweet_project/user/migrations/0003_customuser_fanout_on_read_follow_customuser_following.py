@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-17 10:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0002_customuser_user_customuser_email_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='fanout_on_read',
+            field=models.BooleanField(default=False, help_text='フォロワーが多いため、ツイートをフォロワーのタイムラインに配信せず読み取り時に合流する', verbose_name='読み取り時に合流'),
+        ),
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='作成日時')),
+                ('followee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follower_relations', to=settings.AUTH_USER_MODEL, verbose_name='フォローされるユーザー')),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_relations', to=settings.AUTH_USER_MODEL, verbose_name='フォローするユーザー')),
+            ],
+            options={
+                'verbose_name': 'フォロー',
+                'verbose_name_plural': 'フォロー',
+                'constraints': [models.UniqueConstraint(fields=('follower', 'followee'), name='user_follow_unique')],
+            },
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='following',
+            field=models.ManyToManyField(related_name='followers', through='user.Follow', through_fields=('follower', 'followee'), to=settings.AUTH_USER_MODEL, verbose_name='フォロー中'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-17 10:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_tweet_count(apps, schema_editor):
+    CustomUser = apps.get_model('user', 'CustomUser')
+    Tweet = apps.get_model('tweets', 'Tweet')
+    for row in Tweet.objects.values('author').annotate(count=Count('id')).order_by():
+        CustomUser.objects.filter(pk=row['author']).update(tweet_count=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_customuser_fanout_on_read_follow_customuser_following'),
+        ('tweets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='tweet_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='ツイート数'),
+        ),
+        migrations.RunPython(populate_tweet_count, migrations.RunPython.noop),
+    ]
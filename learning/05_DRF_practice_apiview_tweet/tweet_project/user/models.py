@@ -4,4 +4,81 @@ from django.db import models
 # Create your models here.
 
 class CustomUser(AbstractUser):
-    pass
+    following = models.ManyToManyField(
+        "self",
+        symmetrical=False,
+        through="Follow",
+        through_fields=("follower", "followee"),
+        related_name="followers",
+        verbose_name="フォロー中",
+    )
+    fanout_on_read = models.BooleanField(
+        default=False,
+        verbose_name="読み取り時に合流",
+        help_text="フォロワーが多いため、ツイートをフォロワーのタイムラインに配信せず読み取り時に合流する",
+    )
+    # tweets の件数（tweets.signals で増減、reconcile_tweet_counts で補正）
+    tweet_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="ツイート数",
+    )
+
+    # 変更されたら Token 認証キャッシュを破棄するフィールド（user.signals）
+    AUTH_STATE_FIELDS = ("password", "is_active")
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # メールアドレスの重複は DB のユニークインデックスで防ぐ
+            # （メール未設定の既存ユーザー・管理ユーザーは対象外）
+            models.UniqueConstraint(
+                fields=["email"],
+                condition=~models.Q(email=""),
+                name="user_customuser_email_unique",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 保存時に認証に関わる値が変わったかを比較できるよう、読み込み時の値を残す
+        instance._loaded_auth_state = instance.get_auth_state()
+        return instance
+
+    def get_auth_state(self) -> tuple | None:
+        """認証に関わるフィールドの現在値（遅延読み込みで未取得のものがあれば None）"""
+        values = self.__dict__
+        if not all(field in values for field in self.AUTH_STATE_FIELDS):
+            return None
+        return tuple(values[field] for field in self.AUTH_STATE_FIELDS)
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="following_relations",
+        verbose_name="フォローするユーザー",
+    )
+    followee = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="follower_relations",
+        verbose_name="フォローされるユーザー",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="作成日時"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "followee"],
+                name="user_follow_unique",
+            ),
+        ]
+        verbose_name = "フォロー"
+        verbose_name_plural = "フォロー"
+
+    def __str__(self):
+        return f"{self.follower_id} -> {self.followee_id}"
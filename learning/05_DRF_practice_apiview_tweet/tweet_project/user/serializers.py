@@ -1,13 +1,50 @@
 from typing import Any
 
 from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework import serializers
 
 from .types import LoginValidatedData
 
 User = get_user_model()
 
+UNIQUE_FIELD_ERRORS = {
+    "email": "既に登録されているメールアドレスです。",
+    "username": "既に登録されているユーザー名です。",
+}
+
+
+def unique_violation_errors(username: str, email: str) -> dict[str, list[str]]:
+    """
+    ユーザー作成時のユニーク制約違反（IntegrityError）をフィールドエラーに変換する
+
+    事前に exists() で重複チェックせず、INSERT の結果で判定するために使う。
+    どのフィールドが衝突したかは DB のエラーメッセージ（バックエンドごとに形式が違い、
+    入力値も含まれうる）から推測せず、失敗時だけ1回問い合わせて確かめる。
+    """
+    existing = User.objects.filter(Q(username=username) | Q(email=email)).values_list(
+        "username", "email"
+    )
+    errors: dict[str, list[str]] = {}
+    for existing_username, existing_email in existing:
+        if existing_username == username:
+            errors["username"] = [UNIQUE_FIELD_ERRORS["username"]]
+        if email and existing_email == email:
+            errors["email"] = [UNIQUE_FIELD_ERRORS["email"]]
+    return errors or {"non_field_errors": ["登録に失敗しました。"]}
+
+
 class UserRegisterSerializer(serializers.ModelSerializer):
+    """
+    ユーザー登録用Serializer
+
+    username / email の重複は DB のユニークインデックスに任せ、
+    INSERT 1回で判定する（UniqueValidator による事前クエリは行わない）。
+    """
+
     class Meta:
         model = User
         fields = ["username", "email", "password"]
@@ -20,27 +57,46 @@ class UserRegisterSerializer(serializers.ModelSerializer):
             },
             "email": {
                 "required": True,
-                "allow_blank": False
+                "allow_blank": False,
+                "validators": [],
             },
             "username": {
                 "required": True,
                 "min_length": 3,
-                "max_length": 150
+                "max_length": 150,
+                "validators": [UnicodeUsernameValidator()],
             },
         }
 
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data["username"],
-            email=validated_data["email"],
-            password=validated_data["password"]
+        # 非同期ビューは save(password_hash=...) で計算済みのハッシュを渡す
+        password_hash = validated_data.get("password_hash")
+        if password_hash is None:
+            password_hash = make_password(validated_data["password"])
+        # create_user() と同じ正規化をしたうえで、ハッシュ計算はトランザクションの外で済ませる
+        user = User(
+            username=User.normalize_username(validated_data["username"]),
+            email=User.objects.normalize_email(validated_data["email"]),
+            password=password_hash,
         )
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            # 保存しようとした（正規化済みの）値で問い合わせる
+            raise serializers.ValidationError(
+                unique_violation_errors(user.username, user.email)
+            )
         return user
 
-    def validate_email(self, value):
-        """メールアドレスの重複チェック"""
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("既に登録されているメールアドレスです。")
+class UserSerializer(serializers.ModelSerializer):
+    """ユーザー表示用（ツイート数は集計せずカウンタ列を返す）"""
+
+    class Meta:
+        model = User
+        fields = ["id", "username", "tweet_count"]
+        read_only_fields = fields
+
 
 class UserLoginSerializer(serializers.Serializer):
     """ログイン用Serializer（Token認証）"""
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import TokenUserCache
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_token_cache(sender, instance: Token, **kwargs) -> None:
+    """トークン削除（失効）時に認証キャッシュから削除"""
+    TokenUserCache.delete(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_token_cache(
+    sender, instance, created: bool, update_fields, **kwargs
+) -> None:
+    """
+    パスワード・有効フラグが変わったときだけ、そのユーザーのトークンをキャッシュから削除
+
+    last_login の更新（update_fields=["last_login"]）などそれ以外の保存ではクエリを発行しない。
+    """
+    if update_fields is not None and update_fields.isdisjoint(User.AUTH_STATE_FIELDS):
+        return
+
+    loaded = getattr(instance, "_loaded_auth_state", None)
+    current = instance.get_auth_state()
+    instance._loaded_auth_state = current
+    if created:
+        return
+    # 読み込み時の値が分からない場合（遅延読み込みなど）は念のため削除する
+    if loaded is not None and loaded == current:
+        return
+    keys = list(Token.objects.filter(user=instance).values_list("key", flat=True))
+    TokenUserCache.delete(*keys)
@@ -1,3 +1,278 @@
-from django.test import TestCase
+import asyncio
+import time
+from base64 import b64encode
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import aauthenticate, get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import update_last_login
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .authentication import TokenUserCache
+from .hashers import HashingExecutor, HashingPoolSaturated, acheck_password
+
+User = get_user_model()
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+    """Token 認証のキャッシュと失効時の無効化を確認"""
+
+    def setUp(self):
+        TokenUserCache.clear()
+        self.user = User.objects.create_user(username="author", password="password123")
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        # 認証後、空配列のバリデーションで DB に触れずに 400 を返すエンドポイント
+        self.url = reverse("tweet-bulk-create")
+
+    def test_second_request_skips_token_query(self):
+        self.assertEqual(self.client.post(self.url, [], format="json").status_code, 400)
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_revoked_token_is_rejected_immediately(self):
+        self.client.post(self.url, [], format="json")
+        self.token.delete()
+
+        response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_deactivated_user_is_rejected_immediately(self):
+        self.client.post(self.url, [], format="json")
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+
+        response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_last_login_update_keeps_cache_without_extra_query(self):
+        self.client.post(self.url, [], format="json")
+        user = User.objects.get(pk=self.user.pk)
+        # UPDATE の1クエリだけで、トークンの検索は発行しない
+        with self.assertNumQueries(1):
+            update_last_login(None, user)
+        # 認証情報以外の保存でもトークンを引き直さない
+        user.first_name = "author"
+        with self.assertNumQueries(1):
+            user.save()
+
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cached_user_is_not_shared_between_requests(self):
+        TokenUserCache.set(self.token.key, self.token)
+        first = TokenUserCache.get(self.token.key)
+        first.user.username = "changed"
+
+        second = TokenUserCache.get(self.token.key)
+        self.assertIsNot(first.user, second.user)
+        self.assertEqual(second.user.username, "author")
+        self.assertEqual(self.token.user.username, "author")
+
+    def test_revocation_reaches_other_processes_after_local_ttl(self):
+        TokenUserCache.set(self.token.key, self.token)
+        # 別プロセスでの失効: 共有キャッシュからは消えるが、このプロセスの1段目には残る
+        TokenUserCache.get_shared_cache().delete(TokenUserCache.shared_key(self.token.key))
+        self.assertIsNotNone(TokenUserCache.get(self.token.key))
+
+        later = time.monotonic() + TokenUserCache.get_local_ttl() + 1
+        with mock.patch("user.authentication.time.monotonic", return_value=later):
+            self.assertIsNone(TokenUserCache.get(self.token.key))
+
+    def test_shared_tier_serves_other_processes(self):
+        self.client.post(self.url, [], format="json")
+        # 別プロセス（1段目が空）でもトークンの JOIN クエリは発行しない
+        TokenUserCache.clear()
+        with self.assertNumQueries(1):
+            token = TokenUserCache.get(self.token.key)
+        self.assertEqual(token.user.pk, self.user.pk)
+
+    def test_basic_authentication_is_accepted(self):
+        self.client.credentials()
+        response = self.client.post(
+            self.url,
+            [],
+            format="json",
+            HTTP_AUTHORIZATION="Basic " + b64encode(b"author:password123").decode(),
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class HashingExecutorTest(APITestCase):
+    """ハッシュ計算プールが満杯のとき 503 + Retry-After を返すことを確認"""
+
+    def setUp(self):
+        User.objects.create_user(username="author", password="password123")
+        HashingExecutor.shutdown()
+        self.addCleanup(HashingExecutor.shutdown)
+
+    def test_login_succeeds_through_pool(self):
+        before = HashingExecutor.stats()["count"]
+        response = self.client.post(
+            reverse("user-logi"),
+            {"username": "author", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        # パスワードの検証（check_password）がプールで計算されている
+        self.assertGreater(HashingExecutor.stats()["count"], before)
+
+    @override_settings(PASSWORD_HASH_EXECUTOR={"MAX_QUEUE": 0, "RETRY_AFTER": 3})
+    def test_saturated_pool_returns_503(self):
+        response = self.client.post(
+            reverse("user-logi"),
+            {"username": "author", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "3")
+
+
+class AsyncHashingTest(APITestCase):
+    """非同期の経路でもプールで計算し、イベントループを止めないことを確認"""
+
+    def setUp(self):
+        HashingExecutor.shutdown()
+        self.addCleanup(HashingExecutor.shutdown)
+
+    async def test_arun_does_not_block_event_loop(self):
+        before = HashingExecutor.stats()["count"]
+        task = asyncio.ensure_future(HashingExecutor.arun(time.sleep, 0.3))
+        started = time.perf_counter()
+        await asyncio.sleep(0.05)
+        # arun がループを止めていれば、sleep の再開は計算が終わるまで遅れる
+        self.assertLess(time.perf_counter() - started, 0.25)
+        await task
+        self.assertEqual(HashingExecutor.stats()["count"], before + 1)
+
+    @override_settings(PASSWORD_HASH_EXECUTOR={"MAX_QUEUE": 0})
+    async def test_arun_rejects_when_saturated(self):
+        with self.assertRaises(HashingPoolSaturated):
+            await HashingExecutor.arun(time.sleep, 0)
+
+    async def test_acheck_password(self):
+        encoded = make_password("password123")
+        self.assertTrue(await acheck_password("password123", encoded))
+        self.assertFalse(await acheck_password("wrong", encoded))
+        # プール以外のハッシャー・使えないパスワード
+        sha1_encoded = make_password("password123", hasher="pbkdf2_sha1")
+        self.assertTrue(await acheck_password("password123", sha1_encoded))
+        self.assertFalse(await acheck_password("password123", make_password(None)))
+
+
+class PooledModelBackendTest(APITestCase):
+    """aauthenticate() がプールでパスワードを検証し、古いハッシュを更新することを確認"""
+
+    def setUp(self):
+        HashingExecutor.shutdown()
+        self.addCleanup(HashingExecutor.shutdown)
+        self.user = User.objects.create_user(username="author", password="password123")
+
+    async def test_aauthenticate_through_pool(self):
+        before = HashingExecutor.stats()["count"]
+        user = await aauthenticate(username="author", password="password123")
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertGreater(HashingExecutor.stats()["count"], before)
+        self.assertIsNone(await aauthenticate(username="author", password="wrong"))
+
+    async def test_unknown_user_still_hashes(self):
+        before = HashingExecutor.stats()["count"]
+        self.assertIsNone(await aauthenticate(username="nobody", password="password123"))
+        self.assertEqual(HashingExecutor.stats()["count"], before + 1)
+
+    async def test_outdated_hash_is_upgraded(self):
+        self.user.password = make_password("password123", hasher="pbkdf2_sha1")
+        await self.user.asave(update_fields=["password"])
+
+        self.assertIsNotNone(await aauthenticate(username="author", password="password123"))
+        user = await User.objects.aget(pk=self.user.pk)
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+
+    def test_async_register_hashes_through_pool(self):
+        before = HashingExecutor.stats()["count"]
+        response = self.client.post(
+            reverse("user-register-async"),
+            {"username": "another", "email": "another@example.com", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(HashingExecutor.stats()["count"], before + 1)
+        self.assertTrue(User.objects.get(username="another").check_password("password123"))
+
+
+class UserRegisterUniqueTest(APITestCase):
+    """重複する email / username が DB 制約でフィールドエラーになることを確認"""
+
+    def setUp(self):
+        User.objects.create_user(
+            username="author", email="author@example.com", password="password123"
+        )
+
+    def _register(self, username: str, email: str):
+        return self.client.post(
+            reverse("user-register"),
+            {"username": username, "email": email, "password": "password123"},
+            format="json",
+        )
+
+    def test_duplicate_email(self):
+        response = self._register("another", "author@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.data)
+
+    def test_duplicate_username(self):
+        response = self._register("author", "another@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username", response.data)
+
+    def test_duplicate_username_containing_email(self):
+        # 入力値の文字列からフィールドを推測しない（"email" を含むユーザー名でも username のエラー）
+        User.objects.create_user(
+            username="email_lover", email="lover@example.com", password="password123"
+        )
+        response = self._register("email_lover", "another@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username", response.data)
+        self.assertNotIn("email", response.data)
+
+    def test_duplicate_username_and_email(self):
+        response = self._register("author", "author@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username", response.data)
+        self.assertIn("email", response.data)
+
+    def test_duplicate_email_on_async_view(self):
+        response = self.client.post(
+            reverse("user-register-async"),
+            {"username": "another", "email": "author@example.com", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json()), ["email"])
+
+    def test_duplicate_email_with_different_domain_case(self):
+        # normalize_email() でドメインは小文字にして保存・照合する
+        response = self._register("another", "author@EXAMPLE.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data), ["email"])
+
+    def test_sync_and_async_views_return_same_errors(self):
+        for payload in (
+            {"username": "author", "email": "author@example.com", "password": "password123"},
+            {"username": "another", "email": "", "password": "short"},
+        ):
+            sync = self.client.post(reverse("user-register"), payload, format="json")
+            async_ = self.client.post(reverse("user-register-async"), payload, format="json")
+            self.assertEqual(sync.status_code, 400)
+            self.assertEqual(async_.status_code, 400)
+            self.assertEqual(async_.json(), sync.json())
+
+    def test_register(self):
+        response = self._register("another", "another@example.com")
+        self.assertEqual(response.status_code, 201)
@@ -1,8 +1,23 @@
 from django.urls import path
 
-from .views import UserLoginView, UserRegisterView
+from .views import (
+    AsyncUserLoginView,
+    AsyncUserRegisterView,
+    UserDetailView,
+    UserFollowView,
+    UserLoginView,
+    UserRegisterView,
+)
 
 urlpatterns = [
     path("register/", UserRegisterView.as_view(), name="user-register"),
     path("login/", UserLoginView.as_view(), name="user-logi"),
+    path(
+        "async/register/",
+        AsyncUserRegisterView.as_view(),
+        name="user-register-async",
+    ),
+    path("async/login/", AsyncUserLoginView.as_view(), name="user-login-async"),
+    path("<int:pk>/", UserDetailView.as_view(), name="user-detail"),
+    path("<int:pk>/follow/", UserFollowView.as_view(), name="user-follow"),
 ]
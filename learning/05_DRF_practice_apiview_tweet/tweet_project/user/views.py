@@ -1,16 +1,31 @@
+import json
 import logging
 
-from rest_framework import permissions, status
+from asgiref.sync import sync_to_async
+from django.contrib.auth import aauthenticate, get_user_model
+from django.http import HttpRequest, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import permissions, serializers, status
 from rest_framework.authtoken.models import Token
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .serializers import UserLoginSerializer, UserRegisterSerializer
+from .hashers import HashingPoolSaturated, amake_password
+from .models import Follow
+from .serializers import (
+    UserLoginSerializer,
+    UserRegisterSerializer,
+    UserSerializer,
+)
 from .types import LoginResponseData
 
 logger = logging.getLogger(__name__)
 
+User = get_user_model()
+
 
 class UserRegisterView(APIView):
     serializer_class = UserRegisterSerializer
@@ -36,7 +51,7 @@ class UserRegisterView(APIView):
 
         if serializer.is_valid(raise_exception=True):
             user = serializer.save()
-            logger.info(f"New user registered: {user.username}")
+            logger.info("New user registered: %s", user.username)
 
             return Response(
                 {
@@ -50,7 +65,7 @@ class UserRegisterView(APIView):
                 status=status.HTTP_201_CREATED,
             )
 
-        logger.warning(f"User registration failed: {serializer.errors}")
+        logger.warning("User registration failed: %s", serializer.errors)
         return Response(
             {"message": "入力内容に誤りがあります。", "errors": serializer.errors},
             status=status.HTTP_400_BAD_REQUEST,
@@ -83,11 +98,11 @@ class UserLoginView(APIView):
             # トークン取得 or 作成
             token, created = Token.objects.get_or_create(user=user)
 
-            logger.info(f"User logged in: {user.username}")
+            logger.info("User logged in: %s", user.username)
 
             # 型安全なレスポンス
             response_data: LoginResponseData = {
-                "token": token,
+                "token": token.key,
                 "user": {
                     "id": user.id,
                     "email": user.email,
@@ -97,7 +112,7 @@ class UserLoginView(APIView):
 
             return Response(response_data, status=status.HTTP_200_OK)
 
-        logger.warning(f"Login failed: {serializer.errors}")
+        logger.warning("Login failed: %s", serializer.errors)
         return Response(
             {
                 "message": "ログインに失敗しました",
@@ -105,3 +120,217 @@ class UserLoginView(APIView):
             },
             status=status.HTTP_400_BAD_REQUEST,
         )
+
+
+class UserDetailView(APIView):
+    """ユーザー詳細API"""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request, pk: int) -> Response:
+        """
+        ユーザー詳細（ツイート数を含む）
+
+        Returns:
+            200: 取得成功
+            404: ユーザーが存在しない
+        """
+        try:
+            user = User.objects.only("id", "username", "tweet_count").get(pk=pk)
+        except User.DoesNotExist:
+            return Response(
+                {"message": "ユーザーが見つかりません。"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(UserSerializer(user).data, status=status.HTTP_200_OK)
+
+
+class UserFollowView(APIView):
+    """フォローAPI"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request: Request, pk: int) -> Response:
+        """
+        ユーザーをフォロー
+
+        Returns:
+            201: フォロー成功
+            200: フォロー済み
+            400: 自分自身はフォローできない
+            404: ユーザーが存在しない
+        """
+        if pk == request.user.pk:
+            return Response(
+                {"message": "自分自身はフォローできません。"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            followee = User.objects.get(pk=pk)
+        except User.DoesNotExist:
+            return Response(
+                {"message": "ユーザーが見つかりません。"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        _, created = Follow.objects.get_or_create(follower=request.user, followee=followee)
+        if created:
+            logger.info(
+                "User followed: %s -> %s", request.user.username, followee.username
+            )
+
+        return Response(
+            {"message": "フォローしました。"},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    def delete(self, request: Request, pk: int) -> Response:
+        """
+        フォロー解除
+
+        Returns:
+            204: 解除成功（未フォローの場合も含む）
+        """
+        Follow.objects.filter(follower=request.user, followee_id=pk).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# ---- ASGI 用の非同期ビュー ----
+# DRF の APIView は同期のため、Django の View と非同期 ORM で実装する。
+# リクエスト・レスポンス形式は同期版と同じ。
+
+JSON_DUMPS_PARAMS = {"ensure_ascii": False}
+
+
+def _parse_json_body(request: HttpRequest) -> dict | None:
+    try:
+        data = json.loads(request.body or b"{}")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _saturated_response(exc: HashingPoolSaturated) -> JsonResponse:
+    response = JsonResponse(
+        {"detail": str(exc.detail)},
+        status=exc.status_code,
+        json_dumps_params=JSON_DUMPS_PARAMS,
+    )
+    response["Retry-After"] = str(exc.wait)
+    return response
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncUserRegisterView(View):
+    """ユーザー登録API（非同期）"""
+
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        data = _parse_json_body(request)
+        if data is None:
+            return JsonResponse(
+                {"detail": "JSON parse error"},
+                status=status.HTTP_400_BAD_REQUEST,
+                json_dumps_params=JSON_DUMPS_PARAMS,
+            )
+
+        # フィールドのバリデーションは同期の Serializer を流用する。
+        # エラーは同期版（is_valid(raise_exception=True)）と同じくフィールド名をキーにして返す
+        serializer = UserRegisterSerializer(data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            logger.warning("User registration failed: %s", serializer.errors)
+            return JsonResponse(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+                json_dumps_params=JSON_DUMPS_PARAMS,
+            )
+
+        try:
+            # ハッシュはプールで計算して待ち、共有の同期スレッドを占有しない
+            password_hash = await amake_password(serializer.validated_data["password"])
+        except HashingPoolSaturated as e:
+            return _saturated_response(e)
+
+        try:
+            # INSERT と重複時のフィールド判定は同期版と同じ処理（セーブポイント付き）を使う
+            user = await sync_to_async(serializer.save)(password_hash=password_hash)
+        except serializers.ValidationError as e:
+            logger.warning("User registration failed: %s", e.detail)
+            return JsonResponse(
+                e.detail,
+                status=status.HTTP_400_BAD_REQUEST,
+                json_dumps_params=JSON_DUMPS_PARAMS,
+            )
+        logger.info("New user registered: %s", user.username)
+
+        return JsonResponse(
+            {
+                "message": "ユーザー登録が完了しました。",
+                "user": {
+                    "id": user.id,
+                    "username": user.username,
+                    "email": user.email,
+                },
+            },
+            status=status.HTTP_201_CREATED,
+            json_dumps_params=JSON_DUMPS_PARAMS,
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncUserLoginView(View):
+    """ログインAPI（Token認証・非同期）"""
+
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        data = _parse_json_body(request) or {}
+        username = data.get("username")
+        password = data.get("password")
+
+        errors: dict[str, list[str]] = {}
+        if not username:
+            errors["username"] = ["この項目は必須です。"]
+        if not password:
+            errors["password"] = ["この項目は必須です。"]
+
+        user = None
+        if not errors:
+            try:
+                # user.backends.PooledModelBackend がハッシュ計算をプールで待つ
+                user = await aauthenticate(
+                    request, username=username, password=password
+                )
+            except HashingPoolSaturated as e:
+                return _saturated_response(e)
+            if user is None:
+                errors["non_field_errors"] = [
+                    "ユーザー名またはパスワードが正しくありません。"
+                ]
+            elif not user.is_active:
+                errors["non_field_errors"] = ["このアカウントは無効化されています。"]
+
+        if errors or user is None:
+            logger.warning("Login failed: %s", errors)
+            return JsonResponse(
+                {"message": "ログインに失敗しました", "errors": errors},
+                status=status.HTTP_400_BAD_REQUEST,
+                json_dumps_params=JSON_DUMPS_PARAMS,
+            )
+
+        token, created = await Token.objects.aget_or_create(user=user)
+
+        logger.info("User logged in: %s", user.username)
+
+        response_data: LoginResponseData = {
+            "token": token.key,
+            "user": {
+                "id": user.id,
+                "email": user.email,
+                "username": user.username,
+            },
+        }
+
+        return JsonResponse(
+            response_data,
+            status=status.HTTP_200_OK,
+            json_dumps_params=JSON_DUMPS_PARAMS,
+        )